@@ -1,14 +1,32 @@
 import bpy
 import os
-import re
 from pathlib import Path
 from bpy.types import Operator, AddonPreferences
 import math
+import time
+import hashlib
+import shutil
+import tempfile
+import subprocess
+from mathutils import Euler
 from . import project_info_io_c4d
+from . import cache_manifest
+from . import payload_watcher
+from . import socket_transport
+from . import mesh_buffers
+from . import object_fingerprint
+from . import payload_codec
+from . import cache_janitor
+from . import fbx_tools
+from . import sync_trace
+from . import hierarchy_manifest
+from . import import_session
+from . import texture_store
 import json
-import glob
 import string
 import random
+import heapq
+from contextlib import contextmanager
 
 bl_info = {
     "name": "SyncTools Pro",
@@ -194,6 +212,21 @@ def unregister_keymaps():
     addon_keymaps.clear()
 
 
+# 缓存数据压缩选项，各模式分别设置
+COMPRESSION_ITEMS = [
+    ('NONE', "None / 不压缩", "Write payloads uncompressed (required for other host applications) / 不压缩（其他软件读取时必须）"),
+    ('ZLIB', "zlib", "Standard library gzip stream, always available / 标准库 gzip，始终可用"),
+    ('ZSTD', "zstd", "Zstandard, needs the zstandard module, falls back to zlib / 需要 zstandard 模块，否则使用 zlib"),
+    ('LZ4', "lz4", "LZ4 frame, needs the lz4 module, falls back to zlib / 需要 lz4 模块，否则使用 zlib"),
+]
+
+COMPRESSION_PROPERTY = {
+    'STANDARD': "compression_standard",
+    'BATA': "compression_bata",
+    'BINARY': "compression_binary",
+}
+
+
 class IDToolsPreferences(bpy.types.AddonPreferences):
     bl_idname = __name__
     
@@ -204,6 +237,9 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
         items=[
             ('STANDARD', "Standard (FBX)", "Use standard FBX-based sync with full features"),
             ('BATA', "Bata (ABC)", "Use experimental ABC-based sync for geometry transfer"),
+            ('SOCKET', "Local Socket (FBX)", "Stream FBX payloads to a peer on this machine over a local socket"),
+            ('SHARED_MEMORY', "Shared Memory (Mesh)", "Pass mesh arrays through shared memory on this machine, no file and no format parse"),
+            ('BINARY', "Binary Mesh (STM)", "Write raw mesh arrays to a compact binary container in the cache folder"),
         ],
         default='STANDARD',
         update=lambda self, context: self.update_sync_mode(context)
@@ -223,6 +259,8 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
 
     def update_sync_mode(self, context):
         """Update sync mode and refresh UI"""
+        update_socket_listener(self)
+
         # Force UI refresh when mode changes
         for area in context.screen.areas:
             if area.type == 'VIEW_3D':
@@ -258,6 +296,8 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
             self.import_cameras.name = "导入相机"
             self.export_cameras.name = "导出相机"
             self.import_materials.name = "导入材质"
+            self.import_reuse_materials.name = "复用相同材质"
+            self.import_texture_store.name = "贴图去重"
             self.export_materials.name = "导出材质"
             self.import_meshes.name = "导入网格"
             self.export_meshes.name = "导出网格"
@@ -319,6 +359,8 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
             self.import_cameras.name = "Import Cameras"
             self.export_cameras.name = "Export Cameras"
             self.import_materials.name = "Import Materials"
+            self.import_reuse_materials.name = "Reuse Identical Materials"
+            self.import_texture_store.name = "Deduplicate Textures"
             self.export_materials.name = "Export Materials"
             self.import_meshes.name = "Import Meshes"
             self.export_meshes.name = "Export Meshes"
@@ -371,23 +413,27 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
     def get_cache_info(self):
         """Get current cache information"""
         documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
-        cache_dir = os.path.join(documents_dir, "cache")
-        
-        if not os.path.exists(cache_dir):
-            return 0, 0
-            
-        # Get all FBX and image files
-        fbx_files = glob.glob(os.path.join(cache_dir, "*.fbx"))
-        image_files = []
-        for ext in ['*.jpg', '*.jpeg', '*.png']:
-            image_files.extend(glob.glob(os.path.join(cache_dir, ext)))
-        
-        all_files = fbx_files + image_files
-        
-        # Calculate total size
-        total_size = sum(os.path.getsize(f) for f in all_files)
-        
-        return len(all_files), total_size
+        return cache_janitor.cache_usage(os.path.join(documents_dir, "cache"))
+
+    # 缓存清理策略（各项为 0 表示不限制），每次复制后由后台线程执行
+    cache_max_size_mb: bpy.props.IntProperty(
+        name="Max Size (MB) / 最大容量",
+        description="Evict least recently used payloads and images above this size, 0 = unlimited / 超过该容量时删除最久未使用的数据，0 表示不限制",
+        default=2048,
+        min=0,
+    )
+    cache_max_age_hours: bpy.props.FloatProperty(
+        name="Max Age (h) / 最长保留",
+        description="Evict payloads and images not used for this many hours, 0 = unlimited / 删除超过该时间未使用的数据，0 表示不限制",
+        default=72.0,
+        min=0.0,
+    )
+    cache_max_entries: bpy.props.IntProperty(
+        name="Max Files / 最多文件数",
+        description="Keep at most this many payloads and images, 0 = unlimited / 最多保留的文件数，0 表示不限制",
+        default=20,
+        min=0,
+    )
 
     # Add shortcut style selection
     clipboard_keymap: bpy.props.EnumProperty(
@@ -426,6 +472,137 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
         update=lambda self, context: self.sync_preference_file(),
     )
 
+    # 自动粘贴：监听缓存目录，发现新数据后自动执行粘贴
+    auto_paste: bpy.props.BoolProperty(
+        name="Auto Paste / 自动粘贴",
+        description="Watch the cache folder and paste new payloads automatically / 监听缓存目录并自动粘贴新数据",
+        default=False,
+        update=lambda self, context: update_auto_paste(self),
+    )
+    auto_paste_interval: bpy.props.FloatProperty(
+        name="Detection Interval / 检测间隔",
+        description="How often the cache folder is checked for new payloads / 检查新数据的时间间隔",
+        default=0.1,
+        min=0.02,
+        max=1.0,
+        unit='TIME_ABSOLUTE',
+    )
+    auto_paste_debounce: bpy.props.FloatProperty(
+        name="Debounce / 防抖时间",
+        description="Wait until no new payload arrived for this long before pasting / 连续发布时等待该时间后再粘贴",
+        default=0.2,
+        min=0.0,
+        max=2.0,
+        unit='TIME_ABSOLUTE',
+    )
+
+    # 套接字模式地址，格式为 tcp:host:port 或 unix:/path/to.sock
+    socket_listen_address: bpy.props.StringProperty(
+        name="Listen Address / 监听地址",
+        description="Address this Blender listens on for pasted payloads / 本机接收数据的监听地址",
+        default=socket_transport.DEFAULT_LISTEN_ADDRESS,
+        update=lambda self, context: restart_socket_listener(self),
+    )
+    socket_peer_address: bpy.props.StringProperty(
+        name="Peer Address / 对端地址",
+        description="Address of the peer application that receives copied payloads / 接收复制数据的对端地址",
+        default=socket_transport.DEFAULT_PEER_ADDRESS,
+    )
+
+    # 增量复制：只导出上次复制后发生变化的对象，粘贴方替换之前粘贴的对应对象
+    incremental_copy: bpy.props.BoolProperty(
+        name="Incremental Copy / 增量复制",
+        description="Only export objects changed since the last Copy; the receiving Blender replaces the objects it pasted before / 只导出上次复制后有改动的对象，接收方 Blender 替换之前粘贴的对象",
+        default=False,
+        update=lambda self, context: reset_incremental_copy(),
+    )
+
+    # 后台复制：选中对象写入快照文件，由无界面的 Blender 进程导出，界面不会卡住
+    background_copy: bpy.props.BoolProperty(
+        name="Background Copy / 后台复制",
+        description="Export in a background Blender process so you can keep working while the payload is written / 在后台 Blender 进程中导出，导出期间可以继续工作",
+        default=False,
+    )
+
+    # 层级清单格式；旧版 hierarchy.txt 供仍按缩进解析层级的接收方使用
+    hierarchy_format: bpy.props.EnumProperty(
+        name="Hierarchy Format / 层级格式",
+        description="Encoding of the hierarchy manifest written with each Copy / 复制时写入的层级清单编码",
+        items=[
+            ('JSONL', "JSON Lines", "hierarchy.jsonl, one record per line / 每行一条记录"),
+            ('BINARY', "Binary / 二进制", "hierarchy.bin, packed records / 紧凑的二进制记录"),
+        ],
+        default='JSONL',
+    )
+    write_legacy_hierarchy: bpy.props.BoolProperty(
+        name="Legacy hierarchy.txt / 旧版层级文件",
+        description="Also write the indentation-based hierarchy.txt for older receivers / 同时写入按缩进表示层级的 hierarchy.txt，供旧版接收方使用",
+        default=True,
+    )
+
+    # 分片复制：按顶点数把大量选中对象分组，由多个后台 Blender 进程并行导出
+    # 分片只登记在清单的 "parts" 中，只有读取清单的 SyncTools（本版本）能完整粘贴；
+    # C4D 端和按最新 *.fbx 查找的旧版本只会导入其中一个分片，所以 C4D 预设下不分片
+    sharded_copy: bpy.props.BoolProperty(
+        name="Sharded Copy / 分片复制",
+        description="Split large selections into shards exported in parallel by background Blender processes. Only Blender receivers running this SyncTools version can paste sharded copies; ignored with the C4D axis preset / 把大量选中对象分片，由多个后台 Blender 进程并行导出。只有运行本版本 SyncTools 的 Blender 能粘贴分片数据；C4D 轴向预设下不分片",
+        default=False,
+    )
+    shard_count: bpy.props.IntProperty(
+        name="Shards / 分片数",
+        description="Number of parallel export processes, 0 = one per CPU core minus one / 并行导出的进程数，0 表示 CPU 核心数减一",
+        default=0,
+        min=0,
+        max=64,
+    )
+
+    prefetch_paste: bpy.props.BoolProperty(
+        name="Prepare Paste / 预转换",
+        description="Convert new payloads to .blend in the background as soon as they arrive, so Paste only appends / 新数据到达后立即在后台转换，粘贴时只需追加",
+        default=False,
+        update=lambda self, context: update_prefetch(self),
+    )
+    background_paste: bpy.props.BoolProperty(
+        name="Background Paste / 后台粘贴",
+        description="Convert the payload to .blend in a background Blender process, then append it / 在后台 Blender 进程中把数据转换为 .blend 后再追加",
+        default=False,
+    )
+
+    # 缓存数据压缩（缓存目录位于网络存储时可以减少传输量）
+    compression_standard: bpy.props.EnumProperty(
+        name="Compression / 压缩",
+        description="Compression for FBX payloads in the cache folder / 缓存目录中 FBX 数据的压缩方式",
+        items=COMPRESSION_ITEMS,
+        default='NONE',
+    )
+    compression_bata: bpy.props.EnumProperty(
+        name="Compression / 压缩",
+        description="Compression for ABC payloads in the cache folder / 缓存目录中 ABC 数据的压缩方式",
+        items=COMPRESSION_ITEMS,
+        default='NONE',
+    )
+    compression_binary: bpy.props.EnumProperty(
+        name="Compression / 压缩",
+        description="Compression for binary mesh payloads in the cache folder / 缓存目录中网格容器的压缩方式",
+        items=COMPRESSION_ITEMS,
+        default='NONE',
+    )
+    compression_level: bpy.props.IntProperty(
+        name="Level / 级别",
+        description="Compression level, clamped to the range of the chosen codec / 压缩级别，超出所选编码的范围时自动截断",
+        default=3,
+        min=0,
+        max=22,
+    )
+
+    # 分阶段计时：每次复制 / 粘贴追加一条记录到 cache/sync_trace.jsonl
+    trace_sync: bpy.props.BoolProperty(
+        name="Record Timings / 记录耗时",
+        description="Time each phase of Copy and Paste and append it to sync_trace.jsonl in the cache folder / 记录复制和粘贴各阶段的耗时，写入缓存目录中的 sync_trace.jsonl",
+        default=False,
+        update=lambda self, context: update_sync_trace(self),
+    )
+
     # ABC-specific option (for Bata mode)
     randomize_names_before_export: bpy.props.BoolProperty(
         name="Data Compatibility / 数据兼容性",
@@ -672,6 +849,16 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
         description="Import materials / 导入材质",
         default=True,
     )
+    import_reuse_materials: bpy.props.BoolProperty(
+        name="Reuse Identical Materials / 复用相同材质",
+        description="Reuse an existing material with the same node graph and textures instead of creating a copy on Paste / 粘贴时复用节点和贴图完全相同的已有材质，不再创建副本",
+        default=True,
+    )
+    import_texture_store: bpy.props.BoolProperty(
+        name="Deduplicate Textures / 贴图去重",
+        description="Reuse already loaded images whose file content matches a pasted texture instead of loading it again / 粘贴的贴图与已加载贴图的文件内容相同时直接复用，不再重复加载",
+        default=True,
+    )
     import_meshes: bpy.props.BoolProperty(
         name="Import Meshes / 导入网格",
         description="Import meshes / 导入网格",
@@ -720,6 +907,66 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
         default=True,
     )
 
+    # 烘焙动画的采样和关键帧精简，随导入导出预设变化
+    export_anim_step: bpy.props.FloatProperty(
+        name="Sampling Rate / 采样间隔",
+        description="How often to evaluate animated values, in frames / 每隔多少帧采样一次动画",
+        default=1.0,
+        min=0.01,
+        max=100.0,
+    )
+    export_anim_simplify: bpy.props.FloatProperty(
+        name="Simplify / 简化",
+        description="Built-in FBX curve simplification factor, 0 = keep every sample / FBX 导出器自带的曲线简化系数，0 表示保留全部采样",
+        default=1.0,
+        min=0.0,
+        max=100.0,
+    )
+    export_anim_location_tolerance: bpy.props.FloatProperty(
+        name="Location Tolerance / 位置容差",
+        description="Remove location keys while the curve stays within this distance, 0 = off / 在位置误差不超过该距离时去掉关键帧，0 表示不精简",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        precision=4,
+        unit='LENGTH',
+    )
+    export_anim_rotation_tolerance: bpy.props.FloatProperty(
+        name="Rotation Tolerance (°) / 旋转容差",
+        description="Remove rotation keys while the curve stays within this many degrees, 0 = off / 在旋转误差不超过该角度时去掉关键帧，0 表示不精简",
+        default=0.0,
+        min=0.0,
+        max=10.0,
+        precision=3,
+    )
+
+    # 复制时烘焙的帧窗口，记录到 project_info.json 供粘贴时对齐关键帧
+    export_frame_window: bpy.props.EnumProperty(
+        name="Frame Window / 帧窗口",
+        description="Frames baked into the copied animation / 复制时烘焙哪些帧的动画",
+        items=[
+            ('SCENE', "Scene Range / 场景范围", "Bake the scene frame range / 烘焙场景帧范围"),
+            ('PREVIEW', "Preview Range / 预览范围", "Bake the timeline preview range when it is enabled / 启用预览范围时烘焙预览范围"),
+            ('CUSTOM', "Custom / 自定义", "Bake a custom start, end and step / 烘焙自定义的起止帧和间隔"),
+        ],
+        default='SCENE',
+    )
+    export_frame_window_start: bpy.props.IntProperty(
+        name="Start / 起始帧",
+        default=1,
+    )
+    export_frame_window_end: bpy.props.IntProperty(
+        name="End / 结束帧",
+        default=250,
+    )
+    export_frame_window_step: bpy.props.FloatProperty(
+        name="Step / 间隔",
+        description="Sampling step in frames for the custom window / 自定义窗口的采样间隔（帧）",
+        default=1.0,
+        min=0.01,
+        max=100.0,
+    )
+
     # 添加旋转属性
     import_rotation_x: bpy.props.FloatProperty(
         name="Rotation X / X轴旋转",
@@ -939,6 +1186,10 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
             self.export_armatures = True
             self.import_bake_animation = True
             self.export_bake_animation = True
+            self.export_anim_step = 1.0
+            self.export_anim_simplify = 1.0
+            self.export_anim_location_tolerance = 0.0
+            self.export_anim_rotation_tolerance = 0.0
         elif self.import_export_preset == 'FAST':
             # 仅选择模型相关选项
             self.import_lights = False
@@ -953,6 +1204,10 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
             self.export_armatures = False
             self.import_bake_animation = False
             self.export_bake_animation = False
+            self.export_anim_step = 2.0
+            self.export_anim_simplify = 1.0
+            self.export_anim_location_tolerance = 0.001
+            self.export_anim_rotation_tolerance = 0.1
         else:  # MEDIUM
             # 选择常用选项
             self.import_lights = False
@@ -967,6 +1222,10 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
             self.export_armatures = True
             self.import_bake_animation = False
             self.export_bake_animation = False
+            self.export_anim_step = 1.0
+            self.export_anim_simplify = 1.0
+            self.export_anim_location_tolerance = 0.0005
+            self.export_anim_rotation_tolerance = 0.05
 
     def draw(self, context):
         layout = self.layout
@@ -987,12 +1246,55 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
         # Show mode description
         if self.sync_mode == 'STANDARD':
             box.label(text="FBX模式：完整功能，支持材质、灯光、相机等" if is_chinese else "FBX Mode: Full features, supports materials, lights, cameras", icon='INFO')
+        elif self.sync_mode == 'SOCKET':
+            box.label(text="套接字模式：本机直接传输FBX，不经过缓存目录" if is_chinese else "Socket Mode: FBX streamed on this machine, no cache folder round-trip", icon='LINKED')
+        elif self.sync_mode == 'SHARED_MEMORY':
+            box.label(text="共享内存模式：本机直接传输网格数组，仅几何" if is_chinese else "Shared Memory Mode: Mesh arrays on this machine, geometry only", icon='MEMORY')
+        elif self.sync_mode == 'BINARY':
+            box.label(text="二进制网格模式：原始数组直接读写，仅几何" if is_chinese else "Binary Mesh Mode: Raw arrays, no format conversion, geometry only", icon='MESH_DATA')
         else:
             box.label(text="ABC模式：专注几何传输，更快速" if is_chinese else "ABC Mode: Geometry-focused, faster transfer", icon='EXPERIMENTAL')
         
         # Show mode-specific options
         if self.sync_mode == 'BATA':
             box.prop(self, "randomize_names_before_export")
+        elif self.sync_mode == 'STANDARD':
+            box.prop(self, "incremental_copy")
+            row = box.row()
+            row.prop(self, "sharded_copy")
+            if self.sharded_copy:
+                row.prop(self, "shard_count")
+                if self.export_axis_preset == 'C4D':
+                    box.label(text="C4D 预设下不分片（C4D 无法读取分片数据）" if is_chinese
+                              else "Not sharded with the C4D preset (C4D cannot read shards)", icon='INFO')
+                else:
+                    box.label(text="接收端必须是本版本 SyncTools 的 Blender，旧版本和 C4D 只会导入一个分片" if is_chinese
+                              else "Receiver must be Blender with this SyncTools version; older versions and C4D import only one shard", icon='ERROR')
+        elif self.sync_mode == 'SOCKET':
+            box.prop(self, "socket_listen_address")
+            box.prop(self, "socket_peer_address")
+
+        if self.sync_mode in {'STANDARD', 'BATA'}:
+            row = box.row()
+            row.prop(self, "hierarchy_format")
+            row.prop(self, "write_legacy_hierarchy")
+            row = box.row()
+            row.prop(self, "background_copy")
+            row.prop(self, "background_paste")
+            row.prop(self, "prefetch_paste")
+
+        compression_property = COMPRESSION_PROPERTY.get(self.sync_mode)
+        if compression_property:
+            row = box.row()
+            row.prop(self, compression_property)
+            row.prop(self, "compression_level")
+
+        box.prop(self, "auto_paste")
+        if self.auto_paste:
+            row = box.row()
+            row.prop(self, "auto_paste_interval")
+            row.prop(self, "auto_paste_debounce")
+        box.prop(self, "trace_sync")
         
         layout.separator()
 
@@ -1003,6 +1305,10 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
         row.label(text=f"{'缓存文件' if is_chinese else 'Cache Files'}: {self.cache_file_count}")
         row.label(text=f"{'总大小' if is_chinese else 'Total Size'}: {self.cache_size_mb:.2f} MB")
         row = box.row()
+        row.prop(self, "cache_max_size_mb")
+        row.prop(self, "cache_max_age_hours")
+        row.prop(self, "cache_max_entries")
+        row = box.row()
         row.operator("preferences.clear_cache", 
             text="清除缓存" if is_chinese else "Clear Cache", 
             icon='TRASH')
@@ -1171,6 +1477,10 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
         row = layout.row()
         row.prop(self, "import_materials")
         row.prop(self, "export_materials")
+        if self.import_materials:
+            row = layout.row()
+            row.prop(self, "import_reuse_materials")
+            row.prop(self, "import_texture_store")
         
         row = layout.row()
         row.prop(self, "import_meshes")
@@ -1183,156 +1493,694 @@ class IDToolsPreferences(bpy.types.AddonPreferences):
         row = layout.row()
         row.prop(self, "export_bake_animation")
         row.prop(self, "import_bake_animation")
+
+        if self.export_bake_animation:
+            box = layout.box()
+            row = box.row()
+            row.prop(self, "export_anim_step")
+            row.prop(self, "export_anim_simplify")
+            row = box.row()
+            row.prop(self, "export_anim_location_tolerance")
+            row.prop(self, "export_anim_rotation_tolerance")
+            box.prop(self, "export_frame_window")
+            if self.export_frame_window == 'CUSTOM':
+                row = box.row()
+                row.prop(self, "export_frame_window_start")
+                row.prop(self, "export_frame_window_end")
+                row.prop(self, "export_frame_window_step")
         
         layout.separator()
 
+def get_latest_payload_file(cache_dir, kind):
+    """返回最新的数据文件：清单头部的记录和没有清单记录的文件中修改时间较新的一个"""
+    head = cache_manifest.read_head(cache_dir)
+    entry = cache_manifest.get_latest_payload(cache_dir, kind)
+    latest = Path(cache_dir) / entry["path"] if entry is not None else None
+
+    # 旧版插件导出的文件没有清单记录，按修改时间与清单中的最新数据比较；
+    # 尚未登记的分片等没有就绪记录的文件跳过
+    indexed = set()
+    for head_entry in head["latest"].values():
+        indexed.add(head_entry["path"])
+        indexed.update(part["path"] for part in head_entry.get("parts", ()))
+    payload_files = [path for path in Path(cache_dir).glob(f"*.{kind}")
+                     if path.name not in indexed and cache_manifest.unlisted_payload_visible(cache_dir, head, path.name)]
+    if payload_files:
+        newest = max(payload_files, key=os.path.getmtime)
+        if latest is None or os.path.getmtime(newest) > os.path.getmtime(latest):
+            return newest
+
+    return latest
+
+
 def get_latest_fbx_file(cache_dir):
-    fbx_files = list(Path(cache_dir).glob("*.fbx"))
-    if not fbx_files:
-        return None
+    return get_latest_payload_file(cache_dir, "fbx")
 
-    latest_fbx = max(fbx_files, key=os.path.getmtime)
-    return latest_fbx
 
+def payload_parts(cache_dir, kind, payload_path):
+    """返回数据的全部分片路径（按导入顺序）；不是分片数据时只有它自己"""
+    entry = cache_manifest.read_head(cache_dir)["latest"].get(kind)
+    if entry is not None and entry["path"] == os.path.basename(str(payload_path)) and "parts" in entry:
+        return [os.path.join(cache_dir, part["path"]) for part in entry["parts"]]
+    return [str(payload_path)]
 
-def import_latest_fbx():
-    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
-    cache_dir = os.path.join(documents_dir, "cache")
 
-    if not os.path.exists(cache_dir):
-        print(f"文件夹不存在: {cache_dir}")
+def mark_payload_consumed(cache_dir, kind, payload_path):
+    """删除就绪记录；如果导入的文件来自清单，追加一条消费记录"""
+    for part in payload_parts(cache_dir, kind, payload_path):
+        cache_manifest.discard_ready_record(cache_dir, os.path.basename(part))
+    entry = cache_manifest.read_head(cache_dir)["latest"].get(kind)
+    if entry is not None and entry["path"] == os.path.basename(str(payload_path)):
+        cache_manifest.mark_consumed(cache_dir, entry)
+
+
+_last_transfer = None  # 最近一次复制/粘贴的数据量，供操作符报告
+_last_key_reduction = None  # 最近一次导出精简的关键帧数
+_last_export_warning = None  # 最近一次导出退回到 FBX 操作符的原因
+_last_material_reuse = 0  # 最近一次粘贴复用的已有材质数
+_last_image_reuse = 0  # 最近一次粘贴复用的已加载贴图数
+
+
+def commit_cache_part(cache_dir, staged_path, codec='NONE'):
+    """按需压缩暂存文件并提交到 cache 目录（不登记清单），返回 (最终路径, 原始大小, 实际编码)"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    raw_size = os.path.getsize(staged_path)
+    if codec != 'NONE':
+        codec = payload_codec.resolve_codec(codec)
+        compressed_path = staged_path + payload_codec.SUFFIXES[codec]
+        with sync_trace.span("compress", codec=codec, raw_bytes=raw_size) as span:
+            span.add(bytes=payload_codec.compress_file(staged_path, compressed_path, codec, prefs.compression_level))
+        os.remove(staged_path)
+        staged_path = compressed_path
+
+    with sync_trace.span("commit"):
+        final_path = cache_manifest.commit_staged(cache_dir, staged_path)
+    return final_path, raw_size, codec
+
+
+def publish_cache_payload(cache_dir, staged_path, kind, seq, codec='NONE', hierarchy=(), **extra):
+    """按需压缩暂存文件，然后提交并登记到清单，返回最终路径
+
+    hierarchy 为 write_hierarchy_files 暂存的层级文件，在数据文件之后、登记清单之前提交。
+    """
+    global _last_transfer
+    try:
+        final_path, raw_size, codec = commit_cache_part(cache_dir, staged_path, codec)
+    except Exception:
+        discard_hierarchy_files(hierarchy)
+        raise
+    commit_hierarchy_files(cache_dir, hierarchy)
+    if codec != 'NONE':
+        extra.update(codec=codec, raw_size=raw_size)
+    with sync_trace.span("publish_manifest"):
+        entry = cache_manifest.publish_payload(cache_dir, final_path, kind, seq, **extra)
+    _published_seqs.add(seq)
+    _last_transfer = {"bytes": entry["size"], "raw_size": raw_size, "codec": codec}
+    schedule_cache_cleanup()
+    return final_path
+
+
+_cache_janitor = None
+
+
+def get_cache_policy(prefs):
+    return cache_janitor.CachePolicy(
+        max_bytes=prefs.cache_max_size_mb * 1024 * 1024,
+        max_age=prefs.cache_max_age_hours * 3600.0,
+        max_entries=prefs.cache_max_entries,
+    )
+
+
+def schedule_cache_cleanup():
+    """请求后台线程按偏好设置清理缓存，立即返回"""
+    global _cache_janitor
+    # 后台进程（sync_worker / bench_sync）不清理：用户的偏好设置此时还没有写入，
+    # 其他分片也可能已提交但尚未登记；后台复制完成后由界面进程负责清理
+    if bpy.app.background:
         return
+    if _cache_janitor is None:
+        documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+        _cache_janitor = cache_janitor.CacheJanitor(os.path.join(documents_dir, "cache"))
+        _cache_janitor.start()
+    _cache_janitor.schedule(get_cache_policy(bpy.context.preferences.addons[__name__].preferences))
+
+
+def stop_cache_janitor():
+    global _cache_janitor
+    if _cache_janitor is not None:
+        _cache_janitor.stop()
+        _cache_janitor = None
+
+
+def open_cache_payload(payload_path):
+    """返回可以直接交给导入器的路径；压缩的数据先流式解压到临时文件"""
+    global _last_transfer
+    codec = payload_codec.codec_for_path(payload_path)
+    _last_transfer = {"bytes": os.path.getsize(payload_path), "raw_size": None, "codec": codec}
+    if codec == 'NONE':
+        return str(payload_path)
+    with sync_trace.span("decompress", codec=codec, bytes=_last_transfer["bytes"]):
+        import_path = payload_codec.decompress_to_temp(payload_path)
+    _last_transfer["raw_size"] = os.path.getsize(import_path)
+    return import_path
+
+
+def close_cache_payload(payload_path, import_path):
+    """删除解压用的临时文件"""
+    if import_path != str(payload_path):
+        try:
+            os.remove(import_path)
+        except OSError:
+            pass
 
-    latest_fbx = get_latest_fbx_file(cache_dir)
 
-    if latest_fbx is None:
+def report_transfer(operator, prefs, elapsed):
+    """在操作符报告中显示传输的字节数和总耗时"""
+    global _last_key_reduction, _last_material_reuse, _last_image_reuse
+    if _last_transfer is None:
         return
+    is_chinese = prefs.interface_language == 'zh_HANS'
+    size_mb = _last_transfer["bytes"] / 1024 / 1024
+    if _last_transfer["codec"] != 'NONE' and _last_transfer["raw_size"]:
+        ratio = _last_transfer["bytes"] / _last_transfer["raw_size"]
+        detail = f"{_last_transfer['codec'].lower()} {ratio:.0%}"
+        text = f"数据 {size_mb:.2f} MB ({detail})，耗时 {elapsed:.2f} 秒" if is_chinese else f"{size_mb:.2f} MB ({detail}) in {elapsed:.2f}s"
+    else:
+        text = f"数据 {size_mb:.2f} MB，耗时 {elapsed:.2f} 秒" if is_chinese else f"{size_mb:.2f} MB in {elapsed:.2f}s"
+    if _last_key_reduction is not None:
+        removed = _last_key_reduction["removed"]
+        saved_mb = removed * fbx_tools.KEY_BYTES / 1024 / 1024
+        text += f"，精简 {removed} 个关键帧（约 {saved_mb:.2f} MB）" if is_chinese else f", {removed} keys removed (~{saved_mb:.2f} MB)"
+        _last_key_reduction = None
+    if _last_material_reuse:
+        text += f"，复用 {_last_material_reuse} 个材质" if is_chinese else f", {_last_material_reuse} materials reused"
+        _last_material_reuse = 0
+    if _last_image_reuse:
+        text += f"，复用 {_last_image_reuse} 张贴图" if is_chinese else f", {_last_image_reuse} images reused"
+        _last_image_reuse = 0
+    operator.report({'INFO'}, text)
+
+
+def remove_datablocks(doomed, scope=None):
+    """一次 batch_remove 删除 doomed 中的数据块，再在它们引用的数据中清理失去全部用户的部分
+
+    只检查被删除数据块引用过的网格、骨架、材质、动作和贴图（或者 scope 中的数据块），
+    不会删除用户场景中原有的孤立数据。返回删除的数据块总数。
+    """
+    doomed = {id_data.as_pointer(): id_data for id_data in doomed}
+    if not doomed:
+        return 0
+    if scope is None:
+        scope = import_session.collect_dependencies(doomed.values())
+    else:
+        scope = {id_data.as_pointer(): id_data for id_data in scope}
+    for pointer in doomed:
+        scope.pop(pointer, None)
+
+    removed = len(doomed)
+    bpy.data.batch_remove(doomed.values())
+    # 删除网格后材质的用户数才会下降，材质删除后才轮到贴图，逐层清理直到没有新的孤立数据
+    while scope:
+        orphans = {pointer: id_data for pointer, id_data in scope.items()
+                   if id_data.users == 0 and not id_data.use_fake_user}
+        if not orphans:
+            break
+        bpy.data.batch_remove(orphans.values())
+        removed += len(orphans)
+        for pointer in orphans:
+            del scope[pointer]
+    return removed
+
+
+def dedupe_pasted_images(new_objects, new_ids=None):
+    """把新材质引用的贴图按内容哈希对应到已加载的相同贴图，返回复用的数量
+
+    内容相同的贴图已经加载过时直接换成已有的图像数据块，不再读取和解码。图像的路径保持不变，
+    不引用缓存清理可能删除的额外文件。new_ids 的含义与 reuse_identical_materials() 相同。
+    """
+    global _last_image_reuse
+    dependencies = import_session.collect_dependencies(new_objects).values()
+    materials = [id_data for id_data in dependencies if isinstance(id_data, bpy.types.Material)
+                 and (new_ids is None or id_data.as_pointer() in new_ids)]
+    images = {id_data.as_pointer(): id_data for id_data in dependencies if isinstance(id_data, bpy.types.Image)
+              and id_data.source == 'FILE' and id_data.packed_file is None and id_data.library is None
+              and (new_ids is None or id_data.as_pointer() in new_ids)}
+    if not images:
+        return 0
 
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    texture_index = texture_store.TextureIndex(os.path.join(documents_dir, "cache"))
+    candidates = {}
+    for image in bpy.data.images:
+        digest = image.get(texture_store.IMAGE_HASH_PROPERTY)
+        if digest is not None and image.as_pointer() not in images:
+            candidates.setdefault(digest, []).append(image)
+
+    def still_matches(image, digest):
+        """已加载的贴图必须已打包，或者文件仍然存在且内容未变（用户可能改过路径或文件）"""
+        if image.packed_file is not None:
+            return True
+        path = bpy.path.abspath(image.filepath, library=image.library)
+        try:
+            return os.path.isfile(path) and texture_index.hash_file(path) == digest
+        except OSError:
+            return False
+
+    remap = {}
+    for pointer, image in images.items():
+        path = bpy.path.abspath(image.filepath)
+        try:
+            digest = texture_index.hash_file(path)
+        except OSError:
+            continue
+        existing = next((candidate for candidate in candidates.get(digest, ()) if still_matches(candidate, digest)), None)
+        if existing is not None:
+            remap[pointer] = existing
+            continue
+        image[texture_store.IMAGE_HASH_PROPERTY] = digest
+        candidates.setdefault(digest, []).insert(0, image)
+    try:
+        texture_index.save()
+    except OSError as e:
+        print(f"无法写入贴图索引: {e}")
+    if not remap:
+        return 0
+
+    # 新贴图只被新材质（及其节点组）引用，直接替换图像节点
+    visited = set()
+    trees = [mat.node_tree for mat in materials if mat.node_tree is not None]
+    while trees:
+        tree = trees.pop()
+        for node in tree.nodes:
+            image = getattr(node, "image", None)
+            if image is not None and image.as_pointer() in remap:
+                node.image = remap[image.as_pointer()]
+            group = getattr(node, "node_tree", None)
+            if group is not None and group.as_pointer() not in visited:
+                visited.add(group.as_pointer())
+                trees.append(group)
+    remove_datablocks([images[pointer] for pointer in remap])
+    _last_image_reuse += len(remap)
+    print(f"复用了 {len(remap)} 张已加载的贴图")
+    return len(remap)
+
+
+def reuse_identical_materials(new_objects, new_ids=None):
+    """把新对象上的新材质替换为内容相同的已有材质，删除不再使用的副本，返回复用的数量
+
+    new_ids 为本次导入新建数据块的指针集合，为 None 时新对象上的材质都视为新建。
+    已有材质只在指纹记录相同时才重新计算指纹确认（粘贴后可能被用户修改过）。
+    """
+    global _last_material_reuse
+    candidates = {}
+    for obj in new_objects:
+        for slot in obj.material_slots:
+            mat = slot.material
+            if mat is not None and mat.library is None and (new_ids is None or mat.as_pointer() in new_ids):
+                candidates[mat.as_pointer()] = mat
+    if not candidates:
+        return 0
+
+    index = {}
+    for mat in bpy.data.materials:
+        stored = mat.get(object_fingerprint.MATERIAL_HASH_PROPERTY)
+        if stored is not None and mat.as_pointer() not in candidates:
+            index.setdefault(stored, []).append(mat)
+
+    remap = {}
+    verified = set()
+    for pointer, mat in candidates.items():
+        fingerprint = object_fingerprint.fingerprint_material(mat)
+        for existing in index.get(fingerprint, ()):
+            if existing.as_pointer() in verified or object_fingerprint.fingerprint_material(existing) == fingerprint:
+                verified.add(existing.as_pointer())
+                remap[pointer] = existing
+                break
+        else:
+            # 同一次粘贴中的重复材质（例如不同分片）也合并到第一个
+            mat[object_fingerprint.MATERIAL_HASH_PROPERTY] = fingerprint
+            index.setdefault(fingerprint, []).insert(0, mat)
+            verified.add(pointer)
+    if not remap:
+        return 0
+
+    # 新材质只被新对象使用，直接替换材质槽，不需要遍历整个文件重定向引用
+    for obj in new_objects:
+        for slot in obj.material_slots:
+            if slot.material is not None and slot.material.as_pointer() in remap:
+                slot.material = remap[slot.material.as_pointer()]
+    remove_datablocks([candidates[pointer] for pointer in remap])
+    _last_material_reuse += len(remap)
+    print(f"复用了 {len(remap)} 个已有材质")
+    return len(remap)
+
+
+def import_fbx_payload(fbx_path, frame_window=None):
+    """按用户设置导入 FBX 文件，并处理对象类型过滤和摄像机裁剪
+
+    frame_window 为复制时烘焙的帧窗口，导入后把动画对齐到窗口起点。
+    """
     # 获取用户设置
     prefs = bpy.context.preferences.addons[__name__].preferences
 
-    # 记录导入前的对象列表
-    pre_import_objects = set(bpy.context.scene.objects)
-
-    # 导入FBX
-    bpy.ops.import_scene.fbx(
-        filepath=str(latest_fbx),
-        axis_forward=prefs.import_axis_forward,
-        axis_up=prefs.import_axis_up,
-        global_scale=prefs.import_global_scale
-    )
-
-    # 获取新导入的对象
-    new_objects = set(bpy.context.scene.objects) - pre_import_objects
-
-    # 删除不需要的物体类型和动画数据
-    for obj in new_objects:  # 只处理新导入的对象
-        if (obj.type == 'LIGHT' and not prefs.import_lights) or \
-           (obj.type == 'CAMERA' and not prefs.import_cameras) or \
-           (obj.type == 'MESH' and not prefs.import_meshes) or \
-           (obj.type == 'ARMATURE' and not prefs.import_armatures):
-            bpy.data.objects.remove(obj, do_unlink=True)
-        elif obj.type in {'MATERIAL', 'MESH'} and not prefs.import_materials:
-            for mat in obj.data.materials:
-                bpy.data.materials.remove(mat, do_unlink=True)
-        
-        # 如果禁用了动画导入，只删除新导入对象的动画数据
-        if not prefs.import_bake_animation:
-            if obj.animation_data:
-                obj.animation_data_clear()
-            # 如果是骨骼，只清除新导入骨骼的姿势动画
-            if obj.type == 'ARMATURE':
-                for pbone in obj.pose.bones:
-                    if pbone.animation_data:
-                        pbone.animation_data_clear()
+    # 不导入的对象类型和材质在解析之后、建立数据之前删除，动画由导入器直接跳过
+    excluded_types = {obj_type for obj_type, enabled in (
+        ('LIGHT', prefs.import_lights),
+        ('CAMERA', prefs.import_cameras),
+        ('MESH', prefs.import_meshes),
+        ('ARMATURE', prefs.import_armatures),
+    ) if not enabled}
+
+    # 导入FBX：导入到临时集合中，直接得到新建的对象，不需要对比整个场景
+    with sync_trace.span("fbx_import", bytes=os.path.getsize(fbx_path)) as span, \
+            import_session.track() as session, \
+            fbx_tools.import_filter(excluded_types, not prefs.import_materials) as filter_stats:
+        bpy.ops.import_scene.fbx(
+            filepath=str(fbx_path),
+            axis_forward=prefs.import_axis_forward,
+            axis_up=prefs.import_axis_up,
+            global_scale=prefs.import_global_scale,
+            use_anim=prefs.import_bake_animation,
+        )
+        span.add(pruned=filter_stats["removed"])
+
+    new_objects = session.objects
+    new_ids = {id_data.as_pointer() for id_data in session.ids}
+
+    # 内置 FBX 插件的接口变化、无法在解析阶段过滤时，退回到导入后删除
+    if not filter_stats["applied"]:
+        print("警告: 无法在解析阶段过滤 FBX 节点，改为导入后删除")
+        with sync_trace.span("type_filter", objects=len(new_objects)) as span:
+            # 先收集全部要删除的对象和材质（共用的材质只记一次），最后一次性删除
+            doomed = [obj for obj in new_objects if obj.type in excluded_types]
+            kept = [obj for obj in new_objects if obj.type not in excluded_types]
+            if not prefs.import_materials:
+                doomed.extend({mat for obj in new_objects if obj.type == 'MESH'
+                               for mat in obj.data.materials if mat is not None})
+            span.add(removed=remove_datablocks(doomed))
+        new_objects = kept
+
+    # 先统一贴图，之后相同的材质指纹才会一致
+    if prefs.import_materials and prefs.import_texture_store:
+        with sync_trace.span("texture_dedupe") as span:
+            span.add(reused=dedupe_pasted_images(new_objects, new_ids))
+    if prefs.import_materials and prefs.import_reuse_materials:
+        with sync_trace.span("material_reuse") as span:
+            span.add(reused=reuse_identical_materials(new_objects, new_ids))
 
     # 根据 import_global_scale 按比例缩放新导入的摄像机裁剪起始值
     if prefs.import_cameras:
-        for obj in new_objects:
-            if obj.type == 'CAMERA':
-                base_clip_start = 0.1
-                obj.data.clip_start = base_clip_start / prefs.import_global_scale
-                print(f"设置摄像机 {obj.name} 的裁剪起始为 {obj.data.clip_start} 米")
+        with sync_trace.span("camera_fixup"):
+            for obj in new_objects:
+                if obj.type == 'CAMERA':
+                    base_clip_start = 0.1
+                    obj.data.clip_start = base_clip_start / prefs.import_global_scale
+                    print(f"设置摄像机 {obj.name} 的裁剪起始为 {obj.data.clip_start} 米")
 
-    try:
-        os.remove(str(latest_fbx))
-        print(f"已删除文件: {latest_fbx}")
-    except Exception as e:
-        print(f"删除文件失败: {e}")
+    if frame_window is not None and prefs.import_bake_animation:
+        align_pasted_animation(new_objects, frame_window)
+    return new_objects
 
 
-def get_unique_name(name, name_dict):
-    """获取唯一的名称，如果重复则添加编号"""
-    base_name = re.sub(r'\.\d+$', '', name)
-    if base_name not in name_dict:
-        name_dict[base_name] = 1
-        return base_name
-    else:
-        unique_name = f"{base_name}.{name_dict[base_name]:03d}"
-        name_dict[base_name] += 1
-        return unique_name
-
+def import_latest_fbx():
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    cache_dir = os.path.join(documents_dir, "cache")
 
-def write_hierarchy_to_file(obj, level=0, file=None, name_dict=None, selected_objects=None):
-    """递归写入选中对象的层级结构到文件并编号"""
-    if obj is None or (selected_objects and obj not in selected_objects):
+    if not os.path.exists(cache_dir):
+        print(f"文件夹不存在: {cache_dir}")
         return
 
-    unique_name = get_unique_name(obj.name, name_dict)
-    file.write(' ' * level * 4 + f"{unique_name}\n")
-
-    for child in obj.children:
-        write_hierarchy_to_file(child, level + 1, file, name_dict, selected_objects)
+    latest_fbx = get_latest_fbx_file(cache_dir)
 
+    if latest_fbx is None:
+        return
 
-def get_export_counter(counter_file):
-    """获取当前的导出计数器值"""
-    if os.path.exists(counter_file):
-        with open(counter_file, 'r') as file:
+    # 增量复制的数据在清单记录中带有 delta，替换之前粘贴的对象
+    entry = cache_manifest.get_latest_payload(cache_dir, "fbx")
+    delta = entry.get("delta") if entry is not None and entry["path"] == latest_fbx.name else None
+    frame_window = read_frame_window()
+    parts = payload_parts(cache_dir, "fbx", latest_fbx)
+    if delta is not None:
+        import_path = open_cache_payload(latest_fbx)
+        try:
+            apply_fbx_delta(import_path, delta, frame_window)
+        finally:
+            close_cache_payload(latest_fbx, import_path)
+    else:
+        # 分片数据按顺序导入；每个分片包含完整的子树，层级在分片内部恢复
+        new_objects = []
+        for part in parts:
+            import_path = open_cache_payload(part)
             try:
-                return int(file.read().strip())
-            except ValueError:
-                return 1
-    return 1
+                new_objects.extend(import_fbx_payload(import_path, frame_window))
+            finally:
+                close_cache_payload(part, import_path)
+        object_fingerprint.tag_pasted_objects(new_objects)
+        if len(parts) > 1:
+            _last_transfer["bytes"] = sum(os.path.getsize(part) for part in parts)
+            _last_transfer["raw_size"] = None
+            print(f"已导入 {len(parts)} 个分片")
+
+    with sync_trace.span("consume"):
+        for part in parts:
+            try:
+                os.remove(part)
+                print(f"已删除文件: {part}")
+            except Exception as e:
+                print(f"删除文件失败: {e}")
+
+        mark_payload_consumed(cache_dir, "fbx", latest_fbx)
+
+
+def apply_fbx_delta(fbx_path, delta, frame_window=None):
+    """应用增量数据：删除之前粘贴的改动/已删除对象，导入新版本并恢复父子关系"""
+    changed = set(delta["changed"])
+    replaced = changed | set(delta["deleted"])
+    # 同一个来源可能被粘贴过多次，全部替换
+    previous = [obj for obj in bpy.data.objects if obj.get(object_fingerprint.SOURCE_PROPERTY) in replaced]
+
+    # 被替换对象下面没有改动的子对象，导入后重新挂到新对象上
+    orphans = []
+    for obj in previous:
+        for child in obj.children:
+            if child.get(object_fingerprint.SOURCE_PROPERTY) not in replaced:
+                orphans.append((child, obj[object_fingerprint.SOURCE_PROPERTY], child.matrix_world.copy()))
+    with sync_trace.span("remove_previous", objects=len(previous)) as span:
+        span.add(removed=remove_datablocks(previous))
+    print(f"已移除 {len(previous)} 个旧对象")
+
+    new_objects = import_fbx_payload(fbx_path, frame_window)
+    object_fingerprint.tag_pasted_objects(new_objects, changed)
+
+    parent_names = set(delta["parents"].values()) | {source for _child, source, _matrix in orphans}
+    pasted = object_fingerprint.find_pasted_objects(parent_names)
+    for obj in new_objects:
+        parent = pasted.get(delta["parents"].get(obj[object_fingerprint.SOURCE_PROPERTY]))
+        if obj.parent is None and parent is not None and parent is not obj:
+            matrix = obj.matrix_world.copy()
+            obj.parent = parent
+            obj.matrix_world = matrix
+    for child, source, matrix in orphans:
+        child.parent = pasted.get(source)
+        child.matrix_world = matrix
+    print(f"增量粘贴完成: {len(new_objects)} 个对象更新, {len(delta['deleted'])} 个对象删除")
+    return new_objects
+
+
+def reset_incremental_copy():
+    """清除指纹记录，下一次复制导出全部选中对象"""
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    object_fingerprint.reset_state(os.path.join(documents_dir, "cache"))
 
 
-def increment_export_counter(counter_file):
-    """递增导出计数器值并返回新的计数器值"""
-    counter = get_export_counter(counter_file)
-    with open(counter_file, 'w') as file:
-        counter += 1
-        file.write(str(counter))
-    return counter
+def write_hierarchy_files(cache_dir, selected_objects, seq):
+    """把选中对象的层级清单写入暂存目录，按设置同时写入旧版 hierarchy.txt，返回 [(暂存路径, 文件名)]
 
+    层级文件由 publish_cache_payload 在数据文件提交后、登记清单前一起提交，
+    导出失败时 cache 目录中的层级文件仍与上一次发布的数据一致。
+    """
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    records = hierarchy_manifest.build_records(selected_objects)
 
-def delete_previous_exports(cache_dir):
-    """删除之前的所有导出文件"""
-    for filename in os.listdir(cache_dir):
-        if filename.startswith("export") and filename.endswith(".fbx"):
-            os.remove(os.path.join(cache_dir, filename))
-    print("之前的所有导出文件已删除")
+    if prefs.hierarchy_format == 'BINARY':
+        outputs = [(hierarchy_manifest.BINARY_FILE, hierarchy_manifest.write_binary)]
+    else:
+        outputs = [(hierarchy_manifest.JSONL_FILE, hierarchy_manifest.write_jsonl)]
+    if prefs.write_legacy_hierarchy:
+        outputs.append((hierarchy_manifest.TEXT_FILE, hierarchy_manifest.write_text))
+
+    staged = []
+    for filename, writer in outputs:
+        # 暂存文件名带上序号，同时进行的复制不会互相覆盖
+        staged_path = cache_manifest.staging_path(cache_dir, f"{seq}_{filename}")
+        with open(staged_path, 'wb') as file:
+            writer(file, records)
+        staged.append((staged_path, filename))
+    print(f"层级结构已暂存 ({len(records)} 个节点)")
+    return staged
+
+
+def commit_hierarchy_files(cache_dir, staged):
+    """提交 write_hierarchy_files 暂存的层级文件，返回最终路径"""
+    paths = [cache_manifest.commit_staged(cache_dir, staged_path, filename) for staged_path, filename in staged]
+    if paths:
+        print(f"层级结构已保存到: {', '.join(paths)}")
+    return paths
+
+
+def discard_hierarchy_files(staged):
+    """发布失败时删除暂存的层级文件"""
+    for staged_path, _filename in staged:
+        try:
+            os.remove(staged_path)
+        except OSError:
+            pass
 
 
 def export_fbx_to_cache():
-    """导出当前场景为 FBX 文件到 cache 文件夹，并处理计数器和层级文件"""
+    """导出当前场景为 FBX 文件到 cache 文件夹，登记到清单并写入层级文件"""
     documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
     cache_dir = os.path.join(documents_dir, "cache")
 
     if not os.path.exists(cache_dir):
         os.makedirs(cache_dir)
 
-    counter_file = os.path.join(cache_dir, "export_counter.txt")
-    counter = get_export_counter(counter_file)
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    selected_objects = list(bpy.context.selected_objects)
+    active_object = bpy.context.view_layer.objects.active
+    export_objects = selected_objects
+    extra = {}
+
+    # 增量复制：按指纹找出改动的对象
+    if prefs.incremental_copy:
+        with sync_trace.span("fingerprint", objects=len(selected_objects)):
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            changed, deleted, fingerprint_state = object_fingerprint.compute_delta(cache_dir, selected_objects, depsgraph)
+        if not changed and not deleted:
+            print("没有改动的对象，跳过复制")
+            return 0
+        export_objects = changed
+        extra["delta"] = {
+            "changed": [obj.name for obj in changed],
+            "deleted": deleted,
+            "parents": {obj.name: obj.parent.name if obj.parent else "" for obj in changed},
+        }
+        print(f"增量复制: {len(changed)} 个对象改动, {len(deleted)} 个对象删除")
 
-    if counter >= 10:
-        delete_previous_exports(cache_dir)
-        counter = 1
+    # 序号由清单分配，旧文件由后台清理线程处理
+    seq = cache_manifest.reserve_sequence(cache_dir)
 
-    counter = increment_export_counter(counter_file)
-    fbx_filepath = os.path.join(cache_dir, f"export_{counter}.fbx")
+    # 先导出到暂存目录，导入方在发布前看不到这个文件
+    fbx_filepath = cache_manifest.staging_path(cache_dir, f"export_{seq}.fbx")
+    if export_objects is not selected_objects:
+        for obj in selected_objects:
+            obj.select_set(False)
+        for obj in export_objects:
+            obj.select_set(True)
+    try:
+        with sync_trace.span("fbx_export", objects=len(export_objects)) as span:
+            export_fbx_file(fbx_filepath)
+            span.add(bytes=os.path.getsize(fbx_filepath))
+    finally:
+        if export_objects is not selected_objects:
+            for obj in export_objects:
+                obj.select_set(False)
+            for obj in selected_objects:
+                obj.select_set(True)
+            bpy.context.view_layer.objects.active = active_object
 
+    # --- 通用部分：写入层级文件 ---
+    with sync_trace.span("hierarchy", objects=len(export_objects)):
+        hierarchy = write_hierarchy_files(cache_dir, export_objects, seq)
+
+    # 两阶段发布：暂存文件 fsync 后原子改名，再写就绪记录并登记清单
+    fbx_filepath = publish_cache_payload(cache_dir, fbx_filepath, "fbx", seq, prefs.compression_standard,
+                                         hierarchy=hierarchy, **extra)
+    if "delta" in extra:
+        object_fingerprint.commit_delta(cache_dir, fingerprint_state, fbx_filepath, seq)
+    return len(export_objects)
+
+
+def export_fbx_file(fbx_filepath):
+    """按用户设置把选中对象导出为 FBX 文件，动画关键帧按容差精简"""
+    global _last_key_reduction
     prefs = bpy.context.preferences.addons[__name__].preferences
 
+    scene = bpy.context.scene
+    start, end, step = get_export_frame_window(prefs, scene)
+    with scene_frame_range(scene, start, end), fbx_tools.curve_reduction(
+        prefs.export_anim_location_tolerance,
+        prefs.export_anim_rotation_tolerance,
+        prefs.export_global_scale,
+    ) as stats:
+        write_fbx_file(fbx_filepath, prefs, step)
+
+    if stats["removed"]:
+        _last_key_reduction = stats
+        print(f"关键帧精简: {stats['keys']} -> {stats['keys'] - stats['removed']}")
+
+
+def get_export_frame_window(prefs, scene):
+    """返回复制时烘焙的帧窗口 (起始帧, 结束帧, 采样间隔)"""
+    if prefs.export_frame_window == 'CUSTOM':
+        start = prefs.export_frame_window_start
+        end = max(start, prefs.export_frame_window_end)
+        return start, end, prefs.export_frame_window_step
+    if prefs.export_frame_window == 'PREVIEW' and scene.use_preview_range:
+        return scene.frame_preview_start, scene.frame_preview_end, prefs.export_anim_step
+    return scene.frame_start, scene.frame_end, prefs.export_anim_step
+
+
+@contextmanager
+def scene_frame_range(scene, start, end):
+    """导出期间临时把场景帧范围设为 start..end（导出器按场景帧范围烘焙）"""
+    original = (scene.frame_start, scene.frame_end)
+    # 先设起始帧再设结束帧，start <= end 时不会被 Blender 相互推移
+    scene.frame_start = start
+    scene.frame_end = end
+    try:
+        yield
+    finally:
+        scene.frame_start = original[0]
+        scene.frame_end = original[1]
+
+
+def read_frame_window(project_info=None):
+    """从项目信息中读取复制时烘焙的帧窗口，没有记录时返回 None
+
+    project_info 为空时读取 cache 目录中的 project_info.json。
+    """
+    if project_info is None:
+        json_path = os.path.join(os.path.expanduser("~"), "Documents", "cache", "project_info.json")
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                project_info = json.load(f)
+        except (OSError, ValueError):
+            return None
+    start = project_info.get("anim_frame_start", "none")
+    if start == "none":
+        return None
+    return start, project_info["anim_frame_end"], project_info["anim_frame_step"]
+
+
+def align_pasted_animation(new_objects, frame_window):
+    """把新导入对象的动画平移到复制时的帧窗口起点"""
+    actions = set()
+    for obj in new_objects:
+        for owner in (obj, getattr(obj.data, "shape_keys", None)):
+            if owner is not None and owner.animation_data and owner.animation_data.action:
+                actions.add(owner.animation_data.action)
+    first = fbx_tools.first_key_frame(actions)
+    if first is None:
+        return
+    offset = frame_window[0] - first
+    if abs(offset) > 1e-3:
+        fbx_tools.shift_actions(actions, offset)
+        print(f"动画已平移 {offset:+g} 帧，对齐到第 {frame_window[0]} 帧")
+
+
+def write_fbx_file(fbx_filepath, prefs, step):
+    global _last_export_warning
     # 根据预设选择导出逻辑
     if prefs.export_axis_preset == 'C4D':
         # --- 旧版 C4D 导出逻辑 ---
@@ -1355,56 +2203,15 @@ def export_fbx_to_cache():
             bake_anim=prefs.export_bake_animation,
             bake_anim_use_all_bones=False,
             bake_anim_force_startend_keying=True,
-            bake_anim_step=1.0,
-            bake_anim_simplify_factor=1.0,
+            bake_anim_step=step,
+            bake_anim_simplify_factor=prefs.export_anim_simplify,
             object_types=object_types
         )
         print(f"场景成功导出为 (C4D Preset): {fbx_filepath}")
 
     else:
         # --- 当前的导出逻辑 (非 C4D 预设) ---
-        # 保存选中的对象
-        selected_objects = bpy.context.selected_objects
-        active_object = bpy.context.active_object
-
-        # 为选中的对象创建临时副本并应用旋转和缩放
-        temp_objects = []
-        bpy.ops.object.select_all(action='DESELECT') # 取消选择所有对象以准备选择副本
-        for obj in selected_objects:
-            # 创建对象的副本
-            temp_obj = obj.copy()
-            if obj.data:
-                temp_obj.data = obj.data.copy()
-            bpy.context.scene.collection.objects.link(temp_obj)
-            
-            # 应用导出旋转
-            rotation_x = math.radians(prefs.export_rotation_x)
-            rotation_y = math.radians(prefs.export_rotation_y)
-            rotation_z = math.radians(prefs.export_rotation_z)
-            
-            temp_obj.rotation_euler.x += rotation_x
-            temp_obj.rotation_euler.y += rotation_y
-            temp_obj.rotation_euler.z += rotation_z
-
-            # 为灯光对象应用独立缩放
-            if temp_obj.type == 'LIGHT' and prefs.export_lights:
-                 # 注意：这里我们只应用缩放值，不在导出前应用变换
-                 # 因为 FBX 导出器会处理 global_scale
-                 # 如果需要对灯光应用特定的独立缩放，可能需要更复杂的处理
-                 # 或者调整 C4D 端导入时的灯光缩放
-                 pass # 暂时不直接应用灯光缩放，依赖 global_scale
-
-            temp_objects.append(temp_obj)
-            temp_obj.select_set(True) # 选中副本以供导出
-
-        # 设置活动对象为副本中的第一个（如果存在）
-        if temp_objects:
-            bpy.context.view_layer.objects.active = temp_objects[0]
-        else:
-             bpy.context.view_layer.objects.active = None # 如果没有选中对象，则没有活动对象
-
-
-        # 导出FBX (使用副本)
+        # 导出旋转作为全局矩阵传给导出器，不复制对象和网格，也不改变选择
         object_types = {'EMPTY'}
         if prefs.export_lights:
             object_types.add('LIGHT')
@@ -1415,48 +2222,809 @@ def export_fbx_to_cache():
         if prefs.export_armatures:
             object_types.add('ARMATURE')
 
-        bpy.ops.export_scene.fbx(
-            filepath=fbx_filepath,
-            axis_forward=prefs.export_axis_forward, # 使用预设轴向
-            axis_up=prefs.export_axis_up,           # 使用预设轴向
+        export_options = dict(
             global_scale=prefs.export_global_scale, # 使用预设缩放
-            use_selection=True, # 导出选中的副本
+            use_selection=True,
             bake_anim=prefs.export_bake_animation,
             bake_anim_use_all_bones=False,
             bake_anim_force_startend_keying=True,
-            bake_anim_step=1.0,
-            bake_anim_simplify_factor=1.0,
+            bake_anim_step=step,
+            bake_anim_simplify_factor=prefs.export_anim_simplify,
             object_types=object_types
         )
+        rotation = Euler((
+            math.radians(prefs.export_rotation_x),
+            math.radians(prefs.export_rotation_y),
+            math.radians(prefs.export_rotation_z),
+        ), 'XYZ').to_matrix().to_4x4()
+
+        reason = fbx_tools.direct_export_error()
+        if reason is None:
+            fbx_tools.export_fbx(
+                fbx_filepath,
+                prefs.export_axis_forward, # 使用预设轴向
+                prefs.export_axis_up,      # 使用预设轴向
+                extra_matrix=rotation,
+                **export_options
+            )
+        else:
+            # 内置 FBX 插件的接口变化时退回到操作符，此时无法应用导出旋转，由复制操作符报告警告
+            _last_export_warning = reason
+            print(f"警告: 无法直接调用 FBX 导出器 ({reason})，导出旋转未应用")
+            bpy.ops.export_scene.fbx(
+                filepath=fbx_filepath,
+                axis_forward=prefs.export_axis_forward,
+                axis_up=prefs.export_axis_up,
+                **export_options
+            )
 
-        # 清理：删除临时对象
-        for temp_obj in temp_objects:
-            bpy.data.objects.remove(temp_obj, do_unlink=True)
+        print(f"场景成功导出为 (Non-C4D Preset): {fbx_filepath}")
 
-        # 恢复原始选择
-        bpy.ops.object.select_all(action='DESELECT') # 先取消所有选择
-        for obj in selected_objects:
-            obj.select_set(True)
-        if active_object:
-            bpy.context.view_layer.objects.active = active_object
 
-        print(f"场景成功导出为 (Non-C4D Preset): {fbx_filepath}")
+def read_importx_flag():
+    """读取 Preference.txt 中的 SYNC_PREFERENCE_CHECK2，文件不存在时创建默认内容"""
+    # 获取Preference.txt文件路径
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    preference_file = os.path.join(documents_dir, "cache", "Preference.txt")
+
+    # 检查 Preference.txt 文件是否存在，如果不存在则创建它
+    if not os.path.exists(preference_file):
+        # 创建包含默认内容的 Preference.txt 文件
+        os.makedirs(os.path.dirname(preference_file), exist_ok=True)  # 确保目录存在
+        with open(preference_file, 'w', encoding='utf-8') as file:
+            file.write("Preference Container Data:\n")
+            file.write("SYNC_PREFERENCE_CHECK: True\n")
+            file.write("SYNC_PREFERENCE_NUMBER: 10\n")
+            file.write("SYNC_PREFERENCE_CHECK2: True\n")
+        print(f"已创建文件: {preference_file}，并写入默认内容。")
+
+    # 检查文件是否存在并读取SYNC_PREFERENCE_CHECK2的值
+    execute_importx = False
+    if os.path.exists(preference_file):
+        with open(preference_file, 'r') as file:
+            for line in file:
+                if line.startswith("SYNC_PREFERENCE_CHECK2"):
+                    # 设置标志，如果值为True，则标志为True
+                    execute_importx = "True" in line
+                    break
+    else:
+        print(f"未找到文件: {preference_file}")
+    return execute_importx
 
 
-    # --- 通用部分：写入层级文件 ---
-    txt_path = os.path.join(cache_dir, "hierarchy.txt")
-    name_dict = {}
-    # 确保我们引用的是原始选择的对象来写入层级
-    original_selected_objects = bpy.context.selected_objects
-    
-    with open(txt_path, 'w', encoding='utf-8') as file: # 指定UTF-8编码
-        # 只写入选中的对象的层级结构
-        top_level_selected = [obj for obj in original_selected_objects if obj.parent is None or obj.parent not in original_selected_objects]
-        for obj in top_level_selected:
-            write_hierarchy_to_file(obj, file=file, name_dict=name_dict, selected_objects=set(original_selected_objects))
+def run_octane_importx():
+    try:
+        bpy.ops.import_octane_material.importx()
+        print("SYNC_PREFERENCE_CHECK2为True，执行importx操作")
+    except AttributeError:
+        print("未找到 'import_octane_material.importx' 操作。请确保相关插件已安装。")
+
+
+# 本地套接字模式：数据直接在本机两个进程之间传输，不经过 Documents/cache
+_socket_listener = None
+
+
+def export_fbx_to_socket():
+    """导出 FBX 到内存盘暂存文件，并连同层级和项目信息一起发送给对端"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    spool_dir = socket_transport.default_spool_dir()
+    fbx_filepath = os.path.join(spool_dir, f"export_{os.getpid()}_{random.getrandbits(32):08x}.fbx")
+
+    meta = {
+        "hierarchy": hierarchy_manifest.build_records(bpy.context.selected_objects),
+        "project_info": build_project_info_data(),
+    }
+
+    with sync_trace.span("fbx_export"):
+        export_fbx_file(fbx_filepath)
+    try:
+        with sync_trace.span("socket_send") as span:
+            size = socket_transport.send_file(prefs.socket_peer_address, fbx_filepath, "fbx", meta=meta)
+            span.add(bytes=size)
+        print(f"已通过套接字发送 {size} 字节到 {prefs.socket_peer_address}")
+    finally:
+        os.remove(fbx_filepath)
+
+
+def import_fbx_from_socket():
+    """导入通过套接字收到的最新 FBX，没有数据时返回 False"""
+    if _socket_listener is None:
+        print("套接字监听未启动")
+        return False
+
+    payload = _socket_listener.take_latest("fbx")
+    if payload is None:
+        return False
+
+    project_info = payload["meta"].get("project_info")
+    frame_window = None
+    if project_info:
+        apply_project_info_data(project_info)
+        print("已导入项目信息")
+        frame_window = read_frame_window(project_info)
+
+    try:
+        import_fbx_payload(payload["path"], frame_window)
+    finally:
+        os.remove(payload["path"])
+    return True
+
+
+def start_socket_listener():
+    """启动套接字监听"""
+    global _socket_listener
+    if _socket_listener is not None or bpy.app.background:
+        return
+
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    listener = socket_transport.PayloadListener(prefs.socket_listen_address)
+    try:
+        listener.start()
+    except (OSError, ValueError) as e:
+        print(f"套接字监听启动失败 ({prefs.socket_listen_address}): {e}")
+        return
+    _socket_listener = listener
+    print(f"套接字监听已启动: {prefs.socket_listen_address}")
+
+
+def stop_socket_listener():
+    """停止套接字监听"""
+    global _socket_listener
+    if _socket_listener is not None:
+        _socket_listener.stop()
+        _socket_listener = None
 
 
-    print(f"层级结构已保存到: {txt_path}")
+def update_socket_listener(prefs):
+    if prefs.sync_mode == 'SOCKET':
+        start_socket_listener()
+    else:
+        stop_socket_listener()
+
+
+def restart_socket_listener(prefs):
+    stop_socket_listener()
+    update_socket_listener(prefs)
+
+
+# 共享内存模式：网格数组直接写入命名共享内存，粘贴时映射后用 foreach_set 重建
+def export_meshes_to_shared_memory():
+    """把选中对象的网格数组写入共享内存，返回写入的字节数"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    selected_objects = bpy.context.selected_objects
+    if not selected_objects:
+        print("没有选中的对象")
+        return 0
+
+    with sync_trace.span("pack_meshes", objects=len(selected_objects)):
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        records, packed = mesh_buffers.pack_objects(selected_objects, depsgraph, prefs.export_global_scale)
+    with sync_trace.span("publish_shared") as span:
+        size = mesh_buffers.publish_shared(records, packed)
+        span.add(bytes=size)
+    instances = sum(1 for record in records if "instance_of" in record)
+    print(f"已写入共享内存: {len(records)} 个对象 (其中 {instances} 个关联复制), {size} 字节")
+    return size
+
+
+def import_meshes_from_shared_memory():
+    """从共享内存重建对象，没有数据时返回 None"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    result = mesh_buffers.read_shared()
+    if result is None:
+        return None
+
+    records, packed, segments = result
+    collection = bpy.context.view_layer.active_layer_collection.collection
+    try:
+        with sync_trace.span("build_meshes", objects=len(records)):
+            new_objects = mesh_buffers.unpack_objects(records, packed, collection, prefs.import_global_scale)
+    finally:
+        # 数组引用共享内存，必须先释放才能关闭映射
+        packed = None
+        mesh_buffers.release_shared(segments)
+
+    import_session.record(new_objects)
+    select_new_objects(new_objects)
+    print(f"已从共享内存导入 {len(new_objects)} 个对象")
+    return new_objects
+
+
+def select_new_objects(new_objects):
+    """只选中新建的对象，并把第一个设为活动对象"""
+    # 不使用 context.selected_objects，后台粘贴完成时在定时器中调用也能工作
+    view_layer = bpy.context.view_layer
+    for obj in view_layer.objects:
+        if obj.select_get(view_layer=view_layer):
+            obj.select_set(False, view_layer=view_layer)
+    for obj in new_objects:
+        obj.select_set(True, view_layer=view_layer)
+    if new_objects:
+        view_layer.objects.active = new_objects[0]
+
+
+# 二进制网格模式：原始数组写入 .stm 容器，经由 cache 目录和清单发布
+def export_meshes_to_binary_cache():
+    """把选中对象的网格数组写入 .stm 文件并发布，返回文件大小"""
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    cache_dir = os.path.join(documents_dir, "cache")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    selected_objects = bpy.context.selected_objects
+    if not selected_objects:
+        print("没有选中的对象")
+        return 0
+
+    seq = cache_manifest.reserve_sequence(cache_dir)
+    stm_filepath = cache_manifest.staging_path(cache_dir, f"export_{seq}.stm")
+
+    with sync_trace.span("pack_meshes", objects=len(selected_objects)):
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        records, packed = mesh_buffers.pack_objects(selected_objects, depsgraph, prefs.export_global_scale)
+    with sync_trace.span("write_container") as span:
+        size = mesh_buffers.write_container(stm_filepath, records, packed)
+        span.add(bytes=size)
+
+    stm_filepath = publish_cache_payload(cache_dir, stm_filepath, "stm", seq, prefs.compression_binary)
+    instances = sum(1 for record in records if "instance_of" in record)
+    print(f"网格容器已导出到: {stm_filepath} ({len(records)} 个对象, 其中 {instances} 个关联复制, {size} 字节)")
+    return size
+
+
+def import_latest_binary():
+    """导入最新的 .stm 文件，没有数据时返回 None"""
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    cache_dir = os.path.join(documents_dir, "cache")
+    if not os.path.exists(cache_dir):
+        print(f"缓存目录不存在: {cache_dir}")
+        return None
+
+    latest_stm = get_latest_payload_file(cache_dir, "stm")
+    if latest_stm is None:
+        return None
+
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    import_path = open_cache_payload(latest_stm)
+    try:
+        with sync_trace.span("read_container", bytes=os.path.getsize(import_path)):
+            records, packed = mesh_buffers.read_container(import_path)
+    finally:
+        close_cache_payload(latest_stm, import_path)
+    collection = bpy.context.view_layer.active_layer_collection.collection
+    with sync_trace.span("build_meshes", objects=len(records)):
+        new_objects = mesh_buffers.unpack_objects(records, packed, collection, prefs.import_global_scale)
+    import_session.record(new_objects)
+    select_new_objects(new_objects)
+    print(f"已导入网格容器: {latest_stm} ({len(new_objects)} 个对象)")
+
+    try:
+        os.remove(str(latest_stm))
+    except Exception as e:
+        print(f"删除文件失败: {e}")
+
+    mark_payload_consumed(cache_dir, "stm", latest_stm)
+    return new_objects
+
+
+# 后台复制：快照写入临时目录，交给 blender -b 子进程导出，定时器检查完成情况
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sync_worker.py")
+
+_background_jobs = []
+
+
+def _idprop_to_python(value):
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    return value
+
+
+def start_background_copy():
+    """把选中对象写入快照并启动后台导出进程，返回是否已启动"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    selected_objects = bpy.context.selected_objects
+    if not selected_objects:
+        print("没有选中的对象")
+        return False
+
+    job_dir = tempfile.mkdtemp(prefix="synctools_job_")
+    snapshot_path = os.path.join(job_dir, "snapshot.blend")
+    # 只写入选中对象及其依赖的数据块，贴图路径改为绝对路径
+    bpy.data.libraries.write(snapshot_path, set(selected_objects), path_remap='ABSOLUTE')
+
+    active_object = bpy.context.view_layer.objects.active
+    launch_background_job(job_dir, {
+        "action": "copy",
+        "mode": prefs.sync_mode,
+        "snapshot": snapshot_path,
+        "objects": [obj.name for obj in selected_objects],
+        "active": active_object.name if active_object else None,
+    }, f"正在后台复制 {len(selected_objects)} 个对象" if prefs.interface_language == 'zh_HANS'
+        else f"Copying {len(selected_objects)} objects in background")
+    return True
+
+
+# 分片复制：每个对象的基础开销折算成的顶点数，避免大量小对象全部分到同一片
+SHARD_OBJECT_COST = 100
+# 选中对象少于该数量时不分片
+SHARD_MIN_OBJECTS = 64
+
+
+def plan_shards(objects, shard_count):
+    """按顶点数把对象分成负载均衡的若干组，返回对象列表的列表
+
+    父子层级和骨骼绑定相关的对象始终分在同一组，每个分片导出完整的子树。
+    """
+    roots = {obj: obj for obj in objects}
+
+    def find(obj):
+        while roots[obj] is not obj:
+            roots[obj] = roots[roots[obj]]
+            obj = roots[obj]
+        return obj
+
+    for obj in objects:
+        linked = [obj.parent] + [modifier.object for modifier in obj.modifiers if modifier.type == 'ARMATURE']
+        for other in linked:
+            if other in roots:
+                roots[find(obj)] = find(other)
+
+    clusters = {}
+    for obj in objects:
+        clusters.setdefault(find(obj), []).append(obj)
+
+    def weight(cluster):
+        return sum(SHARD_OBJECT_COST + (len(obj.data.vertices) if obj.type == 'MESH' else 0) for obj in cluster)
+
+    # 最重的组优先放进当前最轻的分片
+    shards = [(0, index, []) for index in range(min(shard_count, len(clusters)))]
+    for cluster in sorted(clusters.values(), key=weight, reverse=True):
+        load, index, members = heapq.heappop(shards)
+        members.extend(cluster)
+        heapq.heappush(shards, (load + weight(cluster), index, members))
+    return [members for _load, _index, members in sorted(shards, key=lambda shard: shard[1])]
+
+
+def start_sharded_copy():
+    """把选中对象分片，每个分片由一个后台进程导出；选中对象太少不值得分片时返回 False"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    # C4D 端不读取清单中的分片列表，只会导入其中一个分片
+    if prefs.export_axis_preset == 'C4D':
+        return False
+    selected_objects = list(bpy.context.selected_objects)
+    if len(selected_objects) < SHARD_MIN_OBJECTS:
+        return False
+    shard_count = prefs.shard_count or max(1, (os.cpu_count() or 2) - 1)
+    shards = plan_shards(selected_objects, shard_count)
+    if len(shards) < 2:
+        return False
+
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    cache_dir = os.path.join(documents_dir, "cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    seq = cache_manifest.reserve_sequence(cache_dir)
+
+    group_dir = tempfile.mkdtemp(prefix="synctools_job_")
+    snapshot_path = os.path.join(group_dir, "snapshot.blend")
+    bpy.data.libraries.write(snapshot_path, set(selected_objects), path_remap='ABSOLUTE')
+
+    # 层级文件覆盖全部选中对象，在界面进程中写入暂存目录，全部分片完成后与清单一起发布
+    hierarchy = write_hierarchy_files(cache_dir, selected_objects, seq)
+
+    group = {
+        "seq": seq,
+        "cache_dir": cache_dir,
+        "dir": group_dir,
+        "parts": [None] * len(shards),
+        "pending": len(shards),
+        "objects": len(selected_objects),
+        "hierarchy": hierarchy,
+        "started": time.perf_counter(),
+    }
+    is_chinese = prefs.interface_language == 'zh_HANS'
+    for index, shard in enumerate(shards):
+        job = {
+            "action": "copy_shard",
+            "mode": prefs.sync_mode,
+            "snapshot": snapshot_path,
+            "objects": [obj.name for obj in shard],
+            "active": None,
+            "cache_dir": cache_dir,
+            # 第一个分片沿用普通数据的文件名，清单记录指向它
+            "filename": f"export_{seq}.fbx" if index == 0 else f"export_{seq}_{index}.fbx",
+            "codec": prefs.compression_standard,
+        }
+        launch_background_job(tempfile.mkdtemp(dir=group_dir), job,
+            f"正在分片复制 ({len(shards)} 个进程)" if is_chinese else f"Copying in {len(shards)} shards")
+        job["group"] = group
+        job["index"] = index
+    print(f"分片复制: {len(selected_objects)} 个对象分为 {len(shards)} 片 "
+          f"({', '.join(str(len(shard)) for shard in shards)})")
+    return True
+
+
+def finish_copy_shard(job, result):
+    """记录一个分片的结果；全部分片完成后登记为一条多分片数据，返回状态栏文字（未完成时返回 None）"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    is_chinese = prefs.interface_language == 'zh_HANS'
+    group = job["group"]
+    group["parts"][job["index"]] = result
+    group["pending"] -= 1
+    if group["pending"]:
+        return None
+
+    cache_dir = group["cache_dir"]
+    shutil.rmtree(group["dir"], ignore_errors=True)
+    if any(part is None for part in group["parts"]):
+        # 有分片失败时丢弃其余分片，不发布不完整的数据
+        for part in group["parts"]:
+            if part is not None:
+                try:
+                    os.remove(os.path.join(cache_dir, part["path"]))
+                except OSError:
+                    pass
+        discard_hierarchy_files(group["hierarchy"])
+        return "分片复制失败，详见控制台" if is_chinese else "Sharded copy failed, see console"
+
+    parts = [
+        {
+            "path": part["path"],
+            "size": os.path.getsize(os.path.join(cache_dir, part["path"])),
+            "checksum": cache_manifest.file_checksum(os.path.join(cache_dir, part["path"])),
+        }
+        for part in group["parts"]
+    ]
+    extra = {"parts": parts}
+    codec = group["parts"][0]["codec"]
+    if codec != 'NONE':
+        extra.update(codec=codec, raw_size=sum(part["raw_size"] for part in group["parts"]))
+    commit_hierarchy_files(cache_dir, group["hierarchy"])
+    cache_manifest.publish_payload(cache_dir, os.path.join(cache_dir, parts[0]["path"]), "fbx", group["seq"], **extra)
+    _published_seqs.add(group["seq"])
+    schedule_cache_cleanup()
+
+    elapsed = time.perf_counter() - group["started"]
+    size_mb = sum(part["size"] for part in parts) / 1024 / 1024
+    return (f"分片复制完成: {group['objects']} 个对象, {len(parts)} 片, {size_mb:.2f} MB，耗时 {elapsed:.1f} 秒" if is_chinese
+            else f"Sharded copy finished: {group['objects']} objects, {len(parts)} shards, {size_mb:.2f} MB in {elapsed:.1f}s")
+
+
+def launch_background_job(job_dir, job, status):
+    """写入任务文件并启动 blender -b 子进程；status 为进行中时状态栏显示的文字"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    scene = bpy.context.scene
+    job.update({
+        "package": __name__,
+        # 原始 ID 属性，进程中直接写回，只包含用户修改过的偏好
+        "preferences": {key: _idprop_to_python(prefs[key]) for key in prefs.keys()},
+        "scene": {
+            "frame_start": scene.frame_start,
+            "frame_end": scene.frame_end,
+            "frame_preview_start": scene.frame_preview_start,
+            "frame_preview_end": scene.frame_preview_end,
+            "use_preview_range": scene.use_preview_range,
+            "fps": scene.render.fps,
+            "fps_base": scene.render.fps_base,
+            "unit_system": scene.unit_settings.system,
+            "scale_length": scene.unit_settings.scale_length,
+        },
+    })
+    job_path = os.path.join(job_dir, "job.json")
+    with open(job_path, 'w', encoding='utf-8') as f:
+        json.dump(job, f, ensure_ascii=False)
+
+    log_file = open(os.path.join(job_dir, "worker.log"), 'w', encoding='utf-8')
+    process = subprocess.Popen(
+        [bpy.app.binary_path, "-b", "--factory-startup", "--python-exit-code", "1",
+         "--python", WORKER_SCRIPT, "--", job_path],
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+    job.update({
+        "process": process,
+        "dir": job_dir,
+        "log": log_file,
+        "started": time.perf_counter(),
+        "status": status,
+    })
+    _background_jobs.append(job)
+    print(f"{status} (进程 {process.pid})")
+
+    if not bpy.app.timers.is_registered(background_job_timer):
+        bpy.app.timers.register(background_job_timer, first_interval=0.5, persistent=True)
+    set_status_text(status + "...")
+
+
+# 后台粘贴：子进程导入数据并保存为 .blend，界面进程只需要追加其中的集合
+TRANSCODE_COLLECTION = "SyncTools Paste"
+
+
+def start_background_paste():
+    """启动后台转换，返回 False 表示没有可粘贴的数据"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    kind = SYNC_MODE_PAYLOAD_KIND[prefs.sync_mode]
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    cache_dir = os.path.join(documents_dir, "cache")
+    latest = get_latest_payload_file(cache_dir, kind) if os.path.exists(cache_dir) else None
+    if latest is None:
+        return False
+
+    # 同一个数据已经在转换中（预转换或自动粘贴再次触发），完成后直接追加，不重复启动
+    for job in _background_jobs:
+        if job.get("payload") == str(latest):
+            job["append"] = True
+            return True
+
+    # 增量数据只包含少量对象并且需要替换场景中已有的对象，直接在前台应用
+    entry = cache_manifest.get_latest_payload(cache_dir, kind)
+    if entry is not None and entry["path"] == latest.name and "delta" in entry:
+        import_latest_fbx()
+        if read_importx_flag():
+            run_octane_importx()
+        return True
+
+    job_dir = tempfile.mkdtemp(prefix="synctools_job_")
+    launch_background_job(job_dir, {
+        "action": "transcode",
+        "kind": kind,
+        "cache_dir": cache_dir,
+        "payload": str(latest),
+        "output": os.path.join(job_dir, "paste.blend"),
+        "collection": TRANSCODE_COLLECTION,
+        "append": True,
+    }, f"正在后台转换 {latest.name}" if prefs.interface_language == 'zh_HANS'
+        else f"Converting {latest.name} in background")
+    return True
+
+
+def append_transcoded_payload(job, result):
+    """追加子进程准备好的集合，把其中的对象放进当前活动集合，返回新对象列表"""
+    new_objects = append_blend_collection(job["output"], result["collection"])
+    consume_transcoded_payload(job["cache_dir"], job["kind"], job["payload"])
+    return new_objects
+
+
+def append_blend_collection(blend_path, collection_name):
+    """从 .blend 追加集合，把其中的对象移到当前活动集合并选中"""
+    with bpy.data.libraries.load(blend_path, link=False) as (data_from, data_to):
+        data_to.collections = [collection_name]
+    collection = data_to.collections[0]
+
+    target = bpy.context.view_layer.active_layer_collection.collection
+    new_objects = list(collection.objects)
+    for obj in new_objects:
+        target.objects.link(obj)
+    bpy.data.collections.remove(collection)
+
+    import_session.record(new_objects)
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    if prefs.import_materials and prefs.import_texture_store:
+        dedupe_pasted_images(new_objects)
+    if prefs.import_materials and prefs.import_reuse_materials:
+        reuse_identical_materials(new_objects)
+    object_fingerprint.tag_pasted_objects(new_objects)
+    select_new_objects(new_objects)
+    return new_objects
+
+
+def consume_transcoded_payload(cache_dir, kind, payload):
+    """删除已追加的数据文件并记录消费，然后执行与普通粘贴相同的后续步骤"""
+    for part in payload_parts(cache_dir, kind, payload):
+        try:
+            os.remove(part)
+        except OSError as e:
+            print(f"删除文件失败: {e}")
+    mark_payload_consumed(cache_dir, kind, payload)
+
+    if kind == "fbx" and read_importx_flag():
+        call_in_view3d(run_octane_importx)
+    call_in_view3d(lambda: bpy.ops.ed.undo_push(message="SyncTools Paste"))
+
+
+# 预转换：新数据到达后立即在后台转换为 .blend，粘贴时只需要追加
+# 结果以 数据校验值 + 导入设置摘要 为键保存，导入设置变化后旧结果自动失效
+PREFETCH_DIR = os.path.join(tempfile.gettempdir(), "synctools_prefetch")
+
+_prefetch_watcher = None
+
+
+def import_settings_hash(prefs):
+    """影响导入结果的偏好设置和场景设置的摘要"""
+    scene = bpy.context.scene
+    settings = {key: _idprop_to_python(prefs[key]) for key in prefs.keys() if key.startswith("import_")}
+    settings["_fps"] = (scene.render.fps, scene.render.fps_base)
+    settings["_unit"] = (scene.unit_settings.system, scene.unit_settings.scale_length)
+    return hashlib.blake2b(json.dumps(settings, sort_keys=True).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def prefetch_paths(entry, prefs):
+    """返回 (预转换 .blend 路径, 完成记录路径)"""
+    key = f"{entry['checksum']}_{import_settings_hash(prefs)}"
+    return os.path.join(PREFETCH_DIR, key + ".blend"), os.path.join(PREFETCH_DIR, key + ".json")
+
+
+def start_prefetch(cache_dir, entry):
+    """为新到达的数据启动后台转换"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    payload = os.path.join(cache_dir, entry["path"])
+    blend_path, record_path = prefetch_paths(entry, prefs)
+    if os.path.exists(record_path) or any(job.get("payload") == payload for job in _background_jobs):
+        return
+
+    # 只保留仍然是最新数据的预转换结果
+    os.makedirs(PREFETCH_DIR, exist_ok=True)
+    latest_checksums = {latest["checksum"] for latest in cache_manifest.read_head(cache_dir)["latest"].values()}
+    for filename in os.listdir(PREFETCH_DIR):
+        if filename.split("_", 1)[0] not in latest_checksums:
+            try:
+                os.remove(os.path.join(PREFETCH_DIR, filename))
+            except OSError:
+                pass
+
+    launch_background_job(tempfile.mkdtemp(prefix="synctools_job_"), {
+        "action": "transcode",
+        "kind": entry["kind"],
+        "cache_dir": cache_dir,
+        "payload": payload,
+        "output": blend_path,
+        "record": record_path,
+        "collection": TRANSCODE_COLLECTION,
+        "append": False,
+    }, f"正在预转换 {entry['path']}" if prefs.interface_language == 'zh_HANS'
+        else f"Preparing {entry['path']}")
+
+
+def paste_prefetched(cache_dir, kind):
+    """最新数据已经预转换时直接追加，返回新对象列表；没有可用结果时返回 None"""
+    entry = cache_manifest.get_latest_payload(cache_dir, kind)
+    if entry is None or "delta" in entry:
+        return None
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    blend_path, record_path = prefetch_paths(entry, prefs)
+    try:
+        with open(record_path, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    new_objects = append_blend_collection(blend_path, record["collection"])
+    consume_transcoded_payload(cache_dir, kind, os.path.join(cache_dir, entry["path"]))
+    for path in (blend_path, record_path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    print(f"已追加预转换的数据: {entry['path']} ({len(new_objects)} 个对象)")
+    return new_objects
+
+
+def has_background_job(cache_dir, kind):
+    """最新数据是否正在后台转换中（粘贴时接管该任务，不再从头导入）"""
+    latest = get_latest_payload_file(cache_dir, kind)
+    return latest is not None and any(job.get("payload") == str(latest) for job in _background_jobs)
+
+
+def prefetch_timer():
+    """发现新数据后启动预转换"""
+    if _prefetch_watcher is None:
+        return None
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    kind = SYNC_MODE_PAYLOAD_KIND.get(prefs.sync_mode)
+    for entry in _prefetch_watcher.poll():
+        # 没有清单记录的文件（seq 为 None）没有校验和，不做预转换
+        if entry["kind"] == kind and kind in {"fbx", "abc"} and "delta" not in entry \
+                and entry["seq"] is not None and entry["seq"] not in _published_seqs:
+            start_prefetch(_prefetch_watcher.cache_dir, entry)
+    return 0.25
+
+
+def start_prefetch_watcher():
+    global _prefetch_watcher
+    if _prefetch_watcher is not None or bpy.app.background:
+        return
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    _prefetch_watcher = payload_watcher.PayloadWatcher(os.path.join(documents_dir, "cache"), debounce=0.0)
+    _prefetch_watcher.start()
+    bpy.app.timers.register(prefetch_timer, first_interval=0.25, persistent=True)
+    print(f"预转换已启动 ({_prefetch_watcher.backend})")
+
+
+def stop_prefetch_watcher():
+    global _prefetch_watcher
+    if bpy.app.timers.is_registered(prefetch_timer):
+        bpy.app.timers.unregister(prefetch_timer)
+    if _prefetch_watcher is not None:
+        _prefetch_watcher.stop()
+        _prefetch_watcher = None
+
+
+def update_sync_trace(prefs):
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    sync_trace.set_enabled(prefs.trace_sync, os.path.join(documents_dir, "cache"))
+
+
+def update_prefetch(prefs):
+    if prefs.prefetch_paste:
+        start_prefetch_watcher()
+    else:
+        stop_prefetch_watcher()
+
+
+def finish_background_job(job):
+    """读取子进程的结果并清理临时目录，返回状态栏文字"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    is_chinese = prefs.interface_language == 'zh_HANS'
+    job["log"].close()
+    elapsed = time.perf_counter() - job["started"]
+
+    result = None
+    try:
+        with open(os.path.join(job["dir"], "result.json"), 'r', encoding='utf-8') as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if job["process"].returncode == 0 and result is not None and job["action"] == "transcode" and not job["append"]:
+        # 预转换完成，等待粘贴
+        with open(job["record"], 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        text = (f"已预转换 {result['objects']} 个对象，可以粘贴" if is_chinese
+                else f"Prepared {result['objects']} objects, ready to paste")
+    elif job["action"] == "copy_shard":
+        if job["process"].returncode != 0 or result is None:
+            with open(os.path.join(job["dir"], "worker.log"), 'r', encoding='utf-8', errors='replace') as f:
+                print(f"分片 {job['index']} 导出失败:\n" + "".join(f.readlines()[-20:]))
+            result = None
+        text = finish_copy_shard(job, result)
+    elif job["process"].returncode == 0 and result is not None and job["action"] == "transcode":
+        new_objects = append_transcoded_payload(job, result)
+        text = (f"已粘贴 {len(new_objects)} 个对象，耗时 {elapsed:.1f} 秒" if is_chinese
+                else f"Pasted {len(new_objects)} objects in {elapsed:.1f}s")
+    elif job["process"].returncode == 0 and result is not None:
+        # 子进程发布的数据不自动粘贴回本进程
+        _published_seqs.update(result["seqs"])
+        schedule_cache_cleanup()
+        text = (f"后台复制完成: {result['objects']} 个对象，耗时 {elapsed:.1f} 秒" if is_chinese
+                else f"Background copy finished: {result['objects']} objects in {elapsed:.1f}s")
+    else:
+        with open(os.path.join(job["dir"], "worker.log"), 'r', encoding='utf-8', errors='replace') as f:
+            print(f"后台任务失败 (返回值 {job['process'].returncode}):\n" + "".join(f.readlines()[-20:]))
+        text = "后台任务失败，详见控制台" if is_chinese else "Background job failed, see console"
+
+    shutil.rmtree(job["dir"], ignore_errors=True)
+    if text is not None:
+        print(text)
+    return text
+
+
+def background_job_timer():
+    """检查后台进程，进行中时在状态栏显示已用时间，完成后显示结果"""
+    for job in list(_background_jobs):
+        if job["process"].poll() is None:
+            continue
+        _background_jobs.remove(job)
+        # 定时器中没有窗口上下文：追加对象、选择和状态栏都需要在窗口中执行
+        text = call_in_view3d(finish_background_job, job)
+        if text is not None:
+            call_in_view3d(set_status_text, text, clear_after=5.0)
+
+    if not _background_jobs:
+        return None
+    job = _background_jobs[0]
+    call_in_view3d(set_status_text, f"{job['status']}... {time.perf_counter() - job['started']:.0f}s")
+    return 0.5
+
+
+def set_status_text(text, clear_after=None):
+    """在状态栏显示文字；clear_after 秒后清除"""
+    workspace = bpy.context.workspace
+    if workspace is None:
+        return
+    workspace.status_text_set(text)
+    if clear_after is not None:
+        bpy.app.timers.register(lambda: call_in_view3d(set_status_text, None), first_interval=clear_after)
 
 
 # 定义操作类
@@ -1468,59 +3036,112 @@ class OBJECT_OT_import_obj(bpy.types.Operator):
 
     def execute(self, context):
         prefs = context.preferences.addons[__name__].preferences
+        with sync_trace.trace("paste", mode=prefs.sync_mode):
+            return self.paste(context, prefs)
+
+    def paste(self, context, prefs):
+        global _last_transfer, _last_material_reuse, _last_image_reuse
+        _last_transfer = None
+        _last_material_reuse = 0
+        _last_image_reuse = 0
+        start = time.perf_counter()
+        import_session.begin_paste()
         
         if prefs.sync_mode == 'STANDARD':
             # Standard FBX mode
-            # 获取Preference.txt文件路径
-            documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
-            preference_file = os.path.join(documents_dir, "cache", "Preference.txt")
-
-            # 检查 Preference.txt 文件是否存在，如果不存在则创建它
-            if not os.path.exists(preference_file):
-                # 创建包含默认内容的 Preference.txt 文件
-                os.makedirs(os.path.dirname(preference_file), exist_ok=True)  # 确保目录存在
-                with open(preference_file, 'w', encoding='utf-8') as file:
-                    file.write("Preference Container Data:\n")
-                    file.write("SYNC_PREFERENCE_CHECK: True\n")
-                    file.write("SYNC_PREFERENCE_NUMBER: 10\n")
-                    file.write("SYNC_PREFERENCE_CHECK2: True\n")
-                print(f"已创建文件: {preference_file}，并写入默认内容。")
-
-            # 检查文件是否存在并读取SYNC_PREFERENCE_CHECK2的值
-            execute_importx = False
-            if os.path.exists(preference_file):
-                with open(preference_file, 'r') as file:
-                    for line in file:
-                        if line.startswith("SYNC_PREFERENCE_CHECK2"):
-                            # 设置标志，如果值为True，则标志为True
-                            execute_importx = "True" in line
-                            break
-            else:
-                print(f"未找到文件: {preference_file}")
+            with sync_trace.span("preference_flag"):
+                execute_importx = read_importx_flag()
 
             # 导入项目信息
+            documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
             cache_dir = os.path.join(documents_dir, "cache")
             json_path = os.path.join(cache_dir, "project_info.json")
             if os.path.exists(json_path):
-                import_project_info_with_settings(json_path)
+                with sync_trace.span("project_info"):
+                    import_project_info_with_settings(json_path)
                 print("已导入项目信息")
 
             # 执行import_latest_fbx()
-            import_latest_fbx()
+            if paste_prefetched(cache_dir, "fbx") is not None:
+                # 预转换的结果已经追加，Octane 材质导入也已执行
+                execute_importx = False
+            elif prefs.background_paste or has_background_job(cache_dir, "fbx"):
+                if not start_background_paste():
+                    return {'CANCELLED'}
+                # Octane 材质导入在后台粘贴完成后执行
+                execute_importx = False
+            else:
+                import_latest_fbx()
 
             # 如果SYNC_PREFERENCE_CHECK2为True，则执行importx
             if execute_importx:
-                try:
-                    bpy.ops.import_octane_material.importx()
-                    print("SYNC_PREFERENCE_CHECK2为True，执行importx操作")
-                except AttributeError:
-                    print("未找到 'import_octane_material.importx' 操作。请确保相关插件已安装。")
+                with sync_trace.span("octane_importx"):
+                    run_octane_importx()
+
+        elif prefs.sync_mode == 'SOCKET':
+            # 本地套接字模式
+            execute_importx = read_importx_flag()
+            if not import_fbx_from_socket():
+                self.report({'WARNING'},
+                    "没有收到新的数据" if prefs.interface_language == 'zh_HANS' else "No payload received yet")
+                return {'CANCELLED'}
+            if execute_importx:
+                run_octane_importx()
         
+        elif prefs.sync_mode == 'SHARED_MEMORY':
+            # 共享内存模式
+            new_objects = import_meshes_from_shared_memory()
+            if new_objects is None:
+                self.report({'WARNING'},
+                    "共享内存中没有数据" if prefs.interface_language == 'zh_HANS' else "No shared memory payload found")
+                return {'CANCELLED'}
+            self.report({'INFO'},
+                f"已粘贴 {len(new_objects)} 个对象" if prefs.interface_language == 'zh_HANS' else f"Pasted {len(new_objects)} objects")
+
+        elif prefs.sync_mode == 'BINARY':
+            # 二进制网格模式
+            new_objects = import_latest_binary()
+            if new_objects is None:
+                self.report({'WARNING'},
+                    "缓存中没有网格容器" if prefs.interface_language == 'zh_HANS' else "No binary mesh payload found")
+                return {'CANCELLED'}
+            self.report({'INFO'},
+                f"已粘贴 {len(new_objects)} 个对象" if prefs.interface_language == 'zh_HANS' else f"Pasted {len(new_objects)} objects")
+
         elif prefs.sync_mode == 'BATA':
             # Bata ABC mode
-            import_abc_by_counter()
+            documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+            cache_dir = os.path.join(documents_dir, "cache")
+            if paste_prefetched(cache_dir, "abc") is not None:
+                pass
+            elif prefs.background_paste or has_background_job(cache_dir, "abc"):
+                if not start_background_paste():
+                    return {'CANCELLED'}
+            else:
+                import_abc_by_counter()
             print("执行ABC导入")
 
+        report_transfer(self, prefs, time.perf_counter() - start)
+        return {'FINISHED'}
+
+
+class OBJECT_OT_remove_last_paste(bpy.types.Operator):
+    """Remove the objects and data created by the last Paste"""
+    bl_idname = "idm.remove_last_paste"
+    bl_label = "Remove Last Paste"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        is_chinese = context.preferences.addons[__name__].preferences.interface_language == 'zh_HANS'
+        ids = import_session.resolve_last_paste()
+        objects = [id_data for id_data in ids if isinstance(id_data, bpy.types.Object)]
+        if not objects:
+            self.report({'WARNING'}, "没有可以移除的粘贴" if is_chinese else "Nothing to remove")
+            return {'CANCELLED'}
+        # 网格、材质等只在失去全部用户时删除，用户在粘贴后另外使用的数据会保留
+        removed = remove_datablocks(objects, scope=[id_data for id_data in ids if not isinstance(id_data, bpy.types.Object)])
+        import_session.begin_paste()
+        self.report({'INFO'}, f"已移除 {removed} 个数据块" if is_chinese else f"Removed {removed} datablocks")
         return {'FINISHED'}
 
 
@@ -1532,23 +3153,71 @@ class OBJECT_OT_export_obj(bpy.types.Operator):
 
     def execute(self, context):
         prefs = context.preferences.addons[__name__].preferences
+        with sync_trace.trace("copy", mode=prefs.sync_mode):
+            return self.copy(context, prefs)
+
+    def copy(self, context, prefs):
+        global _last_transfer, _last_key_reduction, _last_export_warning
+        _last_transfer = None
+        _last_key_reduction = None
+        _last_export_warning = None
+        start = time.perf_counter()
         
         if prefs.sync_mode == 'STANDARD':
             # Standard FBX mode
             # 导出项目信息
             documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
             cache_dir = os.path.join(documents_dir, "cache")
-            export_project_info_with_settings(cache_dir)
+            with sync_trace.span("project_info"):
+                export_project_info_with_settings(cache_dir)
             print("已导出项目信息")
 
             # 执行FBX导出
-            export_fbx_to_cache()
+            if prefs.sharded_copy and not prefs.incremental_copy and start_sharded_copy():
+                self.report({'INFO'},
+                    "已开始分片复制" if prefs.interface_language == 'zh_HANS' else "Sharded copy started")
+            elif prefs.background_copy:
+                if start_background_copy():
+                    self.report({'INFO'},
+                        "已开始后台复制" if prefs.interface_language == 'zh_HANS' else "Copy started in background")
+            elif export_fbx_to_cache() == 0 and prefs.incremental_copy:
+                self.report({'INFO'},
+                    "没有改动的对象" if prefs.interface_language == 'zh_HANS' else "No changed objects to copy")
+
+        elif prefs.sync_mode == 'SOCKET':
+            # 本地套接字模式
+            try:
+                export_fbx_to_socket()
+            except (OSError, ValueError) as e:
+                self.report({'ERROR'},
+                    f"发送失败: {e}" if prefs.interface_language == 'zh_HANS' else f"Send failed: {e}")
+                return {'CANCELLED'}
         
+        elif prefs.sync_mode == 'SHARED_MEMORY':
+            # 共享内存模式
+            size = export_meshes_to_shared_memory()
+            self.report({'INFO'},
+                f"已写入共享内存 {size / 1024 / 1024:.2f} MB" if prefs.interface_language == 'zh_HANS' else f"Wrote {size / 1024 / 1024:.2f} MB to shared memory")
+
+        elif prefs.sync_mode == 'BINARY':
+            # 二进制网格模式
+            export_meshes_to_binary_cache()
+
         elif prefs.sync_mode == 'BATA':
             # Bata ABC mode
-            export_abc_to_cache()
+            if prefs.background_copy:
+                if start_background_copy():
+                    self.report({'INFO'},
+                        "已开始后台复制" if prefs.interface_language == 'zh_HANS' else "Copy started in background")
+            else:
+                export_abc_to_cache()
             print("执行ABC导出")
-            
+
+        report_transfer(self, prefs, time.perf_counter() - start)
+        if _last_export_warning is not None:
+            self.report({'WARNING'},
+                f"无法直接调用 FBX 导出器，导出旋转未应用: {_last_export_warning}" if prefs.interface_language == 'zh_HANS'
+                else f"FBX exporter could not be called directly, export rotation not applied: {_last_export_warning}")
         return {'FINISHED'}
 
 
@@ -1574,18 +3243,30 @@ class OBJECT_PT_fbx_import_export_panel(bpy.types.Panel):
         # Show mode description
         if prefs.sync_mode == 'STANDARD':
             box.label(text="FBX模式：完整功能，支持项目信息同步" if is_chinese else "FBX Mode: Full features, project info sync", icon='INFO')
+        elif prefs.sync_mode == 'SOCKET':
+            box.label(text="套接字模式：本机直接传输，不写缓存目录" if is_chinese else "Socket Mode: Direct local transfer, no cache folder", icon='LINKED')
+        elif prefs.sync_mode == 'SHARED_MEMORY':
+            box.label(text="共享内存模式：无中间文件，仅几何" if is_chinese else "Shared Memory Mode: No intermediate file, geometry only", icon='MEMORY')
+        elif prefs.sync_mode == 'BINARY':
+            box.label(text="二进制网格模式：无格式转换，仅几何" if is_chinese else "Binary Mesh Mode: No format conversion, geometry only", icon='MESH_DATA')
         else:
             box.label(text="ABC模式：快速几何传输，实验性功能" if is_chinese else "ABC Mode: Fast geometry transfer, experimental", icon='EXPERIMENTAL')
         
         # Show mode-specific options
         if prefs.sync_mode == 'BATA':
             box.prop(prefs, "randomize_names_before_export")
+        elif prefs.sync_mode == 'STANDARD':
+            box.prop(prefs, "incremental_copy")
         
         layout.separator()
         
         # Adapt label based on mode
-        if prefs.sync_mode == 'STANDARD':
+        if prefs.sync_mode in {'STANDARD', 'SOCKET'}:
             layout.label(text="复制/粘贴网格 (FBX):" if is_chinese else "Copy / paste meshes (FBX):")
+        elif prefs.sync_mode == 'SHARED_MEMORY':
+            layout.label(text="复制/粘贴网格 (共享内存):" if is_chinese else "Copy / paste meshes (Shared Memory):")
+        elif prefs.sync_mode == 'BINARY':
+            layout.label(text="复制/粘贴网格 (STM):" if is_chinese else "Copy / paste meshes (STM):")
         else:
             layout.label(text="复制/粘贴网格 (ABC):" if is_chinese else "Copy / paste meshes (ABC):")
             
@@ -1593,6 +3274,22 @@ class OBJECT_PT_fbx_import_export_panel(bpy.types.Panel):
         row.operator("idm.export_obj", text=" 复制 " if is_chinese else " Copy ")
         row.operator("idm.import_obj", text=" 粘贴 " if is_chinese else " Paste ")
 
+        layout.prop(prefs, "auto_paste")
+
+        record = sync_trace.last_trace
+        if prefs.trace_sync and record:
+            box = layout.box()
+            title = "上次复制耗时" if is_chinese else "Last Copy"
+            if record["operation"] == "paste":
+                title = "上次粘贴耗时" if is_chinese else "Last Paste"
+            box.label(text=f"{title}: {record['duration'] * 1000:.0f} ms", icon='TIME')
+            col = box.column(align=True)
+            for span in record["spans"]:
+                text = f"{'    ' * span['depth']}{span['name']}: {span['duration'] * 1000:.1f} ms"
+                if span.get("bytes"):
+                    text += f"  ({span['bytes'] / 1024 / 1024:.2f} MB)"
+                col.label(text=text)
+
 
 # 定义快捷键绘制函数
 def draw_keymap(self, context, layout):
@@ -1667,32 +3364,6 @@ def rename_objects_and_data_blocks():
 
     print(f"已完成重命名 {renamed_count} 个对象和数据块")
 
-def get_abc_counter(counter_file):
-    """获取当前的ABC导出计数器值"""
-    if os.path.exists(counter_file):
-        with open(counter_file, 'r') as file:
-            try:
-                return int(file.read().strip())
-            except ValueError:
-                return 1
-    return 1
-
-def increment_abc_counter(counter_file):
-    """递增ABC导出计数器值并返回新的计数器值"""
-    counter = get_abc_counter(counter_file)
-    with open(counter_file, 'w') as file:
-        counter += 1
-        file.write(str(counter))
-    return counter
-
-def delete_oldest_abc(cache_dir):
-    """删除最旧的ABC文件以保持文件数量在限制内"""
-    abc_files = list(Path(cache_dir).glob("*.abc"))
-    if len(abc_files) >= 10:
-        oldest_abc = min(abc_files, key=os.path.getmtime)
-        os.remove(oldest_abc)
-        print(f"删除最旧的ABC文件: {oldest_abc}")
-
 def export_abc_to_cache():
     """导出选中对象为ABC文件到cache文件夹"""
     documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
@@ -1701,12 +3372,8 @@ def export_abc_to_cache():
     if not os.path.exists(cache_dir):
         os.makedirs(cache_dir)
 
-    counter_file = os.path.join(cache_dir, "abc_counter.txt")
-    counter = increment_abc_counter(counter_file)
-    abc_filepath = os.path.join(cache_dir, f"export_{counter}.abc")
-
-    # 在导出前删除最旧的ABC文件
-    delete_oldest_abc(cache_dir)
+    seq = cache_manifest.reserve_sequence(cache_dir)
+    abc_filepath = cache_manifest.staging_path(cache_dir, f"export_{seq}.abc")
 
     prefs = bpy.context.preferences.addons[__name__].preferences
 
@@ -1721,36 +3388,44 @@ def export_abc_to_cache():
         return
 
     # 导出为ABC
-    bpy.ops.wm.alembic_export(
-        filepath=abc_filepath,
-        selected=True,
-        global_scale=prefs.export_global_scale
-    )
+    with sync_trace.span("abc_export", objects=len(selected_objects)) as span:
+        start, end, _step = get_export_frame_window(prefs, bpy.context.scene)
+        bpy.ops.wm.alembic_export(
+            filepath=abc_filepath,
+            selected=True,
+            global_scale=prefs.export_global_scale,
+            start=start,
+            end=end,
+            use_instancing=True,  # 关联复制的对象只写入一份网格
+            as_background_job=False
+        )
+        span.add(bytes=os.path.getsize(abc_filepath))
 
     print(f"ABC文件已导出到: {abc_filepath}")
 
     # 写入层级文件
-    txt_path = os.path.join(cache_dir, "hierarchy.txt")
-    name_dict = {}
-    
-    with open(txt_path, 'w', encoding='utf-8') as file:
-        top_level_selected = [obj for obj in selected_objects if obj.parent is None or obj.parent not in selected_objects]
-        for obj in top_level_selected:
-            write_hierarchy_to_file(obj, file=file, name_dict=name_dict, selected_objects=set(selected_objects))
+    with sync_trace.span("hierarchy", objects=len(selected_objects)):
+        hierarchy = write_hierarchy_files(cache_dir, selected_objects, seq)
 
-    print(f"层级结构已保存到: {txt_path}")
+    publish_cache_payload(cache_dir, abc_filepath, "abc", seq, prefs.compression_bata, hierarchy=hierarchy)
 
 def get_latest_abc_file(cache_dir):
-    """获取缓存目录中最新的ABC文件"""
-    abc_files = list(Path(cache_dir).glob("*.abc"))
-    if not abc_files:
-        return None
+    """获取缓存目录中最新的ABC文件（优先读取清单头部）"""
+    return get_latest_payload_file(cache_dir, "abc")
 
-    latest_abc = max(abc_files, key=os.path.getmtime)
-    return latest_abc
+def import_abc_payload(abc_path):
+    """按用户设置导入 ABC 文件，返回新对象列表"""
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    with sync_trace.span("abc_import", bytes=os.path.getsize(abc_path)), import_session.track() as session:
+        bpy.ops.wm.alembic_import(
+            filepath=str(abc_path),
+            as_background_job=False,
+            scale=prefs.import_global_scale
+        )
+    return session.objects
 
 def import_abc_by_counter():
-    """根据计数器导入最新的ABC文件"""
+    """根据清单导入最新的ABC文件"""
     documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
     cache_dir = os.path.join(documents_dir, "cache")
 
@@ -1764,14 +3439,12 @@ def import_abc_by_counter():
         print("缓存目录中没有找到ABC文件")
         return
 
-    prefs = bpy.context.preferences.addons[__name__].preferences
-
     # 导入ABC文件
-    bpy.ops.wm.alembic_import(
-        filepath=str(latest_abc),
-        as_background_job=False,
-        scale=prefs.import_global_scale
-    )
+    import_path = open_cache_payload(latest_abc)
+    try:
+        import_abc_payload(import_path)
+    finally:
+        close_cache_payload(latest_abc, import_path)
 
     print(f"已导入ABC文件: {latest_abc}")
 
@@ -1781,6 +3454,100 @@ def import_abc_by_counter():
     except Exception as e:
         print(f"删除文件失败: {e}")
 
+    mark_payload_consumed(cache_dir, "abc", latest_abc)
+
+
+# 自动粘贴：各同步模式对应的数据类型
+SYNC_MODE_PAYLOAD_KIND = {
+    'STANDARD': "fbx",
+    'BATA': "abc",
+    'BINARY': "stm",
+}
+
+_payload_watcher = None
+_auto_paste_pending = False
+_published_seqs = set()  # 本进程自己发布的数据，不自动粘贴回来
+
+
+def call_in_view3d(operator, *args, **kwargs):
+    """在 3D 视图上下文中调用操作符或函数（定时器回调没有窗口上下文）"""
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                with bpy.context.temp_override(window=window, area=area):
+                    return operator(*args, **kwargs)
+    return operator(*args, **kwargs)
+
+
+def auto_paste_timer():
+    """定时检查新数据，合并连续发布后调用现有的粘贴流程"""
+    global _auto_paste_pending
+    if _payload_watcher is None:
+        return None
+
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    _payload_watcher.debounce = prefs.auto_paste_debounce
+    kind = SYNC_MODE_PAYLOAD_KIND.get(prefs.sync_mode)
+
+    try:
+        entries = _payload_watcher.poll()
+    except Exception as e:
+        print(f"检查新数据失败: {e}")
+        entries = []
+    # 清单记录和没有清单记录的新数据文件都触发一次粘贴，由 get_latest_payload_file 选出最新的数据
+    for entry in entries:
+        if entry["kind"] == kind and entry["seq"] not in _published_seqs:
+            _auto_paste_pending = True
+
+    if prefs.sync_mode == 'SOCKET' and _socket_listener is not None and _socket_listener.has_pending("fbx"):
+        _auto_paste_pending = True
+
+    # 编辑模式等情况下先保留，回到物体模式后再粘贴
+    if _auto_paste_pending and bpy.context.mode == 'OBJECT':
+        _auto_paste_pending = False
+        print("检测到新数据，自动粘贴")
+        # 一次粘贴失败（数据损坏、poll 失败等）不能让异常传出定时器，否则定时器被注销，自动粘贴失效
+        try:
+            call_in_view3d(bpy.ops.idm.import_obj)
+        except Exception as e:
+            print(f"自动粘贴失败: {e}")
+
+    return prefs.auto_paste_interval
+
+
+def start_auto_paste():
+    """启动自动粘贴监听器"""
+    global _payload_watcher
+    if _payload_watcher is not None or bpy.app.background:
+        return
+
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
+    cache_dir = os.path.join(documents_dir, "cache")
+
+    _payload_watcher = payload_watcher.PayloadWatcher(cache_dir, debounce=prefs.auto_paste_debounce)
+    _payload_watcher.start()
+    bpy.app.timers.register(auto_paste_timer, first_interval=prefs.auto_paste_interval, persistent=True)
+    print(f"自动粘贴已启动 ({_payload_watcher.backend})")
+
+
+def stop_auto_paste():
+    """停止自动粘贴监听器"""
+    global _payload_watcher, _auto_paste_pending
+    if bpy.app.timers.is_registered(auto_paste_timer):
+        bpy.app.timers.unregister(auto_paste_timer)
+    if _payload_watcher is not None:
+        _payload_watcher.stop()
+        _payload_watcher = None
+    _auto_paste_pending = False
+
+
+def update_auto_paste(prefs):
+    if prefs.auto_paste:
+        start_auto_paste()
+    else:
+        stop_auto_paste()
+
 
 class PREFERENCES_OT_sync_pypreference_toggle(bpy.types.Operator):
     """Toggle sync_pypreference_check2 setting"""
@@ -1813,6 +3580,9 @@ class VIEW3D_MT_synctools_menu(bpy.types.Menu):
         layout.operator("idm.import_obj", 
             text="粘贴" if is_chinese else "Paste", 
             icon='PASTEDOWN')
+        layout.operator("idm.remove_last_paste",
+            text="移除上次粘贴" if is_chinese else "Remove Last Paste",
+            icon='X')
         layout.separator()
         layout.operator("preferences.sync_pypreference_toggle", 
             text="切换同步" if is_chinese else "Toggle Sync", 
@@ -1839,6 +3609,7 @@ def register():
     bpy.utils.register_class(OBJECT_PT_fbx_import_export_panel)
     bpy.utils.register_class(OBJECT_OT_import_obj)
     bpy.utils.register_class(OBJECT_OT_export_obj)
+    bpy.utils.register_class(OBJECT_OT_remove_last_paste)
     bpy.utils.register_class(PREFERENCES_OT_sync_pypreference_toggle)
     bpy.utils.register_class(VIEW3D_MT_synctools_menu)  # 注册菜单类
     bpy.utils.register_class(PREFERENCES_OT_clear_cache)  # 注册清理缓存操作符
@@ -1849,8 +3620,24 @@ def register():
     # 注册快捷键
     register_keymaps()
 
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    if prefs.auto_paste:
+        start_auto_paste()
+    update_socket_listener(prefs)
+    if prefs.prefetch_paste:
+        start_prefetch_watcher()
+    update_sync_trace(prefs)
+    schedule_cache_cleanup()
+
 
 def unregister():
+    stop_auto_paste()
+    stop_socket_listener()
+    stop_prefetch_watcher()
+    stop_cache_janitor()
+    if bpy.app.timers.is_registered(background_job_timer):
+        bpy.app.timers.unregister(background_job_timer)
+
     # 注销快捷键
     unregister_keymaps()
 
@@ -1864,6 +3651,7 @@ def unregister():
     bpy.utils.unregister_class(OBJECT_PT_fbx_import_export_panel)
     bpy.utils.unregister_class(OBJECT_OT_import_obj)
     bpy.utils.unregister_class(OBJECT_OT_export_obj)
+    bpy.utils.unregister_class(OBJECT_OT_remove_last_paste)
 
 
 if __name__ == "__main__":
@@ -1871,6 +3659,18 @@ if __name__ == "__main__":
 
 def export_project_info_with_settings(cache_dir):
     """根据用户设置导出项目信息"""
+    data = build_project_info_data()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    save_path = os.path.join(cache_dir, "project_info.json")
+
+    with open(save_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+    print(f"已导出项目信息到: {save_path}")
+
+def build_project_info_data():
+    """根据用户设置收集项目信息"""
     prefs = bpy.context.preferences.addons[__name__].preferences
     scene = bpy.context.scene
     render = scene.render
@@ -1920,6 +3720,21 @@ def export_project_info_with_settings(cache_dir):
             "frame_step": "none",
         })
     
+    # 烘焙动画的帧窗口，粘贴时据此对齐关键帧
+    if prefs.export_bake_animation:
+        start, end, step = get_export_frame_window(prefs, scene)
+        data.update({
+            "anim_frame_start": start,
+            "anim_frame_end": end,
+            "anim_frame_step": step,
+        })
+    else:
+        data.update({
+            "anim_frame_start": "none",
+            "anim_frame_end": "none",
+            "anim_frame_step": "none",
+        })
+    
     # 输出路径设置
     if prefs.export_sync_output_path:
         data.update({
@@ -1943,13 +3758,7 @@ def export_project_info_with_settings(cache_dir):
     # 添加文件名信息（如果有）
     data["blend_file"] = bpy.path.basename(bpy.data.filepath) if bpy.data.filepath else "Unsaved"
 
-    os.makedirs(cache_dir, exist_ok=True)
-    save_path = os.path.join(cache_dir, "project_info.json")
-
-    with open(save_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
-
-    print(f"已导出项目信息到: {save_path}")
+    return data
 
 def import_project_info_with_settings(json_path):
     """根据用户设置导入项目信息"""
@@ -1960,6 +3769,10 @@ def import_project_info_with_settings(json_path):
     with open(json_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
+    apply_project_info_data(data)
+
+def apply_project_info_data(data):
+    """根据用户设置应用项目信息"""
     prefs = bpy.context.preferences.addons[__name__].preferences
     scene = bpy.context.scene
     render = scene.render
@@ -2017,41 +3830,10 @@ class PREFERENCES_OT_clear_cache(bpy.types.Operator):
                 else "Cache directory does not exist")
             return {'CANCELLED'}
             
-        num_files, total_size = self.get_cache_info()
-        
-        fbx_files = glob.glob(os.path.join(cache_dir, "*.fbx"))
-        image_files = []
-        for ext in ['*.jpg', '*.jpeg', '*.png']:
-            image_files.extend(glob.glob(os.path.join(cache_dir, ext)))
-            
-        for file in fbx_files + image_files:
-            try:
-                os.remove(file)
-            except Exception as e:
-                print(f"{'删除文件出错' if context.preferences.addons[__name__].preferences.interface_language == 'zh_HANS' else 'Error deleting'} {file}: {e}")
+        # 与后台清理使用同一套逻辑，只是删除全部数据和贴图
+        num_files, total_size = cache_janitor.evict(cache_dir, cache_janitor.CLEAR_ALL)
                 
         self.report({'INFO'}, 
             f"已清除 {num_files} 个文件 ({total_size/1024/1024:.2f} MB)" if context.preferences.addons[__name__].preferences.interface_language == 'zh_HANS'
             else f"Cleared {num_files} files ({total_size/1024/1024:.2f} MB)")
         return {'FINISHED'}
-
-    def get_cache_info(self):
-        """Get current cache information"""
-        documents_dir = os.path.join(os.path.expanduser("~"), "Documents")
-        cache_dir = os.path.join(documents_dir, "cache")
-        
-        if not os.path.exists(cache_dir):
-            return 0, 0
-            
-        # Get all FBX and image files
-        fbx_files = glob.glob(os.path.join(cache_dir, "*.fbx"))
-        image_files = []
-        for ext in ['*.jpg', '*.jpeg', '*.png']:
-            image_files.extend(glob.glob(os.path.join(cache_dir, ext)))
-        
-        all_files = fbx_files + image_files
-        
-        # Calculate total size
-        total_size = sum(os.path.getsize(f) for f in all_files)
-        
-        return len(all_files), total_size
@@ -0,0 +1,353 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import statistics
+import tempfile
+
+# 复制 / 粘贴往返基准测试
+#   blender -b --factory-startup --python bench_sync.py -- --output results.json
+#   blender -b --factory-startup --python bench_sync.py -- --modes STANDARD --sizes small,medium --repeat 5
+#   python bench_sync.py --compare old.json new.json
+# 每个用例（模式 × 场景规模 × 重复次数）在单独的 Blender 进程中运行，峰值内存互不影响；
+# 子进程把 HOME 指向临时目录，不会读写用户自己的 cache 目录
+
+# 场景规模：对象数、每个网格的细分（顶点数 = (grid + 1)²）、骨骼数、动画帧数、材质数
+SIZES = {
+    "small": {"objects": 10, "grid": 31, "bones": 8, "frames": 24, "materials": 4},
+    "medium": {"objects": 100, "grid": 63, "bones": 32, "frames": 120, "materials": 16},
+    "large": {"objects": 400, "grid": 127, "bones": 128, "frames": 250, "materials": 64},
+}
+
+# 各同步模式的复制 / 粘贴函数和数据类型
+MODES = {
+    'STANDARD': ("export_fbx_to_cache", "import_latest_fbx", "fbx"),
+    'BATA': ("export_abc_to_cache", "import_abc_by_counter", "abc"),
+    'BINARY': ("export_meshes_to_binary_cache", "import_latest_binary", "stm"),
+}
+
+
+def peak_rss_bytes():
+    """当前进程的峰值常驻内存（字节），无法获取时返回 0"""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return 0
+        return counters.PeakWorkingSetSize
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# ---------------------------------------------------------------- 子进程：运行单个用例
+
+def _enable_addon(package, mode):
+    import bpy
+    import addon_utils
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    module = addon_utils.enable(package, default_set=True)
+    if module is None:
+        raise RuntimeError(f"无法启用插件: {package}")
+    prefs = bpy.context.preferences.addons[package].preferences
+    prefs["sync_mode"] = prefs.bl_rna.properties["sync_mode"].enum_items[mode].value
+    return module
+
+
+def build_scene(spec):
+    """生成测试场景并选中全部对象"""
+    import bpy
+    import bmesh
+
+    scene = bpy.context.scene
+    scene.frame_start = 1
+    scene.frame_end = spec["frames"]
+
+    materials = [bpy.data.materials.new(f"BenchMaterial_{i}") for i in range(spec["materials"])]
+
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=spec["grid"], y_segments=spec["grid"], size=1.0)
+    template = bpy.data.meshes.new("BenchMesh")
+    bm.to_mesh(template)
+    bm.free()
+
+    objects = []
+    columns = max(1, int(spec["objects"] ** 0.5))
+    for i in range(spec["objects"]):
+        mesh = template if i == 0 else template.copy()
+        if materials:
+            mesh.materials.append(materials[i % len(materials)])
+        obj = bpy.data.objects.new(f"BenchObject_{i}", mesh)
+        obj.location = (i % columns * 2.5, i // columns * 2.5, 0.0)
+        scene.collection.objects.link(obj)
+        # 首尾两帧的关键帧即可，FBX / ABC 导出时会逐帧采样
+        obj.keyframe_insert("location", frame=1)
+        obj.location.z = 1.0
+        obj.keyframe_insert("location", frame=spec["frames"])
+        objects.append(obj)
+
+    if spec["bones"]:
+        armature = bpy.data.armatures.new("BenchArmature")
+        rig = bpy.data.objects.new("BenchRig", armature)
+        scene.collection.objects.link(rig)
+        bpy.context.view_layer.objects.active = rig
+        bpy.ops.object.mode_set(mode='EDIT')
+        parent = None
+        for i in range(spec["bones"]):
+            bone = armature.edit_bones.new(f"Bone_{i}")
+            bone.head = (0.0, 0.0, i * 0.5)
+            bone.tail = (0.0, 0.0, i * 0.5 + 0.5)
+            bone.parent = parent
+            parent = bone
+        bpy.ops.object.mode_set(mode='OBJECT')
+        for pose_bone in rig.pose.bones:
+            pose_bone.keyframe_insert("rotation_quaternion", frame=1)
+            pose_bone.rotation_quaternion = (0.9239, 0.3827, 0.0, 0.0)
+            pose_bone.keyframe_insert("rotation_quaternion", frame=spec["frames"])
+        objects.append(rig)
+
+    for obj in objects:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = objects[0]
+    return objects
+
+
+def clear_scene():
+    """删除生成的数据，模拟在另一个 Blender 中粘贴"""
+    import bpy
+
+    bpy.data.batch_remove(list(bpy.data.objects))
+    bpy.data.batch_remove(list(bpy.data.meshes) + list(bpy.data.armatures) + list(bpy.data.actions))
+    bpy.data.batch_remove(list(bpy.data.materials))
+
+
+def _timed(module, operation, mode, func):
+    """运行复制或粘贴，返回 (耗时, 分阶段计时)"""
+    with module.sync_trace.trace(operation, mode=mode):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+    record = module.sync_trace.last_trace or {}
+    return elapsed, record.get("spans", [])
+
+
+def run_case(case):
+    import bpy
+
+    module = _enable_addon(case["package"], case["mode"])
+    cache_dir = os.path.join(case["home"], "Documents", "cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    module.sync_trace.set_enabled(True)
+
+    export_name, import_name, kind = MODES[case["mode"]]
+    spec = SIZES[case["size"]]
+    objects = build_scene(spec)
+    vertices = sum(len(obj.data.vertices) for obj in objects if obj.type == 'MESH')
+
+    copy_seconds, copy_spans = _timed(module, "copy", case["mode"], getattr(module, export_name))
+    peak_after_copy = peak_rss_bytes()
+    payload = module.get_latest_payload_file(cache_dir, kind)
+    payload_bytes = os.path.getsize(payload) if payload is not None else 0
+
+    clear_scene()
+    paste_seconds, paste_spans = _timed(module, "paste", case["mode"], getattr(module, import_name))
+    module.stop_cache_janitor()
+
+    return {
+        "mode": case["mode"],
+        "size": case["size"],
+        "run": case["run"],
+        "scene": dict(spec, vertices=vertices),
+        "copy_seconds": copy_seconds,
+        "paste_seconds": paste_seconds,
+        "payload_bytes": payload_bytes,
+        "objects_pasted": len(bpy.context.scene.objects),
+        "peak_rss_copy_bytes": peak_after_copy,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "copy_spans": copy_spans,
+        "paste_spans": paste_spans,
+    }
+
+
+def run_child(case_path):
+    with open(case_path, 'r', encoding='utf-8') as f:
+        case = json.load(f)
+    try:
+        result = run_case(case)
+    except Exception as e:
+        result = {"mode": case["mode"], "size": case["size"], "run": case["run"], "error": f"{type(e).__name__}: {e}"}
+    with open(case["result"], 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+# ---------------------------------------------------------------- 主进程：调度用例并汇总
+
+def run_suite(args):
+    blender = args.blender
+    addon_version = None
+    blender_version = None
+    try:
+        import bpy
+        blender = blender or bpy.app.binary_path
+        blender_version = bpy.app.version_string
+        import addon_utils
+        for module in addon_utils.modules():
+            if module.__name__ == args.package:
+                addon_version = ".".join(str(part) for part in module.bl_info.get("version", ()))
+    except ImportError:
+        pass
+    if not blender:
+        print("找不到 Blender，请用 --blender 指定路径")
+        return 2
+
+    # 子进程的 HOME 指向临时目录，用户脚本 / 扩展目录仍指向原来的位置以便找到插件
+    user_dirs = {}
+    try:
+        import bpy
+        user_dirs["BLENDER_USER_SCRIPTS"] = bpy.utils.script_path_user()
+        if bpy.app.version >= (4, 2, 0):
+            user_dirs["BLENDER_USER_EXTENSIONS"] = bpy.utils.user_resource('EXTENSIONS')
+    except ImportError:
+        pass
+    user_dirs = {key: path for key, path in user_dirs.items() if path}
+
+    runs = []
+    work_dir = tempfile.mkdtemp(prefix="synctools_bench_")
+    for mode in args.modes:
+        for size in args.sizes:
+            for run in range(args.repeat):
+                case_dir = tempfile.mkdtemp(dir=work_dir)
+                case_path = os.path.join(case_dir, "case.json")
+                case = {
+                    "package": args.package,
+                    "mode": mode,
+                    "size": size,
+                    "run": run,
+                    "home": case_dir,
+                    "result": os.path.join(case_dir, "result.json"),
+                }
+                with open(case_path, 'w', encoding='utf-8') as f:
+                    json.dump(case, f)
+
+                print(f"[bench] {mode} {size} #{run + 1}")
+                subprocess.run(
+                    [blender, "-b", "--factory-startup", "--python", os.path.abspath(__file__),
+                     "--", "--case", case_path],
+                    stdout=subprocess.DEVNULL if not args.verbose else None,
+                    env=dict(os.environ, HOME=case_dir, USERPROFILE=case_dir, **user_dirs),
+                    check=False,
+                )
+                try:
+                    with open(case["result"], 'r', encoding='utf-8') as f:
+                        result = json.load(f)
+                except (OSError, ValueError):
+                    result = {"mode": mode, "size": size, "run": run, "error": "no result"}
+                if "error" in result:
+                    print(f"[bench]   失败: {result['error']}")
+                else:
+                    print(f"[bench]   copy {result['copy_seconds']:.3f}s  paste {result['paste_seconds']:.3f}s  "
+                          f"{result['payload_bytes'] / 1024 / 1024:.2f} MB  peak {result['peak_rss_bytes'] / 1024 / 1024:.0f} MB")
+                runs.append(result)
+
+    report = {
+        "addon_version": addon_version,
+        "blender_version": blender_version,
+        "platform": platform.platform(),
+        "time": time.time(),
+        "sizes": {size: SIZES[size] for size in args.sizes},
+        "runs": runs,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench] 结果已写入 {args.output}")
+    return 0
+
+
+def summarize(report):
+    """按 (模式, 规模) 汇总各指标的中位数"""
+    groups = {}
+    for run in report["runs"]:
+        if "error" not in run:
+            groups.setdefault((run["mode"], run["size"]), []).append(run)
+    summary = {}
+    for key, runs in groups.items():
+        summary[key] = {
+            metric: statistics.median(run[metric] for run in runs)
+            for metric in ("copy_seconds", "paste_seconds", "payload_bytes", "peak_rss_bytes")
+        }
+    return summary
+
+
+def compare(base_path, new_path):
+    with open(base_path, 'r', encoding='utf-8') as f:
+        base = summarize(json.load(f))
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = summarize(json.load(f))
+
+    print(f"{'mode':<10}{'size':<8}{'metric':<16}{'base':>14}{'new':>14}{'ratio':>8}")
+    for key in sorted(set(base) & set(new)):
+        for metric, value in base[key].items():
+            ratio = new[key][metric] / value if value else float("nan")
+            print(f"{key[0]:<10}{key[1]:<8}{metric:<16}{value:>14.3f}{new[key][metric]:>14.3f}{ratio:>8.2f}")
+    return 0
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="bench_sync.py")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="比较两份结果文件")
+    parser.add_argument("--package", default=os.path.basename(os.path.dirname(os.path.abspath(__file__))),
+                        help="插件包名（默认为本文件所在目录名）")
+    parser.add_argument("--modes", default="STANDARD,BATA", type=lambda value: value.split(","))
+    parser.add_argument("--sizes", default="small,medium,large", type=lambda value: value.split(","))
+    parser.add_argument("--repeat", default=3, type=int)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--blender", help="Blender 可执行文件（在 Blender 中运行时自动获取）")
+    parser.add_argument("--verbose", action="store_true", help="显示子进程输出")
+    args = parser.parse_args(argv)
+
+    if args.case:
+        run_child(args.case)
+        return 0
+    if args.compare:
+        return compare(*args.compare)
+
+    for mode in args.modes:
+        if mode not in MODES:
+            parser.error(f"未知模式: {mode}")
+    for size in args.sizes:
+        if size not in SIZES:
+            parser.error(f"未知规模: {size}")
+    return run_suite(args)
+
+
+if __name__ == "__main__":
+    # 在 Blender 中运行时，脚本参数位于 "--" 之后
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    status = main(argv)
+    if "bpy" not in sys.modules:
+        sys.exit(status)
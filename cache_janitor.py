@@ -0,0 +1,210 @@
+import os
+import time
+import threading
+
+from . import cache_manifest
+from . import payload_codec
+
+# 可以被清理的文件：导出的数据（含压缩后缀）、贴图，以及写入中断留下的临时文件
+PAYLOAD_EXTENSIONS = (".fbx", ".abc", ".stm")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+TEMP_SUFFIXES = (".tmp", ".part")
+
+# 暂存目录和临时文件超过该时间（秒）才视为残留，避免删掉正在写入的文件
+TEMP_MAX_AGE = 3600.0
+
+
+class CachePolicy:
+    """清理策略；各项限制为 0 表示不限制，clear 为 True 时删除全部数据和贴图
+
+    缓存目录中的贴图只按 max_age 清理。
+    """
+
+    def __init__(self, max_bytes=0, max_age=0.0, max_entries=0, clear=False):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.clear = clear
+
+
+# 清除缓存按钮使用的策略
+CLEAR_ALL = CachePolicy(clear=True)
+
+
+def _classify(filename):
+    """返回文件类别：'payload' / 'image' / 'temp'，不可清理的文件返回 None"""
+    if filename.endswith(TEMP_SUFFIXES):
+        return 'temp'
+    if filename.endswith(cache_manifest.READY_SUFFIX):
+        return None  # 就绪记录跟随数据文件一起删除
+    name = payload_codec.strip_suffix(filename).lower()
+    if name.endswith(PAYLOAD_EXTENSIONS):
+        return 'payload'
+    if name.endswith(IMAGE_EXTENSIONS):
+        return 'image'
+    return None
+
+
+def _last_use_times(cache_dir):
+    """从清单中读取每个数据文件最近一次发布或导入的时间"""
+    paths_by_seq = {}
+    last_use = {}
+    for record in cache_manifest.iter_manifest(cache_dir):
+        if record.get("op") == "consume":
+            path = paths_by_seq.get((record.get("kind"), record.get("seq")))
+        else:
+            path = record.get("path")
+            paths_by_seq[(record.get("kind"), record.get("seq"))] = path
+        if path:
+            last_use[path] = max(last_use.get(path, 0.0), record.get("time", 0.0))
+    return last_use
+
+
+def scan_cache(cache_dir):
+    """列出可清理的文件：[{"path", "size", "last_use", "category"}]"""
+    items = []
+    try:
+        entries = list(os.scandir(cache_dir))
+    except OSError:
+        return items
+
+    staging_dir = os.path.join(cache_dir, cache_manifest.STAGING_DIR)
+    if os.path.isdir(staging_dir):
+        entries.extend(os.scandir(staging_dir))
+
+    for entry in entries:
+        if not entry.is_file(follow_symlinks=False):
+            continue
+        in_staging = os.path.dirname(entry.path) == staging_dir
+        category = 'temp' if in_staging else _classify(entry.name)
+        if category is None:
+            continue
+        stat = entry.stat(follow_symlinks=False)
+        items.append({
+            "path": entry.path,
+            "size": stat.st_size,
+            "last_use": stat.st_mtime,
+            "category": category,
+        })
+    return items
+
+
+def cache_usage(cache_dir):
+    """返回 (文件数, 总字节数)；只扫描目录，不读取清单，可以在界面绘制时调用"""
+    items = [item for item in scan_cache(cache_dir) if item["category"] != 'temp']
+    return len(items), sum(item["size"] for item in items)
+
+
+def plan_eviction(cache_dir, policy, now=None):
+    """按策略选出要删除的文件，最久未使用的优先"""
+    now = time.time() if now is None else now
+    items = scan_cache(cache_dir)
+    last_use = _last_use_times(cache_dir)
+    for item in items:
+        item["last_use"] = max(item["last_use"], last_use.get(os.path.basename(item["path"]), 0.0))
+
+    protected = set()
+    if not policy.clear:
+        # 每种类型的最新数据可能还没有被粘贴，始终保留
+        for entry in cache_manifest.read_head(cache_dir)["latest"].values():
+            protected.add(os.path.join(cache_dir, entry["path"]))
+            for part in entry.get("parts", ()):
+                protected.add(os.path.join(cache_dir, part["path"]))
+
+    evicted = []
+    keep = []
+    for item in sorted(items, key=lambda item: item["last_use"]):
+        if item["path"] in protected:
+            continue
+        age = now - item["last_use"]
+        if item["category"] == 'temp':
+            if age > TEMP_MAX_AGE:
+                evicted.append(item)
+        elif item["category"] == 'image' and not policy.clear:
+            # 与数据一起传来的贴图可能还没有粘贴，或仍被已粘贴的材质引用：只按时间清理，不计入容量和文件数
+            if policy.max_age and age > policy.max_age:
+                evicted.append(item)
+        elif policy.clear or (policy.max_age and age > policy.max_age):
+            evicted.append(item)
+        else:
+            keep.append(item)
+
+    total = sum(item["size"] for item in keep) + sum(os.path.getsize(path) for path in protected if os.path.exists(path))
+    count = len(keep) + len(protected)
+    for item in keep:
+        over_entries = policy.max_entries and count > policy.max_entries
+        over_bytes = policy.max_bytes and total > policy.max_bytes
+        if not over_entries and not over_bytes:
+            break
+        evicted.append(item)
+        count -= 1
+        total -= item["size"]
+    return evicted
+
+
+def evict(cache_dir, policy):
+    """执行清理，返回 (删除的文件数, 释放的字节数)"""
+    removed = 0
+    freed = 0
+    for item in plan_eviction(cache_dir, policy):
+        try:
+            os.remove(item["path"])
+        except OSError as e:
+            print(f"删除缓存文件失败 {item['path']}: {e}")
+            continue
+        if item["category"] == 'payload':
+            cache_manifest.discard_ready_record(cache_dir, os.path.basename(item["path"]))
+        removed += 1
+        freed += item["size"]
+    if removed:
+        # 被删除的数据不再需要清单记录，顺便压缩清单，下次清理不必读取全部历史
+        cache_manifest.compact_manifest(cache_dir)
+        print(f"缓存清理: 删除 {removed} 个文件, 释放 {freed / 1024 / 1024:.2f} MB")
+    return removed, freed
+
+
+class CacheJanitor:
+    """后台清理线程：schedule() 只是发出请求，删除文件不占用复制操作的时间
+
+    连续的请求会合并为一次清理。
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.policy = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="SyncToolsCacheJanitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def schedule(self, policy):
+        with self._lock:
+            self.policy = policy
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._running:
+                return
+            with self._lock:
+                policy, self.policy = self.policy, None
+            if policy is None:
+                continue
+            try:
+                evict(self.cache_dir, policy)
+            except Exception as e:
+                print(f"缓存清理失败: {e}")
@@ -0,0 +1,325 @@
+import os
+import json
+import time
+import socket
+import hashlib
+
+# 自动检测当前软件环境
+try:
+    import bpy
+    CURRENT_SOFTWARE = "BLENDER"
+except ImportError:
+    try:
+        import c4d
+        CURRENT_SOFTWARE = "C4D"
+    except ImportError:
+        CURRENT_SOFTWARE = None
+
+# 清单文件：manifest.jsonl 只追加，每行一条记录；manifest_head.json 保存最新状态，读取为 O(1)
+MANIFEST_FILE = "manifest.jsonl"
+HEAD_FILE = "manifest_head.json"
+LOCK_FILE = "manifest.lock"
+
+# 数据先写入同一磁盘上的暂存目录，写完并 fsync 后再原子改名到 cache 目录
+STAGING_DIR = ".staging"
+READY_SUFFIX = ".ready"
+
+# 其他主机持有的锁无法检查进程是否存在，超过该时间（秒）才视为残留，可以强制接管
+LOCK_STALE_SECONDS = 10.0
+
+
+def _pid_alive(pid):
+    """本机上的进程是否仍在运行"""
+    if os.name == 'nt':
+        # Windows 上 os.kill 会结束进程，改用 OpenProcess 查询
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return ctypes.GetLastError() == 5  # ERROR_ACCESS_DENIED：进程存在但没有权限
+        try:
+            code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                return True
+            return code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # 没有权限发送信号，进程存在
+    return True
+
+
+def _lock_is_stale(path, stat):
+    """锁文件是否为残留：本机持有者看进程是否已退出，其他主机的锁按修改时间判断"""
+    try:
+        with open(path, 'r', encoding='ascii', errors='replace') as f:
+            owner = f.read()
+    except OSError:
+        return False
+    host, _, pid = owner.rpartition(":")
+    if host == socket.gethostname() and pid.isdigit():
+        return not _pid_alive(int(pid))
+    # 刚创建还没写入持有者的锁，修改时间是最新的，不会被误判
+    return time.time() - stat.st_mtime > LOCK_STALE_SECONDS
+
+
+class ManifestLock:
+    """基于 O_EXCL 锁文件的跨进程互斥锁（Blender 与 C4D 可能同时写入清单）"""
+
+    def __init__(self, cache_dir, timeout=5.0):
+        self.path = os.path.join(cache_dir, LOCK_FILE)
+        self.timeout = timeout
+        self.fd = None
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self.fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self.fd, f"{socket.gethostname()}:{os.getpid()}".encode("ascii", "replace"))
+                return self
+            except FileExistsError:
+                try:
+                    stat = os.stat(self.path)
+                    if _lock_is_stale(self.path, stat):
+                        # 删除前确认还是同一个锁文件，避免删掉其他进程刚接管的新锁
+                        current = os.stat(self.path)
+                        if (current.st_ino, current.st_mtime_ns) == (stat.st_ino, stat.st_mtime_ns):
+                            os.remove(self.path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"无法获取清单锁: {self.path}")
+                time.sleep(0.01)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        return False
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    """计算文件的 BLAKE2b 校验值（流式读取，不占用大量内存）"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def staging_path(cache_dir, filename):
+    """返回暂存目录中的路径；暂存目录不会被 *.fbx / *.abc 扫描到"""
+    staging_dir = os.path.join(cache_dir, STAGING_DIR)
+    os.makedirs(staging_dir, exist_ok=True)
+    return os.path.join(staging_dir, filename)
+
+
+def _fsync_path(path):
+    """把文件内容刷到磁盘"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(dir_path):
+    """刷新目录项，保证改名本身也已落盘（Windows 不支持打开目录）"""
+    if os.name != 'posix':
+        return
+    try:
+        _fsync_path(dir_path)
+    except OSError:
+        pass
+
+
+def commit_staged(cache_dir, staged_path, filename=None):
+    """fsync 暂存文件后原子改名到 cache 目录，返回最终路径"""
+    final_path = os.path.join(cache_dir, filename or os.path.basename(staged_path))
+    _fsync_path(staged_path)
+    os.replace(staged_path, final_path)
+    _fsync_dir(cache_dir)
+    return final_path
+
+
+def atomic_write_text(path, text):
+    """原子写入文本文件"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def ready_record_path(cache_dir, filename):
+    """数据文件对应的就绪记录路径，例如 export_3.fbx.ready"""
+    return os.path.join(cache_dir, filename + READY_SUFFIX)
+
+
+def is_ready(cache_dir, filename):
+    """数据文件是否已经完整发布"""
+    return os.path.exists(ready_record_path(cache_dir, filename))
+
+
+def unlisted_payload_visible(cache_dir, head, filename):
+    """不在清单头部中的数据文件能否被当作旧版数据导入
+
+    头部带有 ready_records 标记时，目录中的发布方会先提交文件再写就绪记录：
+    没有就绪记录的文件是已提交但尚未登记的分片、正在发布或已被导入的数据，不能导入。
+    """
+    return not head.get("ready_records") or is_ready(cache_dir, filename)
+
+
+def discard_ready_record(cache_dir, filename):
+    """删除数据文件的就绪记录"""
+    try:
+        os.remove(ready_record_path(cache_dir, filename))
+    except OSError:
+        pass
+
+
+def read_head(cache_dir):
+    """读取清单头部：{"seq": 最新序号, "latest": {类型: 记录}, "ready_records": 发布方是否写入就绪记录}"""
+    head_path = os.path.join(cache_dir, HEAD_FILE)
+    try:
+        with open(head_path, 'r', encoding='utf-8') as f:
+            head = json.load(f)
+    except (OSError, ValueError):
+        head = {}
+    head.setdefault("seq", 0)
+    head.setdefault("latest", {})
+    return head
+
+
+def _write_head(cache_dir, head):
+    """原子写入清单头部，读取方永远不会看到写了一半的文件"""
+    atomic_write_text(os.path.join(cache_dir, HEAD_FILE), json.dumps(head, ensure_ascii=False))
+
+
+def _append_record(cache_dir, record):
+    """以单次 O_APPEND 写入追加一行记录"""
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+    fd = os.open(os.path.join(cache_dir, MANIFEST_FILE), os.O_CREAT | os.O_WRONLY | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def reserve_sequence(cache_dir):
+    """分配下一个导出序号（取代 export_counter.txt / abc_counter.txt）"""
+    os.makedirs(cache_dir, exist_ok=True)
+    with ManifestLock(cache_dir):
+        head = read_head(cache_dir)
+        head["seq"] += 1
+        head["ready_records"] = True
+        _write_head(cache_dir, head)
+    return head["seq"]
+
+
+def publish_payload(cache_dir, payload_path, kind, seq, **extra):
+    """把已经提交的数据文件登记到清单：先写就绪记录，再追加清单并更新头部"""
+    entry = {
+        "seq": seq,
+        "path": os.path.basename(payload_path),
+        "kind": kind,
+        "size": os.path.getsize(payload_path),
+        "checksum": file_checksum(payload_path),
+        "host": socket.gethostname(),
+        "producer": CURRENT_SOFTWARE or "UNKNOWN",
+        "time": time.time(),
+    }
+    entry.update(extra)
+
+    atomic_write_text(ready_record_path(cache_dir, entry["path"]), json.dumps(entry, ensure_ascii=False))
+
+    with ManifestLock(cache_dir):
+        _append_record(cache_dir, entry)
+        head = read_head(cache_dir)
+        head["seq"] = max(head["seq"], seq)
+        head["latest"][kind] = entry
+        _write_head(cache_dir, head)
+    return entry
+
+
+def get_latest_payload(cache_dir, kind):
+    """O(1) 读取指定类型的最新数据记录；文件已被消费或删除时返回 None
+
+    头部只会在数据改名并 fsync 之后更新，因此返回的记录一定指向完整的文件。
+    """
+    entry = read_head(cache_dir)["latest"].get(kind)
+    if entry is None:
+        return None
+    if not os.path.exists(os.path.join(cache_dir, entry["path"])):
+        return None
+    return entry
+
+
+def mark_consumed(cache_dir, entry):
+    """记录某条数据已被导入；与发布和压缩一样在清单锁内追加"""
+    with ManifestLock(cache_dir):
+        _append_record(cache_dir, {
+            "op": "consume",
+            "seq": entry["seq"],
+            "kind": entry["kind"],
+            "host": socket.gethostname(),
+            "time": time.time(),
+        })
+
+
+def compact_manifest(cache_dir):
+    """重写清单，去掉文件已不存在的发布记录及其消费记录，返回删除的记录数
+
+    清单只追加，不压缩时会随导出次数无限增长，而缓存清理每次都要读完整个清单。
+    在清单锁内读取和替换，不会丢失其他进程同时追加的记录。
+    """
+    with ManifestLock(cache_dir):
+        head = read_head(cache_dir)
+        latest = {(entry["kind"], entry["seq"]) for entry in head["latest"].values()}
+        records = list(iter_manifest(cache_dir))
+
+        live = set()
+        for record in records:
+            if record.get("op") == "consume":
+                continue
+            key = (record.get("kind"), record.get("seq"))
+            paths = [record.get("path")] + [part["path"] for part in record.get("parts", ())]
+            if key in latest or any(path and os.path.exists(os.path.join(cache_dir, path)) for path in paths):
+                live.add(key)
+
+        kept = [record for record in records if (record.get("kind"), record.get("seq")) in live]
+        if len(kept) == len(records):
+            return 0
+        text = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in kept)
+        atomic_write_text(os.path.join(cache_dir, MANIFEST_FILE), text)
+    return len(records) - len(kept)
+
+
+def iter_manifest(cache_dir):
+    """按写入顺序遍历清单中的所有记录"""
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # 跳过被截断的最后一行
+                continue
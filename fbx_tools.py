@@ -0,0 +1,328 @@
+import bpy
+import inspect
+import numpy as np
+from contextlib import contextmanager
+from mathutils import Matrix
+from bpy_extras.io_utils import axis_conversion
+
+# FBX 二进制中每个关键帧至少占用的字节数（KeyTime int64 + KeyValueFloat float32），用于估算节省的数据量
+KEY_BYTES = 12
+
+# 导出操作符中只用于文件浏览器界面的属性，不传给 export_fbx_bin.save()
+_UI_ONLY_PROPERTIES = {"rna_type", "check_existing", "filter_glob", "ui_tab"}
+
+
+class _ReportProxy:
+    """直接调用 export_fbx_bin.save() 时代替操作符，只需要 report()"""
+
+    def report(self, type, message):
+        print(f"FBX 导出 {', '.join(sorted(type))}: {message}")
+
+
+def operator_defaults():
+    """读取 FBX 导出操作符的默认参数（随 Blender 版本变化，不硬编码）"""
+    defaults = {}
+    for prop in bpy.ops.export_scene.fbx.get_rna_type().properties:
+        if prop.identifier in _UI_ONLY_PROPERTIES or prop.type in {'POINTER', 'COLLECTION'}:
+            continue
+        if prop.type == 'ENUM' and prop.is_enum_flag:
+            defaults[prop.identifier] = set(prop.default_flag)
+        elif getattr(prop, "is_array", False):
+            defaults[prop.identifier] = tuple(prop.default_array)
+        else:
+            defaults[prop.identifier] = prop.default
+    return defaults
+
+
+def direct_export_error():
+    """检查能否直接调用 export_fbx_bin.save()；可以时返回 None，否则返回原因
+
+    内置 FBX 插件的内部接口不保证稳定，导出前检查，而不是在导出中途捕获异常。
+    """
+    try:
+        from io_scene_fbx import export_fbx_bin
+    except ImportError as e:
+        return f"io_scene_fbx: {e}"
+    for name in ("save", "save_single"):
+        func = getattr(export_fbx_bin, name, None)
+        if func is None:
+            return f"export_fbx_bin.{name}() 不存在"
+        try:
+            params = inspect.signature(func).parameters
+        except (TypeError, ValueError) as e:
+            return f"export_fbx_bin.{name}(): {e}"
+        if not any(param.kind == param.VAR_KEYWORD for param in params.values()):
+            return f"export_fbx_bin.{name}() 不接受关键字参数"
+    if "global_matrix" not in inspect.signature(export_fbx_bin.save_single).parameters:
+        return "export_fbx_bin.save_single() 没有 global_matrix 参数"
+    return None
+
+
+def export_fbx(filepath, axis_forward, axis_up, extra_matrix=None, **options):
+    """不经过操作符直接调用 io_scene_fbx 导出
+
+    extra_matrix 在轴向转换之前作用于所有根对象，用来代替导出前复制对象再旋转的做法；
+    不会创建任何数据块，也不会改变用户的选择。options 与导出操作符的参数相同。
+    """
+    from io_scene_fbx import export_fbx_bin
+
+    keywords = operator_defaults()
+    keywords.update(options)
+    keywords.update(filepath=filepath, axis_forward=axis_forward, axis_up=axis_up)
+
+    if keywords.get("use_space_transform", True):
+        global_matrix = axis_conversion(to_forward=axis_forward, to_up=axis_up).to_4x4()
+    else:
+        global_matrix = Matrix()
+    if extra_matrix is not None:
+        global_matrix = global_matrix @ extra_matrix
+    keywords["global_matrix"] = global_matrix
+
+    return export_fbx_bin.save(_ReportProxy(), bpy.context, **keywords)
+
+
+def reduce_channel(times, values, tolerance):
+    """返回要保留的采样掩码
+
+    去掉的采样与相邻保留关键帧之间线性插值的误差都不超过 tolerance（Douglas-Peucker）。
+    每段误差最大的采样优先保留，所以峰值和转折处始终有关键帧，自动钳制的手柄在这些位置保持水平。
+    """
+    count = len(values)
+    keep = np.zeros(count, dtype=bool)
+    if count == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        inner = slice(first + 1, last)
+        chord = values[first] + (values[last] - values[first]) * (times[inner] - times[first]) / (times[last] - times[first])
+        error = np.abs(values[inner] - chord)
+        index = int(np.argmax(error))
+        if error[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+
+def reduce_curves(times, values, masks, tolerance):
+    """精简一个曲线节点的全部曲线，直接修改 masks，返回 (精简前的关键帧数, 去掉的关键帧数)
+
+    values / masks 与导出器的 _frame_values_array / _frame_write_mask_array 相同，每行一条曲线（如 X / Y / Z）。
+    """
+    times = times.astype(np.float64)
+    total = 0
+    removed = 0
+    for curve_values, mask in zip(values, masks):
+        keys = int(np.count_nonzero(mask))
+        total += keys
+        if not tolerance or keys <= 2:
+            continue
+        keep = reduce_channel(times, curve_values.astype(np.float64), tolerance)
+        # 导出器要求首尾关键帧时保留原有的首尾
+        keep[0] = mask[0]
+        keep[-1] = mask[-1]
+        mask &= keep
+        removed += keys - int(np.count_nonzero(mask))
+    return total, removed
+
+
+@contextmanager
+def curve_reduction(location_tolerance, rotation_tolerance, global_scale=1.0):
+    """在导出期间为 FBX 导出器的曲线简化追加误差约束的关键帧精简
+
+    location_tolerance 为 Blender 场景单位，rotation_tolerance 为角度；为 0 时不精简对应通道。
+    返回的字典在导出结束后包含 "keys"（精简前的关键帧数）和 "removed"（去掉的关键帧数）。
+    """
+    stats = {"keys": 0, "removed": 0}
+    if not location_tolerance and not rotation_tolerance:
+        yield stats
+        return
+
+    from io_scene_fbx import fbx_utils
+
+    wrapper = fbx_utils.AnimationCurveNodeWrapper
+    original_simplify = wrapper.simplify
+    # 导出器默认 apply_unit_scale=True，平移值已经换算为 FBX 单位（厘米）
+    unit_factor = fbx_utils.units_blender_to_fbx_factor(bpy.context.scene) * global_scale
+    tolerances = {
+        "Lcl Translation": location_tolerance * unit_factor,
+        "Lcl Rotation": rotation_tolerance,  # FBX 中的旋转值为角度
+    }
+
+    def simplify(self, fac=1.0, step=1.0, force_keep=False):
+        original_simplify(self, fac, step, force_keep)
+        times = getattr(self, "_frame_times_array", None)
+        values = getattr(self, "_frame_values_array", None)
+        masks = getattr(self, "_frame_write_mask_array", None)
+        if times is None or values is None or masks is None:
+            return
+        keys, removed = reduce_curves(times, values, masks, tolerances.get(self.fbx_group[0]))
+        stats["keys"] += keys
+        stats["removed"] += removed
+
+    wrapper.simplify = simplify
+    try:
+        yield stats
+    finally:
+        wrapper.simplify = original_simplify
+
+
+def iter_action_fcurves(action):
+    """遍历动作中的全部 F 曲线（兼容 Blender 4.4 起的分层动作）"""
+    layers = getattr(action, "layers", None)
+    if layers:
+        for layer in layers:
+            for strip in layer.strips:
+                for channelbag in strip.channelbags:
+                    yield from channelbag.fcurves
+    else:
+        yield from action.fcurves
+
+
+def first_key_frame(actions):
+    """返回动作中最早的关键帧，没有关键帧时返回 None"""
+    first = None
+    for action in actions:
+        for fcurve in iter_action_fcurves(action):
+            if len(fcurve.keyframe_points):
+                frame = fcurve.keyframe_points[0].co.x
+                first = frame if first is None else min(first, frame)
+    return first
+
+
+def shift_actions(actions, offset):
+    """把动作中的关键帧和手柄整体平移 offset 帧"""
+    for action in actions:
+        for fcurve in iter_action_fcurves(action):
+            points = fcurve.keyframe_points
+            if not len(points):
+                continue
+            for attr in ("co", "handle_left", "handle_right"):
+                coords = np.empty(len(points) * 2, dtype=np.float32)
+                points.foreach_get(attr, coords)
+                coords[0::2] += offset
+                points.foreach_set(attr, coords)
+            fcurve.update()
+
+
+# 导入时按对象类型过滤：FBX Model 节点的类别 -> Blender 对象类型
+MODEL_CLASSES = {
+    b"Mesh": 'MESH',
+    b"Light": 'LIGHT',
+    b"Camera": 'CAMERA',
+    b"LimbNode": 'ARMATURE',
+    b"Root": 'ARMATURE',
+}
+MATERIAL_ELEMENTS = {b"Material", b"Texture", b"Video", b"LayeredTexture"}
+# 只依附于其他节点存在的数据：所属节点全部被删除时一并删除
+DEPENDENT_ELEMENTS = {
+    b"NodeAttribute", b"Geometry", b"Deformer", b"AnimationCurveNode", b"AnimationCurve",
+} | MATERIAL_ELEMENTS
+# 动画层不算作所属节点（每条动画曲线都连接到动画层）
+_OWNER_EXCLUDED = {b"AnimationLayer", b"AnimationStack"}
+
+
+def _element_uid(elem):
+    return elem.props[0] if elem.props and elem.props_type[:1] == b'L' else None
+
+
+def prune_elements(elem_root, excluded_types, skip_materials):
+    """在导入器建立任何数据之前，从解析后的 FBX 元素树中删除不需要的节点，返回删除的节点数"""
+    objects = next((elem for elem in elem_root.elems if elem.id == b"Objects"), None)
+    connections = next((elem for elem in elem_root.elems if elem.id == b"Connections"), None)
+    if objects is None or connections is None:
+        return 0
+
+    elements = {}
+    for elem in objects.elems:
+        uid = _element_uid(elem)
+        if uid is not None:
+            elements[uid] = elem
+
+    owners = {}  # 子节点 -> 所属节点
+    child_models = {}  # Model -> 子 Model
+    for link in connections.elems:
+        child, parent = link.props[1], link.props[2]
+        parent_elem = elements.get(parent)
+        if parent_elem is None or parent_elem.id in _OWNER_EXCLUDED:
+            continue
+        owners.setdefault(child, []).append(parent)
+        child_elem = elements.get(child)
+        if child_elem is not None and child_elem.id == b"Model" and parent_elem.id == b"Model":
+            child_models.setdefault(parent, []).append(child)
+
+    removed = set()
+    for uid, elem in elements.items():
+        if elem.id == b"Model" and MODEL_CLASSES.get(elem.props[2]) in excluded_types:
+            removed.add(uid)
+        elif skip_materials and elem.id in MATERIAL_ELEMENTS:
+            removed.add(uid)
+        elif 'ARMATURE' in excluded_types and (
+                elem.id == b"Pose" or (elem.id == b"Deformer" and elem.props[2] in {b"Skin", b"Cluster"})):
+            removed.add(uid)
+
+    if 'ARMATURE' in excluded_types:
+        # 骨架对象导出为 Null，子节点全部是骨骼时一并删除，不留下空物体
+        for uid, elem in elements.items():
+            children = child_models.get(uid)
+            if elem.id == b"Model" and elem.props[2] == b"Null" and children and all(child in removed for child in children):
+                removed.add(uid)
+
+    # 依附数据逐层传递：属性 / 几何 -> 形变器 -> 形态键 …，几层之内收敛
+    changed = True
+    while changed:
+        changed = False
+        for uid, elem in elements.items():
+            if uid in removed or elem.id not in DEPENDENT_ELEMENTS:
+                continue
+            parents = owners.get(uid)
+            if parents and all(parent in removed for parent in parents):
+                removed.add(uid)
+                changed = True
+
+    if not removed:
+        return 0
+    objects.elems[:] = [elem for elem in objects.elems if _element_uid(elem) not in removed]
+    connections.elems[:] = [link for link in connections.elems
+                            if link.props[1] not in removed and link.props[2] not in removed]
+    return len(removed)
+
+
+@contextmanager
+def import_filter(excluded_types, skip_materials):
+    """导入期间在 FBX 解析之后、建立数据之前按类型删除节点
+
+    excluded_types 为不导入的对象类型（'MESH' / 'LIGHT' / 'CAMERA' / 'ARMATURE'）。
+    返回的字典中 "applied" 表示过滤已经生效（导入器接口变化时为 False，调用方需要自行删除），
+    "removed" 为删除的节点数。
+    """
+    stats = {"applied": False, "removed": 0}
+    if not excluded_types and not skip_materials:
+        stats["applied"] = True
+        yield stats
+        return
+
+    try:
+        from io_scene_fbx import parse_fbx
+    except ImportError:
+        yield stats
+        return
+
+    original_parse = parse_fbx.parse
+
+    def parse(*args, **kwargs):
+        elem_root, version = original_parse(*args, **kwargs)
+        stats["removed"] += prune_elements(elem_root, excluded_types, skip_materials)
+        stats["applied"] = True
+        return elem_root, version
+
+    parse_fbx.parse = parse
+    try:
+        yield stats
+    finally:
+        parse_fbx.parse = original_parse
@@ -0,0 +1,141 @@
+import re
+import json
+import struct
+import hashlib
+
+# 层级清单：每个节点一条记录，父节点总是排在子节点之前
+#   {"id": 稳定 ID, "parent": 父节点序号（根节点为 -1）, "name": 唯一名称, "type": 对象类型, "matrix": 世界矩阵（16 个数，按行）}
+# 两种编码，读取时按文件头自动识别：
+#   hierarchy.jsonl  第一行为文件头 {"format", "version", "count"}，之后每行一条记录
+#   hierarchy.bin    "STH1" + 节点数，之后每个节点为 <id u64, parent i32, type u16, 名称长度 u16> + UTF-8 名称 + 16 个 float32
+# 旧版 hierarchy.txt（按缩进表示层级）可以由同一份记录生成
+JSONL_FILE = "hierarchy.jsonl"
+BINARY_FILE = "hierarchy.bin"
+TEXT_FILE = "hierarchy.txt"
+
+FORMAT_NAME = "synctools-hierarchy"
+VERSION = 1
+MAGIC = b"STH1"
+
+# 二进制编码中对象类型的编号，只能在末尾追加
+OBJECT_TYPES = (
+    "EMPTY", "MESH", "CURVE", "SURFACE", "META", "FONT", "CURVES", "POINTCLOUD", "VOLUME",
+    "GPENCIL", "GREASEPENCIL", "ARMATURE", "LATTICE", "LIGHT", "LIGHT_PROBE", "CAMERA", "SPEAKER",
+)
+_TYPE_CODES = {name: code for code, name in enumerate(OBJECT_TYPES)}
+_UNKNOWN_TYPE = 0xFFFF
+
+_HEADER = struct.Struct("<4sI")
+_NODE = struct.Struct("<QiHH")
+_MATRIX = struct.Struct("<16f")
+
+_NUMBER_SUFFIX = re.compile(r'\.\d+$')
+
+
+def stable_id(name):
+    """由对象全名得到的 64 位 ID，同一个对象在多次复制之间保持不变"""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def unique_name(name, name_counts):
+    """去掉 Blender 的 .001 编号后按出现顺序重新编号（与旧版 hierarchy.txt 相同）"""
+    base_name = _NUMBER_SUFFIX.sub('', name) if '.' in name else name
+    count = name_counts.get(base_name, 0)
+    name_counts[base_name] = count + 1
+    return base_name if count == 0 else f"{base_name}.{count:03d}"
+
+
+def build_records(objects):
+    """单次迭代遍历选中对象的层级，返回记录列表（深度优先，与旧版 hierarchy.txt 的顺序相同）
+
+    只使用选中对象本身建立子节点表，不访问 obj.children（每次调用都要扫描全部对象），
+    也不递归，骨骼链再深也不会超出递归限制。
+    """
+    selected = set(objects)
+    children = {}
+    roots = []
+    for obj in objects:
+        if obj.parent in selected:
+            children.setdefault(obj.parent, []).append(obj)
+        else:
+            roots.append(obj)
+
+    records = []
+    index_of = {}
+    name_counts = {}
+    stack = roots[::-1]
+    while stack:
+        obj = stack.pop()
+        index_of[obj] = len(records)
+        records.append({
+            "id": stable_id(obj.name_full),
+            "parent": index_of.get(obj.parent, -1),
+            "name": unique_name(obj.name, name_counts),
+            "type": obj.type,
+            "matrix": [value for row in obj.matrix_world for value in row],
+        })
+        # 子节点按名称排列（与 obj.children 的顺序一致），倒序入栈以便按顺序弹出
+        stack.extend(sorted(children.get(obj, ()), key=lambda child: child.name, reverse=True))
+    return records
+
+
+def write_jsonl(file, records):
+    """把记录写成 JSON Lines（file 以二进制模式打开）"""
+    header = {"format": FORMAT_NAME, "version": VERSION, "count": len(records)}
+    file.write((json.dumps(header) + "\n").encode("utf-8"))
+    for record in records:
+        file.write((json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+
+
+def write_binary(file, records):
+    """把记录写成紧凑的二进制格式（file 以二进制模式打开）"""
+    file.write(_HEADER.pack(MAGIC, len(records)))
+    for record in records:
+        name = record["name"].encode("utf-8")
+        file.write(_NODE.pack(record["id"], record["parent"], _TYPE_CODES.get(record["type"], _UNKNOWN_TYPE), len(name)))
+        file.write(name)
+        file.write(_MATRIX.pack(*record["matrix"]))
+
+
+def write_text(file, records):
+    """写成旧版按缩进表示层级的 hierarchy.txt（file 以二进制模式打开）"""
+    depths = []
+    for record in records:
+        depth = depths[record["parent"]] + 1 if record["parent"] >= 0 else 0
+        depths.append(depth)
+        file.write((' ' * depth * 4 + record["name"] + "\n").encode("utf-8"))
+
+
+def _read_binary(data):
+    magic, count = _HEADER.unpack_from(data, 0)
+    offset = _HEADER.size
+    records = []
+    for _ in range(count):
+        node_id, parent, type_code, name_length = _NODE.unpack_from(data, offset)
+        offset += _NODE.size
+        name = data[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+        matrix = list(_MATRIX.unpack_from(data, offset))
+        offset += _MATRIX.size
+        records.append({
+            "id": node_id,
+            "parent": parent,
+            "name": name,
+            "type": OBJECT_TYPES[type_code] if type_code < len(OBJECT_TYPES) else "UNKNOWN",
+            "matrix": matrix,
+        })
+    return records
+
+
+def read_records(path):
+    """读取层级清单（JSON Lines 或二进制，按文件头识别），返回记录列表"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:len(MAGIC)] == MAGIC:
+        return _read_binary(data)
+
+    lines = data.decode("utf-8").splitlines()
+    header = json.loads(lines[0]) if lines else {}
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"不是层级清单文件: {path}")
+    return [json.loads(line) for line in lines[1:] if line]
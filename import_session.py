@@ -0,0 +1,131 @@
+import bpy
+from contextlib import contextmanager
+
+# 记录一次粘贴新建的数据块，不需要在导入前后对比整个场景
+#   with import_session.track() as session:
+#       bpy.ops.import_scene.fbx(...)
+#   session.objects  新建的对象
+#   session.ids      新建对象引用的网格 / 骨架 / 材质 / 贴图 / 动作
+# 导入期间把一个临时集合设为活动集合，导入器新建的对象都链接到这个集合，
+# 结束后移到原来的活动集合；其他数据块从新对象出发查找，开销只与新数据的数量有关。
+# 导入器可能复用已有的贴图等数据，session_uid 不大于临时集合的数据块（导入前已存在）不算作新建。
+# 一次粘贴（可能包含多次导入）的全部记录保存在 last_paste 中，供“移除上次粘贴”使用。
+TEMP_COLLECTION = "SyncTools Import"
+
+# 数据块类型 -> bpy.data 中的集合名，用于按名称重新查找记录的数据块
+_DATA_COLLECTIONS = (
+    (bpy.types.Object, "objects"),
+    (bpy.types.Mesh, "meshes"),
+    (bpy.types.Armature, "armatures"),
+    (bpy.types.Material, "materials"),
+    (bpy.types.Image, "images"),
+    (bpy.types.Action, "actions"),
+    (bpy.types.Camera, "cameras"),
+    (bpy.types.Light, "lights"),
+    (bpy.types.Curve, "curves"),
+)
+
+last_paste = []  # (集合名, 名称, session_uid)
+
+
+class ImportSession:
+    def __init__(self):
+        self.objects = []
+        self.ids = []
+
+
+def collect_dependencies(ids):
+    """对象和材质直接或间接引用的网格 / 骨架 / 材质 / 动作 / 贴图，返回 {指针: 数据块}"""
+    found = {}
+    pending = list(ids)
+    while pending:
+        id_data = pending.pop()
+        refs = []
+        anim = getattr(id_data, "animation_data", None)
+        if anim is not None and anim.action is not None:
+            refs.append(anim.action)
+        if isinstance(id_data, bpy.types.Object):
+            if id_data.data is not None:
+                refs.append(id_data.data)
+            refs.extend(slot.material for slot in id_data.material_slots if slot.material is not None)
+        elif isinstance(id_data, bpy.types.Mesh):
+            refs.extend(mat for mat in id_data.materials if mat is not None)
+            # 形态键随网格一起删除，只需要记录它的动作
+            keys = id_data.shape_keys
+            if keys is not None and keys.animation_data is not None and keys.animation_data.action is not None:
+                refs.append(keys.animation_data.action)
+        elif isinstance(id_data, bpy.types.Material) and id_data.node_tree is not None:
+            refs.extend(node.image for node in id_data.node_tree.nodes if getattr(node, "image", None) is not None)
+        for ref in refs:
+            pointer = ref.as_pointer()
+            if pointer not in found:
+                found[pointer] = ref
+                pending.append(ref)
+    return found
+
+
+def _data_collection(id_data):
+    for id_type, name in _DATA_COLLECTIONS:
+        if isinstance(id_data, id_type):
+            return name
+    return None
+
+
+def begin_paste():
+    """开始新的一次粘贴，之后记录的数据块都属于这次粘贴"""
+    last_paste.clear()
+
+
+def record(objects, ids=None):
+    """把新建的对象和数据块记入本次粘贴；ids 为 None 时从对象出发查找"""
+    if ids is None:
+        ids = collect_dependencies(objects).values()
+    for id_data in list(objects) + list(ids):
+        name = _data_collection(id_data)
+        if name is not None:
+            # 旧版本没有 session_uid 时只按名称查找
+            last_paste.append((name, id_data.name, getattr(id_data, "session_uid", None)))
+
+
+def resolve_last_paste():
+    """返回上次粘贴的数据块中仍然存在的部分（已被删除或改名的跳过）"""
+    # 每种数据只建一次名称表，逐个调用 get() 在大场景中是线性查找
+    by_name = {}
+    ids = []
+    for collection, name, session_uid in last_paste:
+        if collection not in by_name:
+            by_name[collection] = {id_data.name: id_data for id_data in getattr(bpy.data, collection)}
+        id_data = by_name[collection].get(name)
+        if id_data is None or id_data.library is not None:
+            continue
+        if session_uid is not None and getattr(id_data, "session_uid", session_uid) != session_uid:
+            continue
+        ids.append(id_data)
+    return ids
+
+
+@contextmanager
+def track(view_layer=None):
+    """在临时活动集合中执行导入，结束后 session.objects / session.ids 为新建的数据块
+
+    新对象移回原来的活动集合并记入 last_paste。导入器把对象链接到其他集合或场景时也能准确识别。
+    """
+    view_layer = view_layer or bpy.context.view_layer
+    session = ImportSession()
+    target_layer = view_layer.active_layer_collection
+    target = target_layer.collection
+    temp = bpy.data.collections.new(TEMP_COLLECTION)
+    watermark = getattr(temp, "session_uid", None)
+    target.children.link(temp)
+    view_layer.active_layer_collection = target_layer.children[temp.name]
+    try:
+        yield session
+    finally:
+        view_layer.active_layer_collection = target_layer
+        session.objects = list(temp.objects)
+        for obj in session.objects:
+            target.objects.link(obj)
+        bpy.data.collections.remove(temp)
+        session.ids = [id_data for id_data in collect_dependencies(session.objects).values()
+                       if watermark is None or id_data.session_uid > watermark]
+        record(session.objects, session.ids)
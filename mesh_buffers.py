@@ -0,0 +1,319 @@
+import json
+import struct
+import time
+import hashlib
+
+import bpy
+import numpy as np
+from mathutils import Matrix
+
+# 网格数据在进程间以扁平的小端数组传输，所有对象的同类数组首尾相接
+#   键: (dtype, 每个元素的分量数, 计数依据)
+ARRAY_SPECS = {
+    "co": ("<f4", 3, "vertices"),
+    "loop_vertex": ("<i4", 1, "loops"),
+    "normal": ("<f4", 3, "loops"),
+    "uv": ("<f4", 2, "uv_loops"),
+    "poly_loop_start": ("<i4", 1, "polygons"),
+    "poly_material": ("<i4", 1, "polygons"),
+    "poly_smooth": ("u1", 1, "polygons"),
+}
+
+
+def _foreach_get(collection, attr, count, dtype, components=1):
+    array = np.empty(count * components, dtype=dtype)
+    if count:
+        collection.foreach_get(attr, array)
+    return array
+
+
+def _corner_normals(mesh):
+    """读取每个面角的法线（兼容 4.1 之前的 calc_normals_split）"""
+    n_loops = len(mesh.loops)
+    if hasattr(mesh, "corner_normals"):
+        return _foreach_get(mesh.corner_normals, "vector", n_loops, np.float32, 3)
+    mesh.calc_normals_split()
+    return _foreach_get(mesh.loops, "normal", n_loops, np.float32, 3)
+
+
+def extract_mesh_arrays(obj, depsgraph):
+    """读取对象求值后的网格数组（全部使用 foreach_get，没有逐元素循环）"""
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    try:
+        n_verts = len(mesh.vertices)
+        n_loops = len(mesh.loops)
+        n_polys = len(mesh.polygons)
+        arrays = {
+            "co": _foreach_get(mesh.vertices, "co", n_verts, np.float32, 3),
+            "loop_vertex": _foreach_get(mesh.loops, "vertex_index", n_loops, np.int32),
+            "normal": _corner_normals(mesh),
+            "poly_loop_start": _foreach_get(mesh.polygons, "loop_start", n_polys, np.int32),
+            "poly_material": _foreach_get(mesh.polygons, "material_index", n_polys, np.int32),
+            "poly_smooth": _foreach_get(mesh.polygons, "use_smooth", n_polys, np.bool_).view(np.uint8),
+        }
+        uv_layer = mesh.uv_layers.active
+        if uv_layer is not None:
+            arrays["uv"] = _foreach_get(uv_layer.data, "uv", n_loops, np.float32, 2)
+        else:
+            arrays["uv"] = np.empty(0, dtype=np.float32)
+        counts = {
+            "vertices": n_verts,
+            "loops": n_loops,
+            "polygons": n_polys,
+            "uv_loops": n_loops if uv_layer is not None else 0,
+        }
+    finally:
+        obj_eval.to_mesh_clear()
+    return counts, arrays
+
+
+def pack_objects(objects, depsgraph, global_scale=1.0):
+    """把对象打包为 (对象记录列表, 按键拼接的数组)
+
+    可以转换为网格的对象（网格、曲线、文字等）传输几何数据，其余对象作为空物体
+    传输以保持层级。共用同一个网格数据块且没有修改器的对象（关联复制）只传输一份
+    网格，其余对象的记录用 "instance_of" 指向第一个对象的记录。
+    """
+    objects = list(objects)
+    index_of = {obj: i for i, obj in enumerate(objects)}
+    scale_matrix = Matrix.Scale(global_scale, 4)
+
+    records = []
+    chunks = {key: [] for key in ARRAY_SPECS}
+    offsets = {key: 0 for key in ARRAY_SPECS}
+    first_user = {}  # 网格数据块 -> 第一个使用它的对象记录序号
+
+    for obj in objects:
+        record = {
+            "name": obj.name,
+            "type": 'EMPTY',
+            "parent": index_of.get(obj.parent, -1),
+            "matrix": [value for row in (scale_matrix @ obj.matrix_world) for value in row],
+            "materials": [slot.material.name if slot.material else "" for slot in obj.material_slots],
+        }
+        # 有修改器时求值结果因对象而异，不能共用
+        shared = obj.type == 'MESH' and not obj.modifiers
+        if shared and obj.data in first_user:
+            record["type"] = 'MESH'
+            record["instance_of"] = first_user[obj.data]
+        elif obj.type in {'MESH', 'CURVE', 'SURFACE', 'FONT', 'META'}:
+            if shared:
+                first_user[obj.data] = len(records)
+            counts, arrays = extract_mesh_arrays(obj, depsgraph)
+            record["type"] = 'MESH'
+            record["counts"] = counts
+            record["offsets"] = dict(offsets)
+            for key, array in arrays.items():
+                chunks[key].append(array)
+                offsets[key] += len(array)
+        records.append(record)
+
+    packed = {}
+    for key, (dtype, _components, _count_key) in ARRAY_SPECS.items():
+        packed[key] = np.concatenate(chunks[key]).astype(dtype, copy=False) if chunks[key] else np.empty(0, dtype=dtype)
+    return records, packed
+
+
+def build_mesh(name, counts, arrays):
+    """用 foreach_set 从数组创建网格数据块"""
+    mesh = bpy.data.meshes.new(name)
+    n_verts, n_loops, n_polys = counts["vertices"], counts["loops"], counts["polygons"]
+
+    mesh.vertices.add(n_verts)
+    mesh.vertices.foreach_set("co", arrays["co"])
+    mesh.loops.add(n_loops)
+    mesh.loops.foreach_set("vertex_index", arrays["loop_vertex"])
+    mesh.polygons.add(n_polys)
+    mesh.polygons.foreach_set("loop_start", arrays["poly_loop_start"])
+    if n_polys and bpy.app.version < (3, 6, 0):
+        loop_total = np.diff(np.append(arrays["poly_loop_start"], n_loops)).astype(np.int32)
+        mesh.polygons.foreach_set("loop_total", loop_total)
+    mesh.polygons.foreach_set("material_index", arrays["poly_material"])
+    mesh.polygons.foreach_set("use_smooth", arrays["poly_smooth"].astype(np.bool_))
+
+    if counts.get("uv_loops"):
+        uv_layer = mesh.uv_layers.new(name="UVMap")
+        uv_layer.data.foreach_set("uv", arrays["uv"])
+
+    mesh.update(calc_edges=True)
+
+    if n_loops:
+        if hasattr(mesh, "use_auto_smooth"):
+            mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set(arrays["normal"].reshape(-1, 3))
+    return mesh
+
+
+def _object_arrays(record, packed):
+    """从拼接数组中切出某个对象的视图（不复制）"""
+    arrays = {}
+    for key, (_dtype, components, count_key) in ARRAY_SPECS.items():
+        start = record["offsets"][key]
+        arrays[key] = packed[key][start:start + record["counts"][count_key] * components]
+    return arrays
+
+
+def unpack_objects(records, packed, collection, global_scale=1.0):
+    """根据对象记录重建对象并链接到指定集合，返回新对象列表；关联复制的对象共用网格"""
+    scale_matrix = Matrix.Scale(global_scale, 4)
+    new_objects = []
+    for record in records:
+        data = None
+        if "instance_of" in record:
+            data = new_objects[record["instance_of"]].data
+        elif record["type"] == 'MESH':
+            data = build_mesh(record["name"], record["counts"], _object_arrays(record, packed))
+            for material_name in record["materials"]:
+                data.materials.append(bpy.data.materials.get(material_name) if material_name else None)
+        obj = bpy.data.objects.new(record["name"], data)
+        collection.objects.link(obj)
+        new_objects.append(obj)
+
+    for obj, record in zip(new_objects, records):
+        if record["parent"] >= 0:
+            obj.parent = new_objects[record["parent"]]
+        values = record["matrix"]
+        obj.matrix_world = scale_matrix @ Matrix([values[0:4], values[4:8], values[8:12], values[12:16]])
+    return new_objects
+
+
+# --- 共享内存通道 ---
+# 每类数组占用一个命名共享内存段，另有一个固定名称的索引段记录最新一次复制
+SHM_PREFIX = "synctools"
+SHM_INDEX_NAME = f"{SHM_PREFIX}_index"
+# macOS 的 POSIX 共享内存名称最多 31 个字符（含开头的 /），数组段使用短名称，完整的对应关系记录在索引段中
+SHM_SEGMENT_PREFIX = "st_"
+_INDEX_HEADER = struct.Struct("<I")
+
+_published_segments = []  # 持有本进程创建的段，防止被回收
+
+
+def _unlink_segments(segments):
+    for segment in segments:
+        try:
+            segment.close()
+            segment.unlink()
+        except (FileNotFoundError, OSError):
+            pass
+
+
+def _segment_name(seq, key):
+    """数组段名称：st_ + seq 和数组类别的 8 位哈希"""
+    return SHM_SEGMENT_PREFIX + hashlib.blake2b(f"{seq}_{key}".encode("utf-8"), digest_size=4).hexdigest()
+
+
+def publish_shared(records, packed):
+    """把打包好的网格数据写入共享内存，替换上一次发布的数据，返回写入的字节数"""
+    from multiprocessing import shared_memory
+
+    _unlink_segments(_published_segments)
+    _published_segments.clear()
+    try:
+        stale = shared_memory.SharedMemory(name=SHM_INDEX_NAME)
+        _unlink_segments([stale])
+    except FileNotFoundError:
+        pass
+
+    seq = time.time_ns()
+    segments = {}
+    total = 0
+    for key, array in packed.items():
+        name = _segment_name(seq, key)
+        segment = shared_memory.SharedMemory(name=name, create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[:] = array
+        _published_segments.append(segment)
+        segments[key] = {"name": name, "dtype": array.dtype.str, "length": len(array)}
+        total += array.nbytes
+
+    index = json.dumps({"seq": seq, "objects": records, "segments": segments}).encode("utf-8")
+    index_segment = shared_memory.SharedMemory(name=SHM_INDEX_NAME, create=True, size=_INDEX_HEADER.size + len(index))
+    index_segment.buf[:_INDEX_HEADER.size] = _INDEX_HEADER.pack(len(index))
+    index_segment.buf[_INDEX_HEADER.size:_INDEX_HEADER.size + len(index)] = index
+    _published_segments.append(index_segment)
+    return total + len(index)
+
+
+def read_shared():
+    """映射共享内存中的最新数据，返回 (对象记录, 数组, 段列表)；没有数据时返回 None
+
+    返回的数组直接引用共享内存，释放所有数组引用后再调用 release_shared(段列表)。
+    """
+    from multiprocessing import shared_memory
+
+    try:
+        index_segment = shared_memory.SharedMemory(name=SHM_INDEX_NAME)
+    except FileNotFoundError:
+        return None
+
+    (length,) = _INDEX_HEADER.unpack(bytes(index_segment.buf[:_INDEX_HEADER.size]))
+    index = json.loads(bytes(index_segment.buf[_INDEX_HEADER.size:_INDEX_HEADER.size + length]).decode("utf-8"))
+
+    segments = [index_segment]
+    packed = {}
+    for key, info in index["segments"].items():
+        segment = shared_memory.SharedMemory(name=info["name"])
+        segments.append(segment)
+        packed[key] = np.ndarray((info["length"],), dtype=np.dtype(info["dtype"]), buffer=segment.buf)
+    return index["objects"], packed, segments
+
+
+def release_shared(segments, consume=True):
+    """释放映射；consume 为 True 时同时删除共享内存，相当于导入后删除缓存文件"""
+    for segment in segments:
+        try:
+            segment.close()
+            if consume:
+                segment.unlink()
+        except (FileNotFoundError, OSError):
+            pass
+
+
+# --- 二进制容器文件 (.stm) ---
+# 文件头: MAGIC(4) 版本(u16) 标志(u16) 对象数(u32) 表长度(u32) 数据起点(u64)
+# 之后是 JSON 对象表（对象记录 + 数组目录），再之后是按 16 字节对齐的小端数组
+CONTAINER_MAGIC = b"STMB"
+CONTAINER_VERSION = 2  # 2: 对象记录可以带 instance_of
+_CONTAINER_HEADER = struct.Struct("<4sHHIIQ")
+_ALIGNMENT = 16
+
+
+def _align(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_container(path, records, packed):
+    """把打包好的网格数据写入 .stm 文件，返回文件大小"""
+    directory = {}
+    offset = 0
+    for key, array in packed.items():
+        offset = _align(offset)
+        directory[key] = {"dtype": array.dtype.str, "offset": offset, "length": len(array)}
+        offset += array.nbytes
+
+    table = json.dumps({"objects": records, "arrays": directory}).encode("utf-8")
+    data_offset = _align(_CONTAINER_HEADER.size + len(table))
+
+    with open(path, 'wb') as f:
+        f.write(_CONTAINER_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, 0, len(records), len(table), data_offset))
+        f.write(table)
+        for key, array in packed.items():
+            f.seek(data_offset + directory[key]["offset"])
+            array.tofile(f)
+        f.truncate(data_offset + offset)
+    return data_offset + offset
+
+
+def read_container(path):
+    """读取 .stm 文件，返回 (对象记录, 数组)；每个数组只做一次整块读取"""
+    with open(path, 'rb') as f:
+        magic, version, _flags, _count, table_len, data_offset = _CONTAINER_HEADER.unpack(f.read(_CONTAINER_HEADER.size))
+        if magic != CONTAINER_MAGIC or version > CONTAINER_VERSION:
+            raise ValueError(f"无法识别的网格容器: {path}")
+        table = json.loads(f.read(table_len).decode("utf-8"))
+
+        packed = {}
+        for key, info in table["arrays"].items():
+            f.seek(data_offset + info["offset"])
+            packed[key] = np.fromfile(f, dtype=np.dtype(info["dtype"]), count=info["length"])
+    return table["objects"], packed
@@ -0,0 +1,232 @@
+import os
+import json
+import hashlib
+
+import bpy
+import numpy as np
+
+from . import cache_manifest
+from . import fbx_tools
+from . import mesh_buffers
+
+# 增量复制状态：记录上一次复制时每个对象的指纹
+#   published:     最近一次发布的数据对应的指纹
+#   published_seq: 最近一次发布的数据的清单序号
+#   applied:       已知被粘贴方导入过的数据对应的指纹（最近一次数据未被导入时作为差量基准）
+STATE_FILE = "fingerprints.json"
+
+# 导入对象上记录来源对象名称的自定义属性
+SOURCE_PROPERTY = "synctools_source"
+# 粘贴的材质上记录内容指纹的自定义属性，再次粘贴相同的材质时复用
+MATERIAL_HASH_PROPERTY = "synctools_material_hash"
+
+_SIMPLE_PROPERTY_TYPES = {'BOOLEAN', 'INT', 'FLOAT', 'STRING', 'ENUM'}
+# 节点上只影响界面显示的属性，不计入材质指纹
+_NODE_UI_PROPERTIES = {
+    "name", "label", "location", "width", "height", "width_hidden", "select", "hide",
+    "show_options", "show_preview", "show_texture", "use_custom_color", "color",
+}
+
+
+def _update_array(digest, array):
+    digest.update(str(array.dtype).encode("ascii"))
+    digest.update(len(array).to_bytes(8, "little"))
+    digest.update(np.ascontiguousarray(array).data)
+
+
+def _update_rna(digest, datablock):
+    """对灯光、相机等数据块的简单属性取值做摘要"""
+    for prop in datablock.bl_rna.properties:
+        if prop.type not in _SIMPLE_PROPERTY_TYPES or prop.identifier in {"name", "rna_type"}:
+            continue
+        value = getattr(datablock, prop.identifier, None)
+        if getattr(prop, "is_array", False) or prop.type == 'ENUM' and prop.is_enum_flag:
+            value = tuple(value) if not isinstance(value, set) else tuple(sorted(value))
+        digest.update(f"{prop.identifier}={value!r};".encode("utf-8"))
+
+
+def _update_settings(digest, datablock, exclude=()):
+    """对可编辑的简单属性做摘要，跳过只读的运行时信息（用户数、session_uid 等）"""
+    for prop in datablock.bl_rna.properties:
+        if prop.is_readonly or prop.type not in _SIMPLE_PROPERTY_TYPES or prop.identifier in exclude:
+            continue
+        value = getattr(datablock, prop.identifier, None)
+        if getattr(prop, "is_array", False) or prop.type == 'ENUM' and prop.is_enum_flag:
+            value = tuple(value) if not isinstance(value, set) else tuple(sorted(value))
+        digest.update(f"{prop.identifier}={value!r};".encode("utf-8"))
+
+
+def _update_image(digest, image):
+    if image is None:
+        digest.update(b"image=None;")
+        return
+    path = bpy.path.abspath(image.filepath, library=image.library)
+    packed = image.packed_file.size if image.packed_file else 0
+    digest.update(f"image={os.path.normcase(path)};{image.source};{image.colorspace_settings.name};{packed};".encode("utf-8"))
+
+
+def _update_node_tree(digest, tree, visited):
+    """节点图的拓扑、节点设置、输入端口的值和引用的贴图路径；节点组递归展开"""
+    for node in sorted(tree.nodes, key=lambda node: node.name):
+        digest.update(f"node={node.name};{node.bl_idname};".encode("utf-8"))
+        _update_settings(digest, node, _NODE_UI_PROPERTIES)
+        if hasattr(node, "image"):
+            _update_image(digest, node.image)
+        group = getattr(node, "node_tree", None)
+        if group is not None and group.as_pointer() not in visited:
+            visited.add(group.as_pointer())
+            _update_node_tree(digest, group, visited)
+        for socket in node.inputs:
+            value = getattr(socket, "default_value", None)
+            if value is not None and not isinstance(value, (bool, int, float, str)):
+                value = tuple(value) if hasattr(value, "__len__") else getattr(value, "name", None)
+            digest.update(f"in={socket.identifier};{socket.is_linked};{value!r};".encode("utf-8"))
+    links = sorted(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in tree.links if link.is_valid
+    )
+    digest.update(repr(links).encode("utf-8"))
+
+
+def fingerprint_material(material):
+    """计算材质内容指纹：材质设置和节点图（拓扑、端口取值、贴图路径），与名称无关"""
+    digest = hashlib.blake2b(digest_size=16)
+    _update_settings(digest, material, {"name", "use_fake_user", "tag", "paint_active_slot"})
+    if material.use_nodes and material.node_tree is not None:
+        _update_node_tree(digest, material.node_tree, set())
+    return digest.hexdigest()
+
+
+def _update_armature(digest, obj):
+    """骨骼的静止姿态和层级，以及当前姿态（pose.bones 的 matrix_basis）"""
+    bones = obj.data.bones
+    digest.update(repr([(bone.name, bone.parent.name if bone.parent else "") for bone in bones]).encode("utf-8"))
+    for attr, components in (("head_local", 3), ("tail_local", 3), ("matrix_local", 16)):
+        _update_array(digest, mesh_buffers._foreach_get(bones, attr, len(bones), np.float32, components))
+    if obj.pose is not None:
+        pose_bones = obj.pose.bones
+        digest.update(repr([bone.name for bone in pose_bones]).encode("utf-8"))
+        _update_array(digest, mesh_buffers._foreach_get(pose_bones, "matrix_basis", len(pose_bones), np.float32, 16))
+
+
+def _update_animation(digest, obj):
+    animation_data = obj.animation_data
+    action = animation_data.action if animation_data else None
+    if action is None:
+        return
+    for fcurve in fbx_tools.iter_action_fcurves(action):
+        digest.update(f"{fcurve.data_path}[{fcurve.array_index}]".encode("utf-8"))
+        count = len(fcurve.keyframe_points)
+        _update_array(digest, mesh_buffers._foreach_get(fcurve.keyframe_points, "co", count, np.float32, 2))
+
+
+def fingerprint_object(obj, depsgraph):
+    """计算对象内容指纹：几何数组、变换、父级、材质槽、骨骼姿态和动画"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{obj.type};{obj.parent.name if obj.parent else ''};".encode("utf-8"))
+    _update_array(digest, np.array(obj.matrix_world, dtype=np.float64).ravel())
+    for slot in obj.material_slots:
+        digest.update(f"{slot.material.name if slot.material else ''};".encode("utf-8"))
+
+    if obj.type in {'MESH', 'CURVE', 'SURFACE', 'FONT', 'META'}:
+        counts, arrays = mesh_buffers.extract_mesh_arrays(obj, depsgraph)
+        digest.update(json.dumps(counts, sort_keys=True).encode("ascii"))
+        for key in mesh_buffers.ARRAY_SPECS:
+            _update_array(digest, arrays[key])
+    elif obj.data is not None:
+        _update_rna(digest, obj.data)
+    if obj.type == 'ARMATURE' and obj.data is not None:
+        _update_armature(digest, obj)
+
+    _update_animation(digest, obj)
+    return digest.hexdigest()
+
+
+def fingerprint_objects(objects, depsgraph):
+    """返回 {对象名称: 指纹}"""
+    return {obj.name: fingerprint_object(obj, depsgraph) for obj in objects}
+
+
+def load_state(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, STATE_FILE), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    state.setdefault("published", {})
+    state.setdefault("applied", {})
+    state.setdefault("published_path", None)
+    state.setdefault("published_seq", None)
+    return state
+
+
+def save_state(cache_dir, state):
+    cache_manifest.atomic_write_text(os.path.join(cache_dir, STATE_FILE), json.dumps(state, ensure_ascii=False))
+
+
+def reset_state(cache_dir):
+    try:
+        os.remove(os.path.join(cache_dir, STATE_FILE))
+    except OSError:
+        pass
+
+
+def compute_delta(cache_dir, objects, depsgraph):
+    """比较选中对象与上一次复制的指纹
+
+    返回 (changed, deleted, state)：changed 为需要导出的对象列表，deleted 为已从场景中
+    删除的对象名称；state 在数据发布后传给 commit_delta() 保存。没有历史记录时 changed
+    包含全部对象，相当于一次完整复制。
+    """
+    state = load_state(cache_dir)
+    # 只有清单中有上一次数据的消费记录时才以它为基准；没有被粘贴（包括未粘贴就被清理）时，
+    # 它的改动要合并进这一次的差量
+    if _is_consumed(cache_dir, state["published_seq"]):
+        base = state["published"]
+    else:
+        base = state["applied"]
+
+    current = fingerprint_objects(objects, depsgraph)
+    changed = [obj for obj in objects if base.get(obj.name) != current[obj.name]]
+    deleted = sorted(name for name in base if name not in current and name not in bpy.data.objects)
+
+    # 未选中但仍然存在的对象保留原指纹，下次选中且未改动时不会重复导出
+    merged = {name: fp for name, fp in base.items() if name not in deleted}
+    merged.update(current)
+    state = {"base": base, "current": merged}
+    return changed, deleted, state
+
+
+def _is_consumed(cache_dir, seq):
+    """清单中是否有序号为 seq 的数据的消费记录（由 mark_payload_consumed 写入）"""
+    if seq is None:
+        return False
+    return any(record.get("op") == "consume" and record.get("seq") == seq
+               for record in cache_manifest.iter_manifest(cache_dir))
+
+
+def commit_delta(cache_dir, state, payload_path, seq):
+    """数据发布成功后保存新的指纹状态"""
+    save_state(cache_dir, {
+        "applied": state["base"],
+        "published": state["current"],
+        "published_path": os.path.basename(payload_path),
+        "published_seq": seq,
+    })
+
+
+def find_pasted_objects(names):
+    """按来源名称查找之前粘贴的对象，返回 {来源名称: 对象}"""
+    names = set(names)
+    return {obj[SOURCE_PROPERTY]: obj for obj in bpy.data.objects if obj.get(SOURCE_PROPERTY) in names}
+
+
+def tag_pasted_objects(new_objects, source_names=None):
+    """给新导入的对象记录来源名称；导入时发生重名的对象去掉 .001 后缀后再匹配"""
+    for obj in new_objects:
+        source = obj.name
+        if source_names is not None and source not in source_names:
+            base_name = source.rsplit(".", 1)[0]
+            if base_name in source_names:
+                source = base_name
+        obj[SOURCE_PROPERTY] = source
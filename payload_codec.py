@@ -0,0 +1,118 @@
+import os
+import zlib
+import tempfile
+
+# 可选的压缩库：安装了 zstandard / lz4 时可用，否则退回到标准库 zlib
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+CHUNK_SIZE = 1 << 20
+
+# 压缩后的文件名在原扩展名后追加后缀，例如 export_3.fbx.zst
+SUFFIXES = {
+    'ZLIB': ".gz",
+    'ZSTD': ".zst",
+    'LZ4': ".lz4",
+}
+
+# 各编码支持的压缩级别范围
+LEVEL_RANGES = {
+    'ZLIB': (1, 9),
+    'ZSTD': (1, 22),
+    'LZ4': (0, 16),
+}
+
+
+def is_available(codec):
+    if codec == 'ZSTD':
+        return zstandard is not None
+    if codec == 'LZ4':
+        return lz4_frame is not None
+    return codec in {'NONE', 'ZLIB'}
+
+
+def resolve_codec(codec):
+    """返回实际使用的编码；所选的压缩库没有安装时退回到 zlib"""
+    if is_available(codec):
+        return codec
+    print(f"压缩库不可用: {codec}，改用 zlib")
+    return 'ZLIB'
+
+
+def clamp_level(codec, level):
+    low, high = LEVEL_RANGES[codec]
+    return max(low, min(high, level))
+
+
+def codec_for_path(path):
+    """根据文件后缀判断压缩编码，未压缩时返回 'NONE'"""
+    name = os.path.basename(str(path))
+    for codec, suffix in SUFFIXES.items():
+        if name.endswith(suffix):
+            return codec
+    return 'NONE'
+
+
+def strip_suffix(path):
+    """去掉压缩后缀，返回原始文件名"""
+    path = str(path)
+    suffix = SUFFIXES.get(codec_for_path(path))
+    return path[:-len(suffix)] if suffix else path
+
+
+def compress_file(src_path, dst_path, codec, level, chunk_size=CHUNK_SIZE):
+    """流式压缩文件，返回写入的字节数"""
+    level = clamp_level(codec, level)
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        if codec == 'ZSTD':
+            zstandard.ZstdCompressor(level=level).copy_stream(src, dst, read_size=chunk_size, write_size=chunk_size)
+        elif codec == 'LZ4':
+            with lz4_frame.LZ4FrameFile(dst, 'wb', compression_level=level) as writer:
+                for chunk in iter(lambda: src.read(chunk_size), b""):
+                    writer.write(chunk)
+        else:
+            # gzip 容器（wbits=31），可以用系统工具直接查看
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+            for chunk in iter(lambda: src.read(chunk_size), b""):
+                dst.write(compressor.compress(chunk))
+            dst.write(compressor.flush())
+        dst.flush()
+        return dst.tell()
+
+
+def decompress_file(src_path, dst_path, codec, chunk_size=CHUNK_SIZE):
+    """流式解压文件，返回解压后的字节数"""
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        if codec == 'ZSTD':
+            zstandard.ZstdDecompressor().copy_stream(src, dst, read_size=chunk_size, write_size=chunk_size)
+        elif codec == 'LZ4':
+            with lz4_frame.LZ4FrameFile(src, 'rb') as reader:
+                for chunk in iter(lambda: reader.read(chunk_size), b""):
+                    dst.write(chunk)
+        else:
+            decompressor = zlib.decompressobj(31)
+            for chunk in iter(lambda: src.read(chunk_size), b""):
+                dst.write(decompressor.decompress(chunk))
+            dst.write(decompressor.flush())
+        return dst.tell()
+
+
+def decompress_to_temp(src_path):
+    """把压缩数据解压到临时文件（保留原扩展名供导入器识别），返回临时路径"""
+    codec = codec_for_path(src_path)
+    suffix = os.path.splitext(strip_suffix(src_path))[1]
+    fd, tmp_path = tempfile.mkstemp(prefix="synctools_", suffix=suffix)
+    os.close(fd)
+    try:
+        decompress_file(src_path, tmp_path, codec)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
@@ -0,0 +1,199 @@
+import os
+import sys
+import time
+import struct
+
+from . import cache_manifest
+
+# inotify 事件掩码（见 <sys/inotify.h>）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# 不经过清单直接写入 cache 目录的数据文件（旧版插件、其他软件的导出脚本）
+PAYLOAD_KINDS = ("fbx", "abc", "stm")
+
+
+def payload_kind(filename):
+    """按扩展名返回数据类型，不是数据文件时返回 None"""
+    kind = os.path.splitext(filename)[1][1:].lower()
+    return kind if kind in PAYLOAD_KINDS else None
+
+
+def _load_inotify():
+    """加载 libc 中的 inotify 接口，非 Linux 或加载失败时返回 None"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class PayloadWatcher:
+    """监听 cache 目录中的清单头部和数据文件，发现新发布的数据
+
+    Linux 上使用 inotify，poll() 只是一次非阻塞 read；其他平台退回到对
+    manifest_head.json 和 cache 目录各做一次 stat，目录有变化时才扫描文件。
+    两种方式空闲时的开销都接近于零。
+    没有清单记录的新数据文件以 {"kind", "seq": None, "path"} 的形式返回。
+    """
+
+    def __init__(self, cache_dir, debounce=0.25):
+        self.cache_dir = cache_dir
+        self.debounce = debounce
+        self.backend = None
+        self._fd = None
+        self._head_mtime = None
+        self._dir_mtime = None
+        self._changed_at = None
+        self._pending_files = set()
+        self.last_seq = 0
+        self.last_file_mtime = 0
+
+    def start(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 启动前已经存在的数据不自动导入
+        self.last_seq = max((entry["seq"] for entry in cache_manifest.read_head(self.cache_dir)["latest"].values()), default=0)
+        self.last_file_mtime = max((mtime for _name, mtime in self._scan_payload_files()), default=0)
+
+        libc = _load_inotify()
+        if libc is not None:
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                # 清单头部和提交的数据文件通过 os.replace 出现（IN_MOVED_TO），
+                # 旧版导出直接写入最终路径（IN_CLOSE_WRITE）
+                wd = libc.inotify_add_watch(fd, os.fsencode(self.cache_dir), IN_MOVED_TO | IN_CLOSE_WRITE)
+                if wd >= 0:
+                    self._fd = fd
+                    self.backend = "inotify"
+                    return
+                os.close(fd)
+
+        self._head_mtime = self._stat_head()
+        self._dir_mtime = self._stat_dir()
+        self.backend = "poll"
+
+    def stop(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self.backend = None
+
+    def _stat_head(self):
+        try:
+            return os.stat(os.path.join(self.cache_dir, cache_manifest.HEAD_FILE)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _stat_dir(self):
+        try:
+            return os.stat(self.cache_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _scan_payload_files(self):
+        """返回 cache 目录中所有数据文件的 (文件名, 修改时间)"""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                found = []
+                for dir_entry in it:
+                    if payload_kind(dir_entry.name) is None:
+                        continue
+                    try:
+                        found.append((dir_entry.name, dir_entry.stat().st_mtime_ns))
+                    except OSError:
+                        pass
+                return found
+        except OSError:
+            return []
+
+    def _drain_events(self):
+        """读取所有待处理的 inotify 事件，返回是否有变化；新出现的数据文件名记入 _pending_files"""
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            if not data:
+                return changed
+            offset = 0
+            while offset < len(data):
+                _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if name == cache_manifest.HEAD_FILE:
+                    changed = True
+                elif payload_kind(name) is not None:
+                    self._pending_files.add(name)
+                    changed = True
+
+    def _unindexed_files(self, head):
+        """等待中的数据文件里没有清单记录、且比上次报告的更新的部分
+
+        修改时间还在 debounce 之内的文件可能仍在写入，留到下一次检查。
+        """
+        indexed = set()
+        for entry in head["latest"].values():
+            indexed.add(entry["path"])
+            indexed.update(part["path"] for part in entry.get("parts", ()))
+
+        if self.backend == "inotify":
+            candidates = []
+            for name in self._pending_files:
+                try:
+                    candidates.append((name, os.stat(os.path.join(self.cache_dir, name)).st_mtime_ns))
+                except OSError:
+                    pass  # 已被删除或改名
+        else:
+            candidates = self._scan_payload_files()
+        self._pending_files = set()
+
+        settled_before = time.time_ns() - int(self.debounce * 1e9)
+        new_files = []
+        for name, mtime in candidates:
+            if name in indexed or mtime <= self.last_file_mtime:
+                continue
+            if not cache_manifest.unlisted_payload_visible(self.cache_dir, head, name):
+                continue
+            if mtime > settled_before:
+                self._pending_files.add(name)
+                self._changed_at = time.monotonic()
+            else:
+                new_files.append((name, mtime))
+        self.last_file_mtime = max([self.last_file_mtime] + [mtime for _name, mtime in new_files])
+        return [{"kind": payload_kind(name), "seq": None, "path": name}
+                for name, _mtime in sorted(new_files, key=lambda item: item[1])]
+
+    def poll(self):
+        """检查是否有新数据，连续写入会被合并；返回新的清单记录列表，其后是没有清单记录的新数据文件"""
+        if self.backend == "inotify":
+            changed = self._drain_events()
+        else:
+            mtime = self._stat_head()
+            dir_mtime = self._stat_dir()
+            changed = mtime != self._head_mtime or dir_mtime != self._dir_mtime
+            self._head_mtime = mtime
+            self._dir_mtime = dir_mtime
+
+        now = time.monotonic()
+        if changed:
+            self._changed_at = now
+        if self._changed_at is None or now - self._changed_at < self.debounce:
+            return []
+        self._changed_at = None
+
+        head = cache_manifest.read_head(self.cache_dir)
+        entries = [entry for entry in head["latest"].values() if entry["seq"] > self.last_seq]
+        self.last_seq = max([self.last_seq] + [entry["seq"] for entry in entries])
+        return sorted(entries, key=lambda entry: entry["seq"]) + self._unindexed_files(head)
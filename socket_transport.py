@@ -0,0 +1,294 @@
+import os
+import sys
+import json
+import time
+import hmac
+import socket
+import struct
+import secrets
+import tempfile
+import threading
+import collections
+
+# 帧格式：
+#   MAGIC(4) + 版本(u16) + 头部长度(u32) + JSON 头部（kind / name / size / meta）
+#   之后是若干数据块：块长度(u32) + 数据；长度为 0 的块表示结束
+#   接收方写完文件后回复 1 字节 ACK
+# 头部中的 token 必须与 cache 目录中的令牌文件（只有当前用户可读写）一致，否则拒绝；
+# 监听方每次启动时生成新的令牌，同一用户的发送方发送时读取，其他本地进程无法推送数据
+MAGIC = b"STSP"
+VERSION = 1
+_PREAMBLE = struct.Struct("<4sHI")
+_CHUNK = struct.Struct("<I")
+ACK = b"\x01"
+NACK = b"\x00"
+
+CHUNK_SIZE = 1 << 20
+
+# 默认地址：Blender 监听 53710，对端（C4D 或替身）监听 53711
+DEFAULT_LISTEN_ADDRESS = "tcp:127.0.0.1:53710"
+DEFAULT_PEER_ADDRESS = "tcp:127.0.0.1:53711"
+
+TOKEN_FILE = "socket_token"
+
+
+def default_token_dir():
+    return os.path.join(os.path.expanduser("~"), "Documents", "cache")
+
+
+def read_token(token_dir):
+    """读取令牌，不存在时返回 None"""
+    try:
+        with open(os.path.join(token_dir, TOKEN_FILE), 'r', encoding='ascii') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def new_session_token(token_dir):
+    """生成新的令牌并写入只有当前用户可读写的文件，返回令牌"""
+    token = secrets.token_hex(16)
+    os.makedirs(token_dir, exist_ok=True)
+    path = os.path.join(token_dir, TOKEN_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='ascii') as f:
+        f.write(token)
+    os.replace(tmp_path, path)
+    return token
+
+
+def parse_address(address):
+    """解析 'tcp:host:port' 或 'unix:/path/to.sock'，返回 (family, sockaddr)"""
+    scheme, _, rest = address.partition(":")
+    scheme = scheme.lower()
+    if scheme == "unix":
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("当前平台不支持 Unix 域套接字")
+        return socket.AF_UNIX, rest
+    if scheme == "tcp":
+        host, _, port = rest.rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    raise ValueError(f"无效的地址: {address}")
+
+
+def default_spool_dir():
+    """接收文件的暂存目录；Linux 上优先使用内存盘 /dev/shm"""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    spool_dir = os.path.join(base, "synctools_spool")
+    os.makedirs(spool_dir, exist_ok=True)
+    return spool_dir
+
+
+def _recv_exact(conn, size):
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = conn.recv_into(view[received:], size - received)
+        if n == 0:
+            raise ConnectionError("连接在数据传输完成前被关闭")
+        received += n
+    return bytes(buf)
+
+
+def send_file(address, path, kind, meta=None, timeout=30.0, chunk_size=CHUNK_SIZE, token_dir=None):
+    """把文件分块发送到监听方，返回发送的字节数"""
+    family, sockaddr = parse_address(address)
+    size = os.path.getsize(path)
+    token = read_token(token_dir or default_token_dir())
+    if token is None:
+        raise ConnectionError("找不到套接字令牌，对端的监听可能没有启动")
+    header = json.dumps({
+        "token": token,
+        "kind": kind,
+        "name": os.path.basename(path),
+        "size": size,
+        "meta": meta or {},
+    }, ensure_ascii=False).encode("utf-8")
+
+    with socket.socket(family, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(sockaddr)
+        conn.sendall(_PREAMBLE.pack(MAGIC, VERSION, len(header)) + header)
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                conn.sendall(_CHUNK.pack(len(chunk)))
+                conn.sendall(chunk)
+        conn.sendall(_CHUNK.pack(0))
+        if _recv_exact(conn, 1) != ACK:
+            raise ConnectionError("对端拒绝了数据")
+    return size
+
+
+def receive_payload(conn, spool_dir, token):
+    """从连接读取一个完整的数据，写入 spool_dir 并返回记录；令牌不一致时拒绝"""
+    magic, version, header_len = _PREAMBLE.unpack(_recv_exact(conn, _PREAMBLE.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("无法识别的数据头")
+    header = json.loads(_recv_exact(conn, header_len).decode("utf-8"))
+    if token is None or not hmac.compare_digest(str(header.pop("token", "")), token):
+        conn.sendall(NACK)
+        raise PermissionError("令牌不一致，拒绝数据")
+
+    name = os.path.basename(header["name"])
+    final_path = os.path.join(spool_dir, name)
+    tmp_path = final_path + ".part"
+    written = 0
+    try:
+        with open(tmp_path, 'wb') as f:
+            while True:
+                (length,) = _CHUNK.unpack(_recv_exact(conn, _CHUNK.size))
+                if length == 0:
+                    break
+                f.write(_recv_exact(conn, length))
+                written += length
+        if written != header["size"]:
+            raise ValueError(f"数据长度不匹配: {written} != {header['size']}")
+        os.replace(tmp_path, final_path)
+    except Exception:
+        try:
+            conn.sendall(NACK)
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    conn.sendall(ACK)
+
+    header["path"] = final_path
+    header["received"] = time.time()
+    return header
+
+
+class PayloadListener:
+    """在后台线程中接收对端推送的数据，主线程通过 take_latest() 取用"""
+
+    def __init__(self, address, spool_dir=None, token_dir=None):
+        self.address = address
+        self.spool_dir = spool_dir or default_spool_dir()
+        self.token_dir = token_dir or default_token_dir()
+        self.received = collections.deque()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        family, sockaddr = parse_address(self.address)
+        if family == getattr(socket, "AF_UNIX", None) and os.path.exists(sockaddr):
+            os.remove(sockaddr)
+        server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        new_session_token(self.token_dir)
+        server.bind(sockaddr)
+        if family == getattr(socket, "AF_UNIX", None):
+            os.chmod(sockaddr, 0o600)
+        server.listen(4)
+        self._server = server
+        self._thread = threading.Thread(target=self._serve, name="SyncToolsSocketListener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            server.close()
+            if server.family == getattr(socket, "AF_UNIX", None):
+                try:
+                    os.remove(parse_address(self.address)[1])
+                except OSError:
+                    pass
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _serve(self):
+        while self._server is not None:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.settimeout(30.0)
+                    # 每次连接重新读取令牌：同一用户的其他监听启动时会换成新的令牌
+                    payload = receive_payload(conn, self.spool_dir, read_token(self.token_dir))
+                except Exception as e:
+                    print(f"接收数据失败: {e}")
+                    continue
+            with self._lock:
+                self.received.append(payload)
+            print(f"已接收数据: {payload['name']} ({payload['size']} 字节)")
+
+    def has_pending(self, kind=None):
+        with self._lock:
+            return any(kind is None or payload["kind"] == kind for payload in self.received)
+
+    def take_latest(self, kind=None):
+        """取出最新的数据，较旧的同类数据直接丢弃"""
+        with self._lock:
+            matches = [payload for payload in self.received if kind is None or payload["kind"] == kind]
+            for payload in matches:
+                self.received.remove(payload)
+        if not matches:
+            return None
+        for stale in matches[:-1]:
+            try:
+                os.remove(stale["path"])
+            except OSError:
+                pass
+        return matches[-1]
+
+
+def _run_stand_in_peer(argv):
+    """不需要 Cinema 4D 的本地替身对端，便于测试：
+
+    python socket_transport.py serve [--listen ADDR] [--out DIR] [--token-dir DIR]
+        接收 Blender 复制的数据并保存到 DIR
+    python socket_transport.py send FILE [--to ADDR] [--kind fbx] [--token-dir DIR]
+        把文件推送给 Blender，相当于在对端执行复制
+    令牌文件默认在 ~/Documents/cache 中，与插件相同
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="socket_transport.py", description="SyncTools socket stand-in peer")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve")
+    serve.add_argument("--listen", default=DEFAULT_PEER_ADDRESS)
+    serve.add_argument("--out", default=os.getcwd())
+    send = sub.add_parser("send")
+    send.add_argument("file")
+    send.add_argument("--to", default=DEFAULT_LISTEN_ADDRESS)
+    send.add_argument("--kind", default=None)
+    for command in (serve, send):
+        command.add_argument("--token-dir", default=default_token_dir())
+    args = parser.parse_args(argv)
+
+    if args.command == "send":
+        kind = args.kind or os.path.splitext(args.file)[1].lstrip(".").lower()
+        start = time.perf_counter()
+        size = send_file(args.to, args.file, kind, token_dir=args.token_dir)
+        print(f"sent {size} bytes in {time.perf_counter() - start:.3f}s")
+        return 0
+
+    os.makedirs(args.out, exist_ok=True)
+    listener = PayloadListener(args.listen, spool_dir=args.out, token_dir=args.token_dir)
+    listener.start()
+    print(f"listening on {args.listen}, saving to {args.out}")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_run_stand_in_peer(sys.argv[1:]))
@@ -0,0 +1,127 @@
+import os
+import json
+import time
+
+# 复制 / 粘贴的分阶段计时
+#   with sync_trace.trace("copy", mode="STANDARD"):
+#       with sync_trace.span("fbx_export") as s:
+#           ...
+#           s.add(bytes=size)
+# 关闭时 trace() / span() 返回同一个空对象，不计时也不分配内存
+LOG_FILE = "sync_trace.jsonl"
+MAX_LOG_BYTES = 1 << 20  # 超过后轮换为 sync_trace.jsonl.1
+
+_enabled = False
+_log_dir = None
+_active = None  # 正在记录的 trace
+last_trace = None  # 最近一次完成的 trace，供面板显示
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add(self, **counters):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, trace, name, counters):
+        self.trace = trace
+        self.name = name
+        self.counters = counters
+        self.depth = 0
+        self.start = 0.0
+
+    def __enter__(self):
+        self.depth = self.trace.depth
+        self.trace.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.trace.depth -= 1
+        record = {"name": self.name, "depth": self.depth, "start": self.start - self.trace.start, "duration": duration}
+        if self.counters:
+            record.update(self.counters)
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        self.trace.spans.append(record)
+        return False
+
+    def add(self, **counters):
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+
+class _Trace:
+    def __init__(self, operation, attributes):
+        self.operation = operation
+        self.attributes = attributes
+        self.spans = []
+        self.depth = 0
+        self.start = 0.0
+
+    def __enter__(self):
+        global _active
+        self.start = time.perf_counter()
+        _active = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active, last_trace
+        _active = None
+        record = {
+            "operation": self.operation,
+            "time": time.time(),
+            "duration": time.perf_counter() - self.start,
+            # 按开始时间排列，嵌套的阶段紧跟在外层阶段之后
+            "spans": sorted(self.spans, key=lambda span: span["start"]),
+        }
+        record.update(self.attributes)
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        last_trace = record
+        _write(record)
+        return False
+
+
+def set_enabled(enabled, log_dir=None):
+    global _enabled, _log_dir
+    _enabled = enabled
+    _log_dir = log_dir
+
+
+def trace(operation, **attributes):
+    """开始记录一次复制或粘贴；嵌套调用时沿用外层记录"""
+    if not _enabled or _active is not None:
+        return _NULL_SPAN
+    return _Trace(operation, attributes)
+
+
+def span(name, **counters):
+    """记录一个阶段；没有正在进行的 trace 时什么都不做"""
+    if _active is None:
+        return _NULL_SPAN
+    return _Span(_active, name, counters)
+
+
+def _write(record):
+    if not _log_dir:
+        return
+    path = os.path.join(_log_dir, LOG_FILE)
+    try:
+        os.makedirs(_log_dir, exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) > MAX_LOG_BYTES:
+            os.replace(path, path + ".1")
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"写入计时日志失败: {e}")
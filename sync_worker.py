@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import time
+
+import bpy
+import addon_utils
+
+# 后台进程：在无界面的 Blender 中执行与界面相同的导出 / 导入
+#   blender -b --factory-startup --python sync_worker.py -- job.json
+# job.json 由插件写入，包含任务类型（copy / transcode）、插件包名、偏好设置和场景设置；
+#   copy:       导出快照文件中的选中对象并发布
+#   copy_shard: 导出快照中的一部分对象，只提交文件，由界面进程把全部分片登记为一条数据
+#   transcode:  导入 cache 中的数据并另存为 .blend
+# 结果写入 job.json 旁边的 result.json
+
+
+def _load_snapshot(job):
+    """把快照中的选中对象追加到空场景并选中"""
+    with bpy.data.libraries.load(job["snapshot"], link=False) as (data_from, data_to):
+        data_to.objects = [name for name in data_from.objects if name in set(job["objects"])]
+
+    scene = bpy.context.scene
+    for obj in data_to.objects:
+        if obj is not None:
+            scene.collection.objects.link(obj)
+    bpy.context.view_layer.update()
+    for obj in data_to.objects:
+        if obj is not None:
+            obj.select_set(True)
+    active = bpy.data.objects.get(job.get("active") or "")
+    if active is not None:
+        bpy.context.view_layer.objects.active = active
+    return [obj for obj in data_to.objects if obj is not None]
+
+
+def _apply_scene_settings(settings):
+    scene = bpy.context.scene
+    scene.frame_start = settings["frame_start"]
+    scene.frame_end = settings["frame_end"]
+    scene.frame_preview_start = settings["frame_preview_start"]
+    scene.frame_preview_end = settings["frame_preview_end"]
+    scene.use_preview_range = settings["use_preview_range"]
+    scene.render.fps = settings["fps"]
+    scene.render.fps_base = settings["fps_base"]
+    scene.unit_settings.system = settings["unit_system"]
+    scene.unit_settings.scale_length = settings["scale_length"]
+
+
+def _enable_addon(job):
+    """在空场景中启用插件并写回偏好设置，返回插件模块"""
+    # 空场景，避免默认立方体等对象与快照中的对象重名
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    module = addon_utils.enable(job["package"], default_set=True)
+    if module is None:
+        raise RuntimeError(f"无法启用插件: {job['package']}")
+
+    # 直接写入 ID 属性，不触发 update 回调（不会启动自动粘贴、监听等）
+    prefs = bpy.context.preferences.addons[job["package"]].preferences
+    for key, value in job["preferences"].items():
+        try:
+            prefs[key] = value
+        except (TypeError, KeyError) as e:
+            print(f"无法设置偏好 {key}: {e}")
+
+    _apply_scene_settings(job["scene"])
+    return module
+
+
+def run_copy(job, module):
+    """导出快照中的对象并发布到 cache 目录"""
+    objects = _load_snapshot(job)
+    print(f"已载入 {len(objects)} 个对象")
+
+    if job["mode"] == 'BATA':
+        module.export_abc_to_cache()
+    else:
+        module.export_fbx_to_cache()
+    module.stop_cache_janitor()
+    return {"seqs": sorted(module._published_seqs), "objects": len(objects)}
+
+
+def run_copy_shard(job, module):
+    """导出一个分片并提交到 cache 目录，不登记清单"""
+    objects = _load_snapshot(job)
+    staged_path = module.cache_manifest.staging_path(job["cache_dir"], job["filename"])
+    module.export_fbx_file(staged_path)
+    final_path, raw_size, codec = module.commit_cache_part(job["cache_dir"], staged_path, job["codec"])
+    module.stop_cache_janitor()
+    return {"path": os.path.basename(final_path), "raw_size": raw_size, "codec": codec, "objects": len(objects)}
+
+
+def run_transcode(job, module):
+    """按用户设置导入数据，把新对象放进一个集合写入 .blend，供界面进程直接追加"""
+    new_objects = []
+    # 分片数据按顺序导入全部分片
+    for payload in module.payload_parts(job["cache_dir"], job["kind"], job["payload"]):
+        import_path = module.open_cache_payload(payload)
+        try:
+            if job["kind"] == "abc":
+                new_objects.extend(module.import_abc_payload(import_path))
+            else:
+                new_objects.extend(module.import_fbx_payload(import_path, module.read_frame_window()))
+        finally:
+            module.close_cache_payload(payload, import_path)
+
+    collection = bpy.data.collections.new(job["collection"])
+    for obj in new_objects:
+        collection.objects.link(obj)
+    bpy.data.libraries.write(job["output"], {collection}, path_remap='ABSOLUTE')
+    return {"collection": collection.name, "objects": len(new_objects)}
+
+
+ACTIONS = {
+    "copy": run_copy,
+    "copy_shard": run_copy_shard,
+    "transcode": run_transcode,
+}
+
+
+def run(job_path):
+    with open(job_path, 'r', encoding='utf-8') as f:
+        job = json.load(f)
+    start = time.perf_counter()
+
+    module = _enable_addon(job)
+    result = ACTIONS[job["action"]](job, module)
+    result["ok"] = True
+    result["elapsed"] = time.perf_counter() - start
+
+    with open(os.path.join(os.path.dirname(job_path), "result.json"), 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if not argv:
+        print("用法: blender -b --factory-startup --python sync_worker.py -- job.json")
+        sys.exit(2)
+    run(argv[0])
@@ -0,0 +1,64 @@
+import os
+import json
+import hashlib
+
+from . import cache_manifest
+
+# 贴图内容索引：按内容哈希识别粘贴传来的贴图，多次粘贴同一张贴图时复用已加载的图像数据块
+#   cache/texture_index.json  {"路径|大小|修改时间": 哈希}，文件没有变化时不重新计算哈希
+# 只记录哈希，不复制文件，也不改变图像数据块引用的路径：
+# 保存后的 .blend 引用的仍是导入器给出的路径，不会因为缓存清理而丢失额外的贴图
+INDEX_FILE = "texture_index.json"
+CHUNK_SIZE = 1 << 20
+
+# 图像数据块上记录内容哈希的自定义属性
+IMAGE_HASH_PROPERTY = "synctools_image_hash"
+
+
+def content_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_key(path, stat):
+    return f"{os.path.normcase(os.path.abspath(path))}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+class TextureIndex:
+    def __init__(self, cache_dir):
+        self.index_path = os.path.join(cache_dir, INDEX_FILE)
+        self.dirty = False
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def hash_file(self, path):
+        """返回文件内容哈希；大小和修改时间与记录相同时直接使用记录"""
+        key = _stat_key(path, os.stat(path))
+        digest = self.index.get(key)
+        if digest is None:
+            digest = content_hash(path)
+            self.index[key] = digest
+            self.dirty = True
+        return digest
+
+    def save(self):
+        """写回索引，只保留与文件当前大小和修改时间一致的记录（文件被改写或删除后旧记录作废）"""
+        if not self.dirty:
+            return
+        current = {}
+        for key in self.index:
+            path = key.rsplit("|", 2)[0]
+            if path not in current:
+                try:
+                    current[path] = _stat_key(path, os.stat(path))
+                except OSError:
+                    current[path] = None
+        self.index = {key: digest for key, digest in self.index.items() if current[key.rsplit("|", 2)[0]] == key}
+        cache_manifest.atomic_write_text(self.index_path, json.dumps(self.index, ensure_ascii=False))
+        self.dirty = False